@@ -1,9 +1,39 @@
+# pylint: disable=line-too-long
 """
 docstring for module
 In this file, we register the Todos model with the Django admin site
 """
 from django.contrib import admin
-from django_app.models import Todos  # import Todos model
+from django.db import transaction
+from django_app.events import publish_reset_on_commit
+from django_app.models import Todos, TodosListVersion  # import Todos model
 
 # Register your models here.
-admin.site.register(Todos)
+@admin.register(Todos)
+class TodosAdmin(admin.ModelAdmin):
+    """docstring for class - admin panel edits are writes too, so they bump the version of every list they touch (keeps ETags / caches in step w/ the DB) & reset that list's change feed"""
+    list_display = ('task', 'list_id', 'status_complete', 'sorted_rank')
+    search_fields = ('=list_id',)  # exact match -- the list key leads every index
+
+    def save_model(self, request, obj, form, change):
+        """docstring for function"""
+        with transaction.atomic():
+            previous_list_id = Todos.objects.filter(pk=obj.pk).values_list('list_id', flat=True).first() if change else None
+            super().save_model(request, obj, form, change)
+            publish_reset_on_commit(TodosListVersion.bump(reordered=change and 'sorted_rank' in form.changed_data, list_id=obj.list_id), obj.list_id)  # open /api/events streams re-fetch the list
+            if previous_list_id is not None and previous_list_id != obj.list_id:  # moved to another list -- the old one changed too
+                publish_reset_on_commit(TodosListVersion.bump(list_id=previous_list_id), previous_list_id)
+
+    def delete_model(self, request, obj):
+        """docstring for function"""
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            publish_reset_on_commit(TodosListVersion.bump(list_id=obj.list_id), obj.list_id)
+
+    def delete_queryset(self, request, queryset):
+        """docstring for function"""
+        with transaction.atomic():
+            list_ids: list[int] = sorted(set(queryset.values_list('list_id', flat=True)))
+            super().delete_queryset(request, queryset)
+            for list_id in list_ids:
+                publish_reset_on_commit(TodosListVersion.bump(list_id=list_id), list_id)
@@ -11,3 +11,9 @@ class DjangoAppConfig(AppConfig):
     """docstring for class"""
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'django_app'
+
+    def ready(self) -> None:
+        """docstring for function - time every DB query for the request metrics (see metrics.py)"""
+        from django.db.backends.signals import connection_created  # pylint: disable=import-outside-toplevel
+        from django_app.metrics import install_query_timer  # pylint: disable=import-outside-toplevel
+        connection_created.connect(install_query_timer, dispatch_uid='django_app.metrics.install_query_timer')
@@ -0,0 +1,275 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements native async (ASGI) versions of the todo API endpoints, served under /api/async/... (the sync DRF routes in views.py stay available unchanged)
+Reads use Django's async ORM (afirst, async iteration) & the async cache API, so a waiting request does not tie up a worker thread
+Writes must stay inside transaction.atomic() w/ the list version bump -- which Django does not support in async code -- so the existing transactional classmethods are run via sync_to_async
+Run under an ASGI server, e.g. 'uvicorn django_server.asgi:application --workers 4' (see 'python3 server/manage.py loadtest' to compare against WSGI workers)
+"""
+
+import asyncio
+import functools
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
+from rest_framework.exceptions import ParseError, ValidationError  # type: ignore
+from rest_framework.renderers import JSONRenderer  # type: ignore
+from django_app.events import HEARTBEAT_SECONDS, RETRY_MILLISECONDS, EventBroker, brokers, format_event
+from django_app.metrics import serializer_timer
+from django_app.models import DEFAULT_LIST_ID, Todos, TodosDelta, TodosListVersion, ToDoType, sorted_todos_error
+from django_app.renderers import arender_camel_case_list, arender_columnar_list, arender_msgpack_list, camel_case_rows, dumps
+from django_app.serializers import TodosSerializer
+from django_app.views import LIST_REPRESENTATIONS, etag_matches, list_etag, list_id_for, list_representation, map_todo_keys_for_backend, move_neighbour_ids, parse_chunk_size, wants_camel_case, wants_delta_response
+from django_app import cache as todos_cache
+
+# --------- HELPER FUNCTIONS ---------
+
+# Async versions of views.render_sorted_list / render_sorted_list_camel_case / ... -- same rows & renderers, so the bytes (& cache entries) are shared w/ the sync routes
+async def arender_sorted_list(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    results: list[Todos] = [todo async for todo in Todos.in_list(list_id).order_by('sorted_rank', 'id')]
+    with serializer_timer():
+        return JSONRenderer().render(TodosSerializer(results, many=True).data)
+
+async def arender_sorted_list_camel_case(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    return await arender_camel_case_list(Todos.in_list(list_id).order_by('sorted_rank', 'id'))
+
+async def arender_sorted_list_columnar(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    return await arender_columnar_list(Todos.in_list(list_id).order_by('sorted_rank', 'id'))
+
+async def arender_sorted_list_msgpack(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    return await arender_msgpack_list(Todos.in_list(list_id).order_by('sorted_rank', 'id'))
+
+# Same names as views.LIST_REPRESENTATIONS (which has the Content-Types)
+ASYNC_LIST_RENDERERS: dict[str, Callable[[int], Awaitable[bytes]]] = {
+    'full': arender_sorted_list,
+    'camel': arender_sorted_list_camel_case,
+    'columnar': arender_sorted_list_columnar,
+    'msgpack': arender_sorted_list_msgpack,
+}
+
+async def afetch_sort_then_serialize_response(version: int | None = None, representation: str = 'full', list_id: int = DEFAULT_LIST_ID) -> HttpResponse:
+    """docstring for helper function"""
+    if version is None:
+        version = await TodosListVersion.acurrent(list_id)
+    render: Callable[[], Awaitable[bytes]] = functools.partial(ASYNC_LIST_RENDERERS[representation], list_id)
+    body: bytes = await todos_cache.aget_or_render(list_id, version, representation, render)
+    return HttpResponse(body, content_type=LIST_REPRESENTATIONS[representation][1])
+
+async def adelta_or_full_list_response(request: HttpRequest, delta: TodosDelta, extra: dict[str, Any] | None = None) -> HttpResponse:
+    """docstring for helper function - see views.delta_or_full_list_response"""
+    if not wants_delta_response(request):
+        return await afetch_sort_then_serialize_response(delta.version, list_representation(request), delta.list_id)
+    rows: Callable[[list[Todos]], Any] = camel_case_rows if wants_camel_case(request) else lambda todos: TodosSerializer(todos, many=True).data
+    with serializer_timer():
+        return HttpResponse(dumps({
+            'version': delta.version,
+            'created': rows(delta.created),
+            'updated': rows(delta.updated),
+            'deleted': delta.deleted,
+            **(extra or {}),
+        }), content_type='application/json')
+
+def parse_json_body(request: HttpRequest) -> dict[str, Any]:
+    """docstring for helper function - plain Django views get the raw body (no DRF parsers)"""
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def not_found() -> JsonResponse:
+    """docstring for helper function - same body as DRF's Http404 handling on the sync routes"""
+    return JsonResponse({'detail': 'No Todos matches the given query.'}, status=404)
+
+def scoped_to_list(view: Callable[..., Awaitable[HttpResponse]]) -> Callable[..., Awaitable[HttpResponse]]:
+    """docstring for helper function - decorator passing the request's list id (see views.list_id_for) to the view as 'list_id'; 400 (same body as DRF's ParseError handling) if it is invalid"""
+    @functools.wraps(view)
+    async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        try:
+            list_id: int = list_id_for(request)
+        except ParseError as e:
+            return JsonResponse({'detail': str(e.detail)}, status=400)
+        return await view(request, *args, list_id=list_id, **kwargs)
+    return wrapper
+
+# --------- ASYNC HTTP METHODS ---------
+
+# GET
+# /api/async/allTodos
+@require_GET
+@scoped_to_list
+async def all_todos(request: HttpRequest, list_id: int) -> HttpResponse:
+    """GET method - conditional GET w/ the list version as ETag (see views.GetAllTodos)"""
+    version: int = await TodosListVersion.acurrent(list_id)
+    representation: str = list_representation(request)
+    etag: str = list_etag(version, representation)
+    if etag_matches(request, etag):
+        response = HttpResponse(status=304)
+    else:
+        response = await afetch_sort_then_serialize_response(version, representation, list_id)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ['Accept', 'X-Response-Shape', 'X-Todo-List'])
+    return response
+
+# POST
+# /api/async/addNewTask
+@require_POST
+@scoped_to_list
+async def add_new_task(request: HttpRequest, list_id: int) -> HttpResponse:
+    """POST method"""
+    new_task: Any = parse_json_body(request).get('newTaskToAdd')
+    if not isinstance(new_task, dict) or not {'id', 'task', 'statusComplete'} <= set(new_task):
+        return JsonResponse({'error': "'newTaskToAdd' must have 'id', 'task' & 'statusComplete'"}, status=400)
+    backend_todo: ToDoType = map_todo_keys_for_backend(new_task)
+    client_temp_id: int | None = backend_todo['id'] if isinstance(backend_todo['id'], int) and backend_todo['id'] < 0 else None
+
+    serializer = TodosSerializer(data=backend_todo)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    validated_data = serializer.validated_data.copy()
+    validated_data.pop('sorted_rank', None)
+    try:
+        delta: TodosDelta = await sync_to_async(Todos.add_new_task)(validated_data, client_temp_id, list_id)  # transactional write (atomic rank allocation + version bump)
+    except IntegrityError as e:  # same status & body as the sync AddNewTask view
+        return JsonResponse({'error': str(e)}, status=500)
+    return await adelta_or_full_list_response(request, delta)
+
+# PATCH
+# /api/async/updateSortingOrderPostDnD
+@require_http_methods(['PATCH'])
+@scoped_to_list
+async def update_sorting_order_post_dnd(request: HttpRequest, list_id: int) -> HttpResponse:
+    """PATCH method"""
+    reordered_data: Any = parse_json_body(request).get('toDosArrayFull')
+    if error := sorted_todos_error(reordered_data):
+        return JsonResponse({'toDosArrayFull': [error]}, status=400)  # same body as DRF's ValidationError handling on the sync route
+    delta: TodosDelta = await sync_to_async(Todos.update_sorted_rank)(reordered_data, list_id)
+    return await adelta_or_full_list_response(request, delta)
+
+# PATCH
+# /api/async/moveTodo/4
+@require_http_methods(['PATCH'])
+@scoped_to_list
+async def move_todo(request: HttpRequest, id_to_move: int, list_id: int) -> HttpResponse:
+    """PATCH method"""
+    try:
+        before_id, after_id = move_neighbour_ids(parse_json_body(request))
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=400)  # same body as DRF's ValidationError handling on the sync route
+    try:
+        delta: TodosDelta = await sync_to_async(Todos.move_todo)(id_to_move, before_id, after_id, list_id)
+    except Todos.DoesNotExist:
+        return not_found()
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return await adelta_or_full_list_response(request, delta)
+
+# PATCH
+# /api/async/updateTodoStatus/4
+@require_http_methods(['PATCH'])
+@scoped_to_list
+async def update_todo_status(request: HttpRequest, id_to_update: int, list_id: int) -> HttpResponse:
+    """PATCH method"""
+    try:
+        delta: TodosDelta = await sync_to_async(Todos.toggle_status_complete)(id_to_update, list_id)
+    except Todos.DoesNotExist:
+        return not_found()
+    return await adelta_or_full_list_response(request, delta)
+
+# DELETE
+# /api/async/deleteTodo/3
+@require_http_methods(['DELETE'])
+@scoped_to_list
+async def delete_single_todo(request: HttpRequest, id_to_delete: int, list_id: int) -> HttpResponse:
+    """DELETE method"""
+    try:
+        delta: TodosDelta = await sync_to_async(Todos.delete_single_todo)(id_to_delete, list_id)
+    except Todos.DoesNotExist:
+        return not_found()
+    return await adelta_or_full_list_response(request, delta)
+
+# DELETE
+# /api/async/deleteAllCompletedTodos
+@require_http_methods(['DELETE'])
+@scoped_to_list
+async def delete_all_completed_todos(request: HttpRequest, list_id: int) -> HttpResponse:
+    """DELETE method"""
+    try:
+        chunk_size: int | None = parse_chunk_size(request.GET.get('chunkSize'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    delta: TodosDelta | None = await sync_to_async(Todos.delete_all_completed)(chunk_size, list_id)
+    if delta is None:
+        return JsonResponse({'error': 'No tasks to delete'}, status=400)
+    return await adelta_or_full_list_response(request, delta, {'deletedCount': len(delta.deleted)})
+
+# GET
+# /api/events[?list=42] -- Server-Sent Events change feed of one list (one event per committed write, see events.py); open w/ 'new EventSource("/api/events?list=42")'
+def missed_events(broker: EventBroker, cursor: int, current_version: int) -> list[tuple[int, bytes]] | None:
+    """docstring for helper function - buffered events for every version after 'cursor' up to 'current_version', or None if any of them is missing (evicted, or written by another process)"""
+    replay = broker.since(cursor)
+    if replay is None:
+        return None
+    expected: int = cursor + 1
+    for event_id, _ in replay:
+        if event_id != expected:
+            return None
+        expected += 1
+    return replay if expected > current_version else None
+
+async def event_stream(last_event_id: int | None, list_id: int = DEFAULT_LIST_ID) -> AsyncIterator[bytes]:
+    """docstring for helper function - replays missed events (Last-Event-ID), then pushes new ones as they are published; a 'reset' event means 're-fetch the full list'"""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    broker: EventBroker = brokers.get(list_id)
+    broker.subscribe(loop, wake)  # subscribe BEFORE reading the version, so no event published in between is missed
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'.encode()
+        current_version: int = await TodosListVersion.acurrent(list_id)
+        cursor: int = current_version if last_event_id is None else last_event_id  # fresh connection: the client just loaded the list, only send what comes next
+        replay = missed_events(broker, cursor, current_version)
+        if replay is None:
+            yield format_event(current_version, 'reset', {'version': current_version})
+            cursor, replay = current_version, []
+        while True:
+            for event_id, message in replay:
+                yield message
+                cursor = event_id
+            wake.clear()  # clear BEFORE re-checking the buffer, so a publish in between still wakes us
+            replay = broker.since(cursor)
+            if replay is None:  # this stream fell further behind than the ring buffer holds
+                cursor = broker.latest_id()
+                yield format_event(cursor, 'reset', {'version': cursor})
+                replay = []
+            if not replay:
+                try:
+                    await asyncio.wait_for(wake.wait(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b': keep-alive\n\n'
+                replay = []
+    finally:
+        broker.unsubscribe(loop, wake)
+
+@require_GET
+@scoped_to_list
+async def events(request: HttpRequest, list_id: int) -> HttpResponse | StreamingHttpResponse:
+    """GET method - long-lived stream, ASGI only"""
+    if not isinstance(request, ASGIRequest):  # under WSGI (e.g. runserver) Django would buffer the endless async stream instead of sending it -- 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+    raw_last_event_id: str = request.headers.get('Last-Event-ID', '') or request.GET.get('lastEventId', '')
+    last_event_id: int | None = int(raw_last_event_id) if raw_last_event_id.isdigit() else None
+    response = StreamingHttpResponse(event_stream(last_event_id, list_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
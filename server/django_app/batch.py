@@ -0,0 +1,188 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements the /api/batch engine: an ordered list of add / toggle / delete / move / reorder / deleteCompleted operations on ONE list, applied all-or-nothing in ONE transaction (& one list version bump)
+Consecutive operations of the same kind are applied set-based -- a run of adds is one bulk INSERT, a run of toggles one UPDATE, a run of deletes one DELETE -- so replaying dozens of offline edits costs a handful of queries
+"""
+
+from itertools import groupby
+from typing import Any
+from django.db import transaction
+from django.db.models import F, Max
+from django_app.events import publish_delta_on_commit
+from django_app.models import DEFAULT_LIST_ID, RANK_GAP, Todos, TodosDelta, TodosListVersion, is_integer, sorted_todos_error
+from django_app.serializers import TodosSerializer
+
+# ----------
+
+BATCH_OPERATIONS = ('add', 'toggle', 'delete', 'move', 'reorder', 'deleteCompleted')
+MAX_BATCH_OPERATIONS = 1000
+
+# Batch operation data structure typing (camelCase keys, as sent by the frontend)
+OperationType = dict[str, Any]
+
+# ----------
+
+class BatchError(Exception):
+    """docstring for class - operation at 'index' is invalid / refers to a missing task; the whole batch is rolled back"""
+    def __init__(self, index: int, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.index = index
+        self.status_code = status_code
+
+
+def validate_operations(operations: Any) -> list[OperationType]:
+    """docstring for helper function - shape checks for every operation BEFORE anything touches the DB; 'add' operations gain their serializer-validated data"""
+    if not isinstance(operations, list) or not operations:
+        raise BatchError(-1, "'operations' must be a non-empty list")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise BatchError(-1, f'At most {MAX_BATCH_OPERATIONS} operations per batch')
+
+    validated: list[OperationType] = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or operation.get('op') not in BATCH_OPERATIONS:
+            raise BatchError(index, f"'op' must be one of {list(BATCH_OPERATIONS)}")
+        operation = dict(operation)
+        if operation['op'] in ('toggle', 'delete', 'move') and not is_integer(operation.get('id')):
+            raise BatchError(index, "'id' must be an integer")
+        if operation['op'] == 'move':
+            for key in ('beforeId', 'afterId'):
+                if operation.get(key) is not None and not is_integer(operation[key]):
+                    raise BatchError(index, f"'{key}' must be an integer or null")
+        if operation['op'] == 'reorder' and (error := sorted_todos_error(operation.get('toDosArrayFull'))):
+            raise BatchError(index, error)
+        if operation['op'] == 'add':
+            if operation.get('tempId') is not None and not (isinstance(operation['tempId'], int) and operation['tempId'] < 0):
+                raise BatchError(index, "'tempId' must be a negative integer")
+            serializer = TodosSerializer(data={'sorted_rank': -1, 'task': operation.get('task'), 'status_complete': operation.get('statusComplete', False)})
+            if not serializer.is_valid():
+                raise BatchError(index, str(serializer.errors))
+            operation['validated_data'] = {key: value for key, value in serializer.validated_data.items() if key != 'sorted_rank'}
+        validated.append(operation)
+    return validated
+
+
+class _BatchState:
+    """docstring for class - ids touched so far + client temp id --> server id map (so later operations can refer to tasks added earlier in the same batch)"""
+    def __init__(self, list_id: int = DEFAULT_LIST_ID):
+        self.list_id = list_id
+        self.created_ids: list[int] = []
+        self.updated_ids: set[int] = set()
+        self.deleted_ids: set[int] = set()
+        self.temp_ids: dict[int, int] = {}
+
+    def resolve(self, index: int, todo_id: int | None) -> int | None:
+        """docstring for function - negative ids are client temp ids (added earlier in this batch, or by an earlier addNewTask call)"""
+        if todo_id is None or todo_id >= 0:
+            return todo_id
+        if todo_id not in self.temp_ids:
+            server_id = Todos.in_list(self.list_id).filter(client_temp_id=todo_id).order_by('-id').values_list('id', flat=True).first()
+            if server_id is None:
+                raise BatchError(index, f'Unknown temp id {todo_id}', 404)
+            self.temp_ids[todo_id] = server_id
+        return self.temp_ids[todo_id]
+
+
+def _apply_adds(run: list[tuple[int, OperationType]], state: _BatchState, results: list[dict]) -> None:
+    """docstring for helper function - one aggregate + one bulk INSERT for the whole run"""
+    max_sorted_rank: int = Todos.in_list(state.list_id).aggregate(Max('sorted_rank'))['sorted_rank__max'] or 0
+    new_todos: list[Todos] = [
+        Todos(sorted_rank=max_sorted_rank + position * RANK_GAP, client_temp_id=operation.get('tempId'), list_id=state.list_id, **operation['validated_data'])
+        for position, (_, operation) in enumerate(run, start=1)
+    ]
+    Todos.objects.bulk_create(new_todos)  # ids are set on the instances (RETURNING on PostgreSQL / SQLite)
+    for (index, operation), todo in zip(run, new_todos):
+        if operation.get('tempId') is not None:
+            state.temp_ids[operation['tempId']] = todo.id
+        state.created_ids.append(todo.id)
+        results[index] = {'op': 'add', 'id': todo.id, 'tempId': operation.get('tempId')}
+
+
+def _existing_ids(run: list[tuple[int, OperationType]], state: _BatchState) -> list[int]:
+    """docstring for helper function - resolves the run's ids & checks they all exist in the batch's list (one query)"""
+    ids: list[int] = [state.resolve(index, operation['id']) for index, operation in run]  # type: ignore
+    existing: set[int] = set(Todos.in_list(state.list_id).filter(id__in=ids).values_list('id', flat=True))
+    for (index, _), todo_id in zip(run, ids):
+        if todo_id not in existing:
+            raise BatchError(index, f'No task w/ id {todo_id}', 404)
+    return ids
+
+
+def _apply_toggles(run: list[tuple[int, OperationType]], state: _BatchState, results: list[dict]) -> None:
+    """docstring for helper function - one UPDATE for the whole run (a task toggled an even number of times is left as is)"""
+    ids: list[int] = _existing_ids(run, state)
+    odd_ids: list[int] = [todo_id for todo_id in set(ids) if ids.count(todo_id) % 2 == 1]
+    Todos.objects.filter(id__in=odd_ids).update(status_complete=~F('status_complete'))
+    state.updated_ids.update(odd_ids)
+    for (index, _), todo_id in zip(run, ids):
+        results[index] = {'op': 'toggle', 'id': todo_id}
+
+
+def _apply_deletes(run: list[tuple[int, OperationType]], state: _BatchState, results: list[dict]) -> None:
+    """docstring for helper function - one DELETE for the whole run; deleting the same task twice in one batch is rejected (the second operation could do nothing)"""
+    ids: list[int] = _existing_ids(run, state)
+    seen: set[int] = set()
+    for (index, _), todo_id in zip(run, ids):
+        if todo_id in seen:  # same task twice in this run, e.g. once by temp id & once by server id (deleted earlier in the batch --> 404 from _existing_ids)
+            raise BatchError(index, f'Task {todo_id} is already deleted in this batch')
+        seen.add(todo_id)
+    Todos.objects.filter(id__in=ids).delete()
+    state.deleted_ids.update(ids)
+    for (index, _), todo_id in zip(run, ids):
+        results[index] = {'op': 'delete', 'id': todo_id}
+
+
+def _apply_single(index: int, operation: OperationType, state: _BatchState, results: list[dict]) -> None:
+    """docstring for helper function - operations that are already set-based (reorder, deleteCompleted) or inherently single-row (move)"""
+    if operation['op'] == 'move':
+        todo_id = state.resolve(index, operation['id'])
+        try:
+            moved: list[Todos] = Todos.apply_move(todo_id, state.resolve(index, operation.get('beforeId')), state.resolve(index, operation.get('afterId')), state.list_id)  # type: ignore
+        except Todos.DoesNotExist as e:
+            raise BatchError(index, str(e), 404) from e
+        except ValueError as e:
+            raise BatchError(index, str(e)) from e
+        state.updated_ids.update(todo.id for todo in moved)
+        results[index] = {'op': 'move', 'id': todo_id}
+    elif operation['op'] == 'reorder':
+        reranked: list[Todos] = Todos.apply_sorted_ranks(operation['toDosArrayFull'], state.list_id)
+        state.updated_ids.update(todo.id for todo in reranked)
+        results[index] = {'op': 'reorder', 'updated': len(reranked)}
+    elif operation['op'] == 'deleteCompleted':
+        deleted_ids: list[int] = Todos.delete_completed_rows(list_id=state.list_id)  # one 'DELETE ... RETURNING id'
+        state.deleted_ids.update(deleted_ids)
+        results[index] = {'op': 'deleteCompleted', 'deleted': deleted_ids}
+
+
+def apply_batch(operations: list[OperationType], list_id: int = DEFAULT_LIST_ID) -> tuple[list[dict], TodosDelta]:
+    """docstring for helper function - returns (per-operation results, net delta of the whole batch); raises BatchError (after rolling back) if any operation fails"""
+    results: list[dict] = [{} for _ in operations]
+    state = _BatchState(list_id)
+    with transaction.atomic():
+        reordered: bool = any(operation['op'] in ('move', 'reorder') for operation in operations)
+        version: int = TodosListVersion.bump(reordered=reordered, list_id=list_id)  # single bump (& list lock) for the whole batch
+        for kind, group in groupby(enumerate(operations), key=lambda item: item[1]['op']):
+            run: list[tuple[int, OperationType]] = list(group)
+            if kind == 'add':
+                _apply_adds(run, state, results)
+            elif kind == 'toggle':
+                _apply_toggles(run, state, results)
+            elif kind == 'delete':
+                _apply_deletes(run, state, results)
+            else:
+                for index, operation in run:
+                    _apply_single(index, operation, state, results)
+
+        # Net effect of the batch: final state of every surviving touched row (one query), e.g. a task added then toggled is reported once, as 'created'
+        final_rows: dict[int, Todos] = Todos.objects.in_bulk([*state.created_ids, *state.updated_ids])
+        created_ids: set[int] = set(state.created_ids)
+        delta = TodosDelta(
+            version=version,
+            created=[final_rows[todo_id] for todo_id in state.created_ids if todo_id in final_rows],
+            updated=[final_rows[todo_id] for todo_id in sorted(state.updated_ids - created_ids) if todo_id in final_rows],
+            deleted=sorted(state.deleted_ids - created_ids),
+            list_id=list_id,
+        )
+        publish_delta_on_commit(delta, reordered=reordered)  # one change feed event for the whole batch
+    return results, delta
@@ -0,0 +1,88 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements a read-through cache for the rendered (JSON bytes) todos list, using Django's cache framework
+Entries are keyed by list id & list version, which every write to that list bumps inside its own transaction -- so a committed write invalidates every older entry atomically & a rolled-back write invalidates nothing
+Backend is configured via the 'todos' alias in settings.CACHES (locmem by default, any shared backend e.g. Redis / Memcached via env variables)
+"""
+
+import threading
+from typing import Awaitable, Callable
+from django.core.cache import caches
+from django_app.models import TodosListVersion
+
+# ----------
+
+TODOS_CACHE_ALIAS = 'todos'
+
+# Hit / miss counters (per process -- each worker reports its own numbers via /api/cacheStats)
+_stats_lock = threading.Lock()
+_stats: dict[str, int] = {'hits': 0, 'misses': 0, 'stores': 0}
+
+# ----------
+
+def _count(counter: str) -> None:
+    """docstring for helper function"""
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def cache_key(list_id: int, version: int, variant: str) -> str:
+    """docstring for helper function - 'variant' distinguishes different renderings of the same list version"""
+    return f'todos:list:{list_id}:v{version}:{variant}'
+
+
+def get_or_render(list_id: int, version: int, variant: str, render: Callable[[], bytes]) -> bytes:
+    """docstring for helper function - return cached bytes for this list version, rendering (& storing) them on a miss"""
+    cache = caches[TODOS_CACHE_ALIAS]
+    body: bytes | None = cache.get(cache_key(list_id, version, variant))
+    if body is not None:
+        _count('hits')
+        return body
+
+    _count('misses')
+    body = render()
+    # Only store if no write committed while rendering -- otherwise the rows read may be newer than 'version' & must not be cached under it
+    if TodosListVersion.current(list_id) == version:
+        store(list_id, version, variant, body)
+    return body
+
+
+async def aget_or_render(list_id: int, version: int, variant: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+    """docstring for helper function - async version of get_or_render() (cache backends' aget / aset, async render callable)"""
+    cache = caches[TODOS_CACHE_ALIAS]
+    body: bytes | None = await cache.aget(cache_key(list_id, version, variant))
+    if body is not None:
+        _count('hits')
+        return body
+
+    _count('misses')
+    body = await render()
+    if await TodosListVersion.acurrent(list_id) == version:
+        await cache.aset(cache_key(list_id, version, variant), body)
+        _count('stores')
+    return body
+
+
+def store(list_id: int, version: int, variant: str, body: bytes) -> None:
+    """docstring for helper function - write-through (used right after a write, when the fresh list has just been rendered anyway)"""
+    caches[TODOS_CACHE_ALIAS].set(cache_key(list_id, version, variant), body)
+    _count('stores')
+
+
+def stats() -> dict[str, int | float | str]:
+    """docstring for helper function"""
+    with _stats_lock:
+        snapshot: dict[str, int | float | str] = dict(_stats)
+    lookups = snapshot['hits'] + snapshot['misses']  # type: ignore
+    snapshot['hitRatio'] = round(snapshot['hits'] / lookups, 4) if lookups else 0.0  # type: ignore
+    snapshot['backend'] = type(caches[TODOS_CACHE_ALIAS]).__name__
+    return snapshot
+
+
+def reset_stats() -> None:
+    """docstring for helper function"""
+    with _stats_lock:
+        for counter in _stats:
+            _stats[counter] = 0
@@ -0,0 +1,61 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module reports live database connection stats & recognises connection pool exhaustion errors
+Pool mode (DB_POOL=true, see settings.py) uses psycopg 3's ConnectionPool through Django's built-in 'pool' option; otherwise connections are persistent per worker thread (CONN_MAX_AGE)
+"""
+
+from typing import Any
+from django.db import connections
+
+# ----------
+
+# psycopg_pool raises PoolTimeout (no connection freed up w/in 'timeout') & TooManyRequests ('max_waiting' requests already queued); Django re-raises both as django.db.OperationalError
+POOL_EXHAUSTED_ERRORS = ('PoolTimeout', 'TooManyRequests')
+
+# ----------
+
+def is_pool_exhausted(error: BaseException | None) -> bool:
+    """docstring for helper function - walks the exception chain, matching by class name so psycopg_pool stays an optional import"""
+    while error is not None:
+        if any(cls.__name__ in POOL_EXHAUSTED_ERRORS for cls in type(error).__mro__):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def pool_stats(alias: str = 'default') -> dict[str, Any]:
+    """docstring for helper function - pool counters for this worker process (psycopg's ConnectionPool.get_stats(), renamed to in use / idle / wait / failures)"""
+    connection = connections[alias]
+    pool = getattr(connection, 'pool', None)  # only the PostgreSQL backend has a 'pool' property (None unless OPTIONS['pool'] is set)
+    if pool is None:
+        return {
+            'mode': 'persistent' if connection.settings_dict.get('CONN_MAX_AGE') else 'per-request',
+            'connMaxAge': connection.settings_dict.get('CONN_MAX_AGE'),
+            'healthChecks': connection.settings_dict.get('CONN_HEALTH_CHECKS', False),
+            'connected': connection.connection is not None,  # this thread's connection
+        }
+
+    stats: dict[str, int] = pool.get_stats()
+    size: int = stats.get('pool_size', 0)
+    idle: int = stats.get('pool_available', 0)
+    queued: int = stats.get('requests_queued', 0)
+    wait_ms: int = stats.get('requests_wait_ms', 0)
+    return {
+        'mode': 'pool',
+        'minSize': stats.get('pool_min', pool.min_size),
+        'maxSize': stats.get('pool_max', pool.max_size),
+        'size': size,
+        'inUse': size - idle,
+        'idle': idle,
+        'waiting': stats.get('requests_waiting', 0),  # requests blocked on checkout right now
+        'checkouts': stats.get('requests_num', 0),
+        'checkoutsQueued': queued,  # checkouts that had to wait for a connection
+        'waitMsTotal': wait_ms,
+        'waitMsAvg': round(wait_ms / queued, 2) if queued else 0.0,
+        'checkoutFailures': stats.get('requests_errors', 0),  # timeouts + rejected (max_waiting) checkouts
+        'connectionsOpened': stats.get('connections_num', 0),
+        'connectionErrors': stats.get('connections_errors', 0),
+        'connectionsLost': stats.get('connections_lost', 0),  # failed the health check on checkout
+    }
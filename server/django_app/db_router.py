@@ -0,0 +1,146 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements read-replica routing (enabled by DB_REPLICA_HOSTS, see settings.py)
+Safe reads go to a replica -- ONE per request, picked at random when the request starts, so the list version, the rows & the cache re-check all come from the same snapshot (replicas lag by different amounts; mixing them could cache old rows under a newer version's key & ETag)
+Writes, reads inside a transaction (e.g. the version row lock, rank allocation) & reads of a request that is pinned go to the primary ('default')
+Read-your-writes: a successful write request (POST / PUT / PATCH / DELETE) sets a short-lived cookie, & requests carrying it are pinned to the primary for READ_YOUR_WRITES_SECONDS, so a client never sees its own change disappear because a replica lags behind
+A cookie rather than the session: the API doesn't use sessions, & writing one would add a DB write to every write request
+"""
+
+import random
+import time
+from contextvars import ContextVar, Token
+from typing import Any
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+
+# ----------
+
+PRIMARY = DEFAULT_DB_ALIAS
+PIN_COOKIE_NAME = 'todos_primary_until'
+DEFAULT_READ_YOUR_WRITES_SECONDS = 5.0
+WRITE_METHODS = frozenset(('POST', 'PUT', 'PATCH', 'DELETE'))
+
+_pinned: ContextVar[bool] = ContextVar('todos_pinned_to_primary', default=False)  # per request -- follows the request into sync_to_async threads (async views)
+_replica: ContextVar[str | None] = ContextVar('todos_request_replica', default=None)  # the request's replica (None outside a request, e.g. management commands)
+
+# ----------
+
+def replica_aliases() -> list[str]:
+    """docstring for helper function"""
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def read_your_writes_seconds() -> float:
+    """docstring for helper function"""
+    return float(getattr(settings, 'READ_YOUR_WRITES_SECONDS', DEFAULT_READ_YOUR_WRITES_SECONDS))
+
+
+def is_pinned() -> bool:
+    """docstring for helper function"""
+    return _pinned.get()
+
+
+class PrimaryReplicaRouter:
+    """docstring for class - DATABASE_ROUTERS entry"""
+    # pylint: disable=unused-argument
+    def db_for_read(self, model: Any, **hints: Any) -> str:
+        """docstring for function"""
+        replicas: list[str] = replica_aliases()
+        if not replicas or _pinned.get() or connections[PRIMARY].in_atomic_block:  # a read inside a transaction must see that transaction's own writes (& locks)
+            return PRIMARY
+        replica: str | None = _replica.get()
+        if replica in replicas:
+            return replica  # type: ignore
+        return random.choice(replicas)  # outside a request -- no snapshot to keep consistent
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        """docstring for function"""
+        return PRIMARY
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool | None:
+        """docstring for function - every alias holds the same data"""
+        aliases: set[str] = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:  # pylint: disable=protected-access
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints: Any) -> bool | None:
+        """docstring for function - replicas get the schema through replication"""
+        if db in replica_aliases():
+            return False
+        return None
+
+# ----------
+
+def pinned_until(request: HttpRequest) -> float:
+    """docstring for helper function - expiry (epoch seconds) from the request's cookie, 0 if none / invalid; capped at one window from now, so a forged far-future value can't pin a client for good"""
+    try:
+        until: float = float(request.COOKIES.get(PIN_COOKIE_NAME, 0))
+    except ValueError:
+        return 0.0
+    return min(until, time.time() + read_your_writes_seconds())
+
+
+class ReadYourWritesMiddleware:
+    """docstring for class - pins a request to the primary if it writes, or if the client wrote w/in the last READ_YOUR_WRITES_SECONDS (& starts / extends that window after a successful write)
+    Native sync AND async, like MetricsMiddleware; a no-op w/o replicas
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore
+        if not replica_aliases():
+            return self.get_response(request)
+        tokens = self.start(request)
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            self.end(tokens)
+        return self.finish(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """docstring for function"""
+        if not replica_aliases():
+            return await self.get_response(request)
+        tokens = self.start(request)
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            self.end(tokens)
+        return self.finish(request, response)
+
+    @staticmethod
+    def pin(request: HttpRequest) -> bool:
+        """docstring for function - a write request reads from the primary too (e.g. the full list returned after a write)"""
+        return request.method in WRITE_METHODS or pinned_until(request) > time.time()
+
+    def start(self, request: HttpRequest) -> tuple[Token, Token]:
+        """docstring for function - pin the request, or pick the ONE replica all its reads go to"""
+        pinned: bool = self.pin(request)
+        return _pinned.set(pinned), _replica.set(None if pinned else random.choice(replica_aliases()))
+
+    @staticmethod
+    def end(tokens: tuple[Token, Token]) -> None:
+        """docstring for function - the next request (same thread / task) starts w/o a pin or a replica"""
+        _pinned.reset(tokens[0])
+        _replica.reset(tokens[1])
+
+    @staticmethod
+    def finish(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """docstring for function"""
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            seconds: float = read_your_writes_seconds()
+            response.set_cookie(PIN_COOKIE_NAME, f'{time.time() + seconds:.3f}', max_age=int(seconds) + 1, httponly=True, samesite='Strict', secure=request.is_secure())
+        return response
@@ -0,0 +1,154 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements the in-process change feed behind the /api/events Server-Sent Events stream
+Every committed write publishes ONE small event (the rows it created / updated / deleted, in the frontend's camelCase shape) whose SSE id is the new list version
+Each list has its own broker (its versions are its own sequence); brokers are created on first use & the least recently used idle ones are dropped beyond EVENTS_MAX_LISTS -- a client resuming on a dropped list simply gets a 'reset'
+Recent events are kept in a bounded ring buffer so a reconnecting client (EventSource sends 'Last-Event-ID' automatically) is replayed only what it missed; if that has already been evicted it gets a 'reset' event & re-fetches the list once
+Note: the broker lives in process memory -- run the ASGI app w/ a single worker for the feed (or put a shared pub/sub in front of publish() when scaling out); clients seeing a version they cannot account for fall back to a 'reset'
+"""
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict, deque
+from typing import Any
+from django.db import transaction
+from django_app.renderers import camel_case_rows
+
+# ----------
+
+EVENTS_BUFFER_SIZE = 1000  # events kept per list for Last-Event-ID resume (older ones are evicted)
+EVENTS_MAX_LISTS = 1000  # lists whose buffers are kept in memory (idle ones beyond this are dropped, least recently used first)
+HEARTBEAT_SECONDS = 15  # comment line sent on idle streams so proxies don't time the connection out
+RETRY_MILLISECONDS = 2000  # EventSource reconnect delay
+
+# ----------
+
+def format_event(event_id: int, event_type: str, data: dict[str, Any]) -> bytes:
+    """docstring for helper function - one SSE message (rendered once, sent to every subscriber as is)"""
+    return f'id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'.encode()
+
+
+def event_type_for(delta: Any, reordered: bool) -> str:
+    """docstring for helper function - 'created' / 'updated' / 'deleted' / 'reordered', or 'changed' for a write that did several kinds of change (e.g. /api/batch)"""
+    if reordered:
+        return 'reordered'
+    kinds: list[str] = [kind for kind in ('created', 'updated', 'deleted') if getattr(delta, kind)]
+    return kinds[0] if len(kinds) == 1 else 'changed'
+
+
+class EventBroker:
+    """docstring for class - thread-safe ring buffer of rendered events + wake-ups for the (async) subscribers
+    Writers publish from sync code (WSGI threads, sync_to_async threads), streams wait on asyncio.Event objects owned by their own event loop -- hence call_soon_threadsafe()
+    """
+    def __init__(self, buffer_size: int = EVENTS_BUFFER_SIZE):
+        self._lock = threading.Lock()
+        self._buffer: deque[tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._evicted_through: int = 0  # highest event id pushed out of the buffer (resuming from before this needs a reset)
+        self._subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def publish(self, event_id: int, event_type: str, data: dict[str, Any]) -> None:
+        """docstring for function"""
+        message: bytes = format_event(event_id, event_type, data)
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._evicted_through = self._buffer[0][0]
+            self._buffer.append((event_id, message))
+            subscribers = list(self._subscribers)
+        for loop, wake in subscribers:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:  # subscriber's event loop already closed (its stream is being torn down)
+                pass
+
+    def since(self, last_event_id: int) -> list[tuple[int, bytes]] | None:
+        """docstring for function - buffered events newer than 'last_event_id', or None if some of them were already evicted"""
+        with self._lock:
+            if last_event_id < self._evicted_through:
+                return None
+            return [(event_id, message) for event_id, message in self._buffer if event_id > last_event_id]
+
+    def latest_id(self) -> int:
+        """docstring for function"""
+        with self._lock:
+            return self._buffer[-1][0] if self._buffer else self._evicted_through
+
+    def clear(self) -> None:
+        """docstring for function - forget buffered events (e.g. after the DB was flushed & list versions restart)"""
+        with self._lock:
+            self._buffer.clear()
+            self._evicted_through = 0
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop, wake: asyncio.Event) -> None:
+        """docstring for function"""
+        with self._lock:
+            self._subscribers.add((loop, wake))
+
+    def unsubscribe(self, loop: asyncio.AbstractEventLoop, wake: asyncio.Event) -> None:
+        """docstring for function"""
+        with self._lock:
+            self._subscribers.discard((loop, wake))
+
+    def subscriber_count(self) -> int:
+        """docstring for function"""
+        with self._lock:
+            return len(self._subscribers)
+
+
+class EventBrokers:
+    """docstring for class - list id --> EventBroker registry (bounded: lists w/ open streams are never dropped)"""
+    def __init__(self, max_lists: int = EVENTS_MAX_LISTS, buffer_size: int = EVENTS_BUFFER_SIZE):
+        self._lock = threading.Lock()
+        self._brokers: OrderedDict[int, EventBroker] = OrderedDict()
+        self.max_lists = max_lists
+        self.buffer_size = buffer_size
+
+    def get(self, list_id: int) -> EventBroker:
+        """docstring for function - the list's broker (created on first use)"""
+        with self._lock:
+            broker = self._brokers.get(list_id)
+            if broker is None:
+                broker = self._brokers[list_id] = EventBroker(self.buffer_size)
+                if len(self._brokers) > self.max_lists:
+                    idle = next((key for key, candidate in self._brokers.items() if key != list_id and not candidate.subscriber_count()), None)
+                    if idle is not None:
+                        del self._brokers[idle]
+            self._brokers.move_to_end(list_id)
+            return broker
+
+    def clear(self) -> None:
+        """docstring for function - forget every list's buffered events (e.g. after the DB was flushed & list versions restart)"""
+        with self._lock:
+            for broker in self._brokers.values():
+                broker.clear()
+
+    def subscriber_count(self) -> int:
+        """docstring for function - open streams across all lists"""
+        with self._lock:
+            return sum(broker.subscriber_count() for broker in self._brokers.values())
+
+
+brokers = EventBrokers()
+
+# ----------
+
+def publish_delta_on_commit(delta: Any, reordered: bool = False) -> Any:
+    """docstring for helper function - call INSIDE the writer's transaction.atomic() block; the event is only published if (& once) the write commits
+    Rows are rendered now (the instances are already loaded), the publish itself runs after COMMIT; returns 'delta' so callers can 'return publish_delta_on_commit(TodosDelta(...))'
+    """
+    data: dict[str, Any] = {
+        'version': delta.version,
+        'created': camel_case_rows(delta.created),
+        'updated': camel_case_rows(delta.updated),
+        'deleted': delta.deleted,
+    }
+    event_type: str = event_type_for(delta, reordered)
+    transaction.on_commit(lambda: brokers.get(delta.list_id).publish(delta.version, event_type, data))
+    return delta
+
+
+def publish_reset_on_commit(version: int, list_id: int) -> None:
+    """docstring for helper function - for writes that don't produce a delta (e.g. admin panel edits): tells the list's clients to re-fetch it"""
+    transaction.on_commit(lambda: brokers.get(list_id).publish(version, 'reset', {'version': version}))
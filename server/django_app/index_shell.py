@@ -0,0 +1,71 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements the cached index.html shell served by 'root_path' (the root URL & every unmatched URL via the catch-all route)
+The page only changes when a new build rewrites the template ('npm run build' --> updatehtmltemplate.py swaps in the new hashed .js / .css names), so it is rendered ONCE into bytes & served from memory w/ a content-hash ETag
+The template file's mtime / size is re-checked at most once per SHELL_CHECK_SECONDS, so a new build is picked up w/o a restart
+"""
+
+import hashlib
+import os
+import threading
+import time
+from django.template import engines
+from django.template.loader import get_template
+
+# ----------
+
+SHELL_TEMPLATE = 'index.html'
+SHELL_CHECK_SECONDS = 1.0
+
+# ----------
+
+class IndexShell:
+    """docstring for class - rendered page + ETag for one template file"""
+    def __init__(self, template_name: str = SHELL_TEMPLATE, path: str | None = None, check_seconds: float = SHELL_CHECK_SECONDS):
+        self.template_name = template_name
+        self.check_seconds = check_seconds
+        self._path = path
+        self._lock = threading.Lock()
+        self._signature: tuple[int, int] | None = None  # (mtime_ns, size) of the template file the cached page was rendered from
+        self._checked_at: float = 0.0
+        self._page: tuple[bytes, str] = (b'', '')
+        self.renders: int = 0
+
+    def path(self) -> str:
+        """docstring for function - template file on disk, found through the configured template loaders once"""
+        if self._path is None:
+            self._path = get_template(self.template_name).origin.name  # type: ignore
+        return self._path  # type: ignore
+
+    def render(self) -> bytes:
+        """docstring for function - straight from the file (not through the cached template loader, which would keep serving the previous build)"""
+        with open(self.path(), encoding='utf-8') as file:
+            source: str = file.read()
+        return engines['django'].from_string(source).render().encode()  # no request context -- the shell only uses {% static %}
+
+    def get(self) -> tuple[bytes, str]:
+        """docstring for function - (page bytes, quoted ETag)"""
+        now: float = time.monotonic()
+        if self._signature is not None and now - self._checked_at < self.check_seconds:
+            return self._page
+        with self._lock:
+            stat = os.stat(self.path())
+            signature: tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                body: bytes = self.render()
+                self._page = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')  # content hash -- identical across workers & restarts
+                self._signature = signature
+                self.renders += 1
+            self._checked_at = now
+            return self._page
+
+    def reset(self) -> None:
+        """docstring for function"""
+        with self._lock:
+            self._signature = None
+            self._path = None
+
+
+index_shell = IndexShell()
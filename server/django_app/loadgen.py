@@ -0,0 +1,121 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements a small closed-loop HTTP load generator (standard library only -- asyncio streams, HTTP/1.1 keep-alive)
+'concurrency' virtual clients each send a request, wait for the full response & immediately send the next one until 'duration' seconds have passed
+Used by 'python3 server/manage.py loadtest' to compare the sync (WSGI) & async (ASGI) API paths
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+# ----------
+
+@dataclass
+class LoadResult:
+    """docstring for class - latencies in seconds (successful requests only)"""
+    url: str
+    concurrency: int
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests_per_second(self) -> float:
+        """docstring for function"""
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, float | int | str]:
+        """docstring for function - latencies reported in milliseconds"""
+        return {
+            'url': self.url,
+            'concurrency': self.concurrency,
+            'requests': len(self.latencies),
+            'errors': self.errors,
+            'rps': round(self.requests_per_second, 1),
+            'p50_ms': round(percentile(self.latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(self.latencies, 95) * 1000, 2),
+            'p99_ms': round(percentile(self.latencies, 99) * 1000, 2),
+            'max_ms': round(max(self.latencies, default=0.0) * 1000, 2),
+        }
+
+# ----------
+
+def percentile(values: list[float], pct: float) -> float:
+    """docstring for helper function - nearest-rank percentile (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered: list[float] = sorted(values)
+    rank: int = max(1, math.ceil(len(ordered) * pct / 100))  # at least the 1st value
+    return ordered[rank - 1]
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    """docstring for helper function - reads one full response, returns (status code, server keeps connection open)"""
+    status_line: bytes = await reader.readuntil(b'\r\n')
+    status_code = int(status_line.split()[1])
+    headers: dict[str, str] = {}
+    while (line := await reader.readuntil(b'\r\n')) != b'\r\n':
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while (size := int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)) > 0:
+            await reader.readexactly(size + 2)  # chunk + CRLF
+        await reader.readuntil(b'\r\n')  # no trailers expected
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif status_code not in (204, 304):
+        await reader.read()  # body delimited by connection close
+        return status_code, False
+    return status_code, headers.get('connection', '').lower() != 'close'
+
+
+async def _client(url: str, headers: dict[str, str], deadline: float, result: LoadResult) -> None:
+    """docstring for helper function - one virtual client (one keep-alive connection, re-opened if the server closes it)"""
+    parts = urlsplit(url)
+    host: str = parts.hostname or '127.0.0.1'
+    port: int = parts.port or 80
+    target: str = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+    request: bytes = ''.join(
+        [f'GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n'] + [f'{name}: {value}\r\n' for name, value in headers.items()] + ['\r\n']
+    ).encode('latin-1')
+
+    reader: asyncio.StreamReader | None = None
+    writer: asyncio.StreamWriter | None = None
+    while time.perf_counter() < deadline:
+        try:
+            if reader is None or writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            start: float = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_code, keep_alive = await _read_response(reader)
+            if status_code < 400:
+                result.latencies.append(time.perf_counter() - start)
+            else:
+                result.errors += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            result.errors += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url: str, concurrency: int, duration: float, headers: dict[str, str] | None = None) -> LoadResult:
+    """docstring for helper function"""
+    result = LoadResult(url=url, concurrency=concurrency)
+    start: float = time.perf_counter()
+    deadline: float = start + duration
+    await asyncio.gather(*(_client(url, headers or {}, deadline, result) for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,242 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Benchmark every todo API endpoint at a set concurrency against a throwaway copy of the configured database (Django's test database -- created, seeded & destroyed by this command, no external services, real data untouched)
+Requests go through the full Django stack in-process (django.test.Client, one per thread); queries per request are read from the 'Server-Timing' header (see metrics.py)
+Reports throughput, p50 / p95 / p99 latency, queries per request & errors per endpoint as JSON, so runs can be diffed
+W/ '--lists N', '--rows' todos are seeded into each of N lists & every request goes to a random list (e.g. '--lists 10000 --rows 100' = 1M rows) -- compare against '--lists 1 --rows 100' to check that per-request cost follows the size of one list, not of the table
+
+RUN in CLI --> python3 server/manage.py benchmark_api [--rows 10000] [--lists 1] [--concurrency 8] [--requests 200] [--endpoints allTodos addNewTask ...] [--seed 42] [--output results.json]
+"""
+
+import json
+import logging
+import os
+import platform
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+import django
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django_app.loadgen import percentile
+from django_app.models import Todos, TodosListVersion
+
+# ----------
+
+# Client defaults: 'localhost' is in ALLOWED_HOSTS; a REMOTE_ADDR outside INTERNAL_IPS keeps django-debug-toolbar out of the measurements in dev mode
+CLIENT_DEFAULTS: dict[str, str] = {'HTTP_HOST': 'localhost', 'REMOTE_ADDR': '198.51.100.1'}
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# ----------
+
+@dataclass
+class Scenario:
+    """docstring for class - 'prepare' runs untimed before each request (e.g. picks / creates the row to act on) & returns the request to send"""
+    name: str
+    prepare: Callable[['ScenarioState'], tuple[str, str, Any]]  # --> (method, path, JSON body or None)
+    expected_statuses: tuple[int, ...] = ()  # 4xx statuses that are a valid outcome under concurrency, not errors
+
+
+class ScenarioState:
+    """docstring for class - lists & ids available to the scenarios, shared by all threads (a list's ids are read, untimed, the first time it is picked)"""
+    def __init__(self, rng: random.Random, lists: int = 1):
+        self.lock = threading.Lock()
+        self.rng = rng
+        self.lists = lists
+        self.ids: dict[int, list[int]] = {}
+
+    def random_list(self) -> int:
+        """docstring for function"""
+        with self.lock:
+            return self.rng.randint(1, self.lists)
+
+    def random_id(self, list_id: int) -> int:
+        """docstring for function"""
+        if list_id not in self.ids:
+            ids: list[int] = list(Todos.in_list(list_id).values_list('id', flat=True))
+            with self.lock:
+                self.ids.setdefault(list_id, ids)
+        with self.lock:
+            return self.rng.choice(self.ids[list_id])
+
+    @staticmethod
+    def deletable_id(list_id: int) -> int:
+        """docstring for function - each deleteTodo request removes a row created for it, so the seeded rows survive"""
+        return Todos.objects.create(sorted_rank=-1, task='Benchmark delete', list_id=list_id).id
+
+
+def prepare_delete_all_completed(state: ScenarioState) -> tuple[str, str, Any]:
+    """docstring for helper function - give each request a few completed rows to delete"""
+    list_id: int = state.random_list()
+    Todos.objects.bulk_create([Todos(sorted_rank=-1, task='Benchmark completed', status_complete=True, list_id=list_id) for _ in range(5)])
+    return 'DELETE', f'/api/deleteAllCompletedTodos?list={list_id}', None
+
+
+def prepare_reorder(state: ScenarioState) -> tuple[str, str, Any]:
+    """docstring for helper function - drag & drop of one task: payload holds the two swapped rows (the endpoint only writes rows whose rank changed)"""
+    list_id: int = state.random_list()
+    first, second = state.random_id(list_id), state.random_id(list_id)
+    ranks = dict(Todos.objects.filter(id__in=[first, second]).values_list('id', 'sorted_rank'))
+    payload = [{'id': first, 'newSortedRank': ranks.get(second)}, {'id': second, 'newSortedRank': ranks.get(first)}]
+    return 'PATCH', f'/api/updateSortingOrderPostDnD?list={list_id}', {'toDosArrayFull': payload}
+
+
+def prepare_toggle(state: ScenarioState) -> tuple[str, str, Any]:
+    """docstring for helper function"""
+    list_id: int = state.random_list()
+    return 'PATCH', f'/api/updateTodoStatus/{state.random_id(list_id)}?response=delta&list={list_id}', None
+
+
+def prepare_delete(state: ScenarioState) -> tuple[str, str, Any]:
+    """docstring for helper function"""
+    list_id: int = state.random_list()
+    return 'DELETE', f'/api/deleteTodo/{state.deletable_id(list_id)}?response=delta&list={list_id}', None
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario for scenario in (
+        Scenario('allTodos', lambda state: ('GET', f'/api/allTodos?list={state.random_list()}', None)),
+        Scenario('addNewTask', lambda state: ('POST', f'/api/addNewTask?response=delta&list={state.random_list()}', {'newTaskToAdd': {'id': 0, 'task': 'Benchmark task', 'statusComplete': False}})),
+        Scenario('updateTodoStatus', prepare_toggle),
+        Scenario('updateSortingOrderPostDnD', prepare_reorder),
+        Scenario('deleteTodo', prepare_delete),
+        Scenario('deleteAllCompletedTodos', prepare_delete_all_completed, expected_statuses=(400,)),  # 400 = another client already cleared them
+    )
+}
+
+
+def list_query_plans(list_id: int) -> dict[str, str]:
+    """docstring for helper function - EXPLAIN output of the per-list reads (each should be a range scan on a list-led index, not a table scan)"""
+    return {
+        'sortedList': Todos.in_list(list_id).order_by('sorted_rank', 'id').explain(),
+        'activePage': Todos.in_list(list_id).filter(status_complete=False).order_by('sorted_rank', 'id')[:100].explain(),
+        'maxRank': Todos.in_list(list_id).order_by('-sorted_rank').values_list('sorted_rank', flat=True)[:1].explain(),
+        'completed': Todos.in_list(list_id).filter(status_complete=True).values_list('id', flat=True).explain(),
+    }
+
+# ----------
+
+def run_scenario(scenario: Scenario, state: ScenarioState, concurrency: int, total_requests: int) -> dict[str, Any]:
+    """docstring for helper function"""
+    latencies: list[float] = []
+    queries: list[int] = []
+    errors: list[int] = []
+    remaining = iter(range(total_requests))
+    remaining_lock = threading.Lock()
+
+    def worker() -> None:
+        client = Client(raise_request_exception=False, **CLIENT_DEFAULTS)  # server errors are counted, not raised
+        try:
+            while True:
+                with remaining_lock:
+                    if next(remaining, None) is None:
+                        return
+                method, path, body = scenario.prepare(state)
+                start: float = time.perf_counter()
+                response = client.generic(method, path, json.dumps(body) if body is not None else '', content_type='application/json')
+                elapsed: float = time.perf_counter() - start
+                if response.status_code >= 400 and response.status_code not in scenario.expected_statuses:
+                    errors.append(response.status_code)
+                    continue
+                latencies.append(elapsed)
+                match = SERVER_TIMING_QUERIES.search(response.get('Server-Timing', ''))
+                if match:
+                    queries.append(int(match.group(1)))
+        finally:
+            connections.close_all()  # this thread's connections
+
+    start: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed: float = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'errorStatuses': sorted(set(errors)),
+        'throughputRps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50Ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95Ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99Ms': round(percentile(latencies, 99) * 1000, 2),
+        'queriesPerRequest': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Benchmark each API endpoint (throughput, p50 / p95 / p99, queries per request) against a throwaway seeded test database'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('--rows', type=int, default=10_000, help='todos seeded (into each list) before the run')
+        parser.add_argument('--lists', type=int, default=1, help='lists seeded before the run; requests go to a random one')
+        parser.add_argument('--completed-ratio', type=float, default=0.3)
+        parser.add_argument('--concurrency', type=int, default=8, help='client threads per endpoint')
+        parser.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+        parser.add_argument('--endpoints', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+        parser.add_argument('--seed', type=int, default=42, help='random seed (data set & request mix)')
+        parser.add_argument('--output', help='write the JSON report to this file (default: stdout)')
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        if options['concurrency'] < 1 or options['requests'] < 1 or options['lists'] < 1:
+            raise CommandError('--concurrency, --requests & --lists must be at least 1')
+
+        if connection.vendor == 'sqlite':  # file-based test DB (busy timeout serializes writers), an in-memory one would raise 'table is locked' under concurrency
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.gettempdir(), 'benchmark_api.sqlite3')
+            if django.VERSION >= (5, 1):  # take the write lock at BEGIN, so read-then-write transactions wait instead of failing w/ 'database is locked'
+                connection.settings_dict.setdefault('OPTIONS', {})['transaction_mode'] = 'IMMEDIATE'
+        logging.getLogger('django.request').setLevel(logging.ERROR)  # expected 4xx responses would log one warning per request
+        setup_test_environment()
+        old_name: str = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            rng = random.Random(options['seed'])
+            seed_start: float = time.perf_counter()
+            for list_id in range(1, options['lists'] + 1):
+                Todos.bulk_seed(options['rows'], options['completed_ratio'], lambda: rng.randint(5, 50), rng, list_id=list_id)
+            seed_seconds: float = time.perf_counter() - seed_start
+            state = ScenarioState(rng, options['lists'])
+
+            report: dict[str, Any] = {
+                'meta': {
+                    'rows': options['rows'],
+                    'lists': options['lists'],
+                    'totalRows': options['rows'] * options['lists'],
+                    'versionRows': TodosListVersion.objects.count(),
+                    'completedRatio': options['completed_ratio'],
+                    'concurrency': options['concurrency'],
+                    'requestsPerEndpoint': options['requests'],
+                    'seed': options['seed'],
+                    'seedSeconds': round(seed_seconds, 2),
+                    'database': connection.vendor,
+                    'django': django.get_version(),
+                    'python': platform.python_version(),
+                    'startedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                },
+                'plans': list_query_plans(state.random_list()),
+                'endpoints': {},
+            }
+            for name in options['endpoints']:
+                report['endpoints'][name] = run_scenario(SCENARIOS[name], state, options['concurrency'], options['requests'])
+                self.stderr.write(f"{name:>26}: {report['endpoints'][name]['throughputRps']:>8} req/s  p99 {report['endpoints'][name]['p99Ms']} ms")
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output: str = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,126 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Benchmark /api/searchTodos as the table grows (10k --> 100k --> 1M rows by default), against a throwaway copy of the configured database (Django's test database -- created, seeded & destroyed by this command, real data untouched)
+One list is grown step by step (bulk_seed) & a few 'needle' tasks w/ a unique word are appended at every step, so each query type is measured at every size:
+  selective ('needle' -- a handful of matches), common (a seeded word -- ~1 row in 6 matches) & short (2 characters, too short for the trigram index -- unindexed fallback)
+Latency should grow far slower than the table for indexed queries; 'growth' = p50 at this size / p50 at the first size (compare w/ the row count ratio). EXPLAIN output of each query at the largest size is included
+
+RUN in CLI --> python3 server/manage.py benchmark_search [--sizes 10000 100000 1000000] [--queries needle milk "pay rent" mi] [--repeat 20] [--limit 100] [--output results.json]
+"""
+
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Any
+from urllib.parse import urlencode
+import django
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django_app.loadgen import percentile
+from django_app.management.commands.benchmark_api import CLIENT_DEFAULTS
+from django_app.models import DEFAULT_LIST_ID, Todos
+
+# ----------
+
+NEEDLES_PER_STEP = 5
+
+# ----------
+
+def time_query(client: Client, query: str, limit: int, repeat: int) -> dict[str, Any]:
+    """docstring for helper function - first page of results through the full Django stack, 'repeat' times"""
+    path: str = f"/api/searchTodos?{urlencode({'q': query, 'limit': limit})}"
+    latencies: list[float] = []
+    body: dict[str, Any] = {}
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        response = client.get(path)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise CommandError(f'{path} --> {response.status_code}: {response.content[:200]!r}')
+        body = response.json()
+    return {
+        'p50Ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95Ms': round(percentile(latencies, 95) * 1000, 2),
+        'firstPageRows': len(body.get('results', [])),
+        'morePages': body.get('next') is not None,
+    }
+
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Benchmark /api/searchTodos latency as one list grows (selective, common & short queries)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000], help='list sizes to measure at, ascending')
+        parser.add_argument('--queries', nargs='+', default=['needle', 'milk', 'pay rent', 'mi'])
+        parser.add_argument('--repeat', type=int, default=20, help='requests per query & size')
+        parser.add_argument('--limit', type=int, default=100, help='page size')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='write the JSON report to this file (default: stdout)')
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        sizes: list[int] = options['sizes']
+        if sizes != sorted(sizes) or sizes[0] <= NEEDLES_PER_STEP * len(sizes) or options['repeat'] < 1:
+            raise CommandError(f'--sizes must be ascending & above {NEEDLES_PER_STEP * len(sizes)}, --repeat at least 1')
+
+        if connection.vendor == 'sqlite':  # file-based test DB -- 1M rows + the search index don't belong in memory
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.gettempdir(), 'benchmark_search.sqlite3')
+        setup_test_environment()
+        old_name: str = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            rng = random.Random(options['seed'])
+            client = Client(**CLIENT_DEFAULTS)
+            steps: list[dict[str, Any]] = []
+            rows: int = 0
+            for size in sizes:
+                seed_start: float = time.perf_counter()
+                Todos.bulk_seed(size - rows - NEEDLES_PER_STEP, 0.3, lambda: rng.randint(5, 50), rng)
+                Todos.bulk_import((f'needle {len(steps)}-{i}', False, None) for i in range(NEEDLES_PER_STEP))  # appended after the seeded rows -- the end of the list order
+                rows = size
+                seed_seconds: float = time.perf_counter() - seed_start
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE todos')  # fresh planner statistics for the new size (same statement on PostgreSQL & SQLite)
+                queries: dict[str, Any] = {query: time_query(client, query, options['limit'], options['repeat']) for query in options['queries']}
+                for query, result in queries.items():
+                    result['growth'] = round(result['p50Ms'] / steps[0]['queries'][query]['p50Ms'], 2) if steps and steps[0]['queries'][query]['p50Ms'] else 1.0
+                    self.stderr.write(f"{size:>9} rows  {query!r:>12}: p50 {result['p50Ms']:>8} ms  p95 {result['p95Ms']:>8} ms  growth {result['growth']:>6}x  (rows {size / sizes[0]:.0f}x)")
+                steps.append({'rows': size, 'seedSeconds': round(seed_seconds, 2), 'queries': queries})
+
+            plans: dict[str, str] = {}
+            for query in options['queries']:
+                plans[query] = Todos.search(query, DEFAULT_LIST_ID).order_by('sorted_rank', 'id')[:options['limit'] + 1].explain()  # the first-page query of keyset_page
+
+            report: dict[str, Any] = {
+                'meta': {
+                    'sizes': sizes,
+                    'limit': options['limit'],
+                    'repeat': options['repeat'],
+                    'seed': options['seed'],
+                    'database': connection.vendor,
+                    'django': django.get_version(),
+                    'python': platform.python_version(),
+                    'startedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                },
+                'steps': steps,
+                'plans': plans,
+            }
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output: str = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
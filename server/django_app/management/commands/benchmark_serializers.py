@@ -0,0 +1,89 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Micro-benchmark: DRF TodosSerializer + JSONRenderer (current default) vs the fast values_list() / camelCase renderer & the columnar JSON / MessagePack representations in 'django_app/renderers.py'
+Each representation is also compressed the way CompressionMiddleware does it (gzip, & brotli if installed), so payload size on the wire & encode CPU can be compared end to end
+Synthetic rows are inserted inside a transaction that is rolled back at the end, so the DB is left untouched
+
+RUN in CLI --> python3 server/manage.py benchmark_serializers [--sizes 1000 10000 100000] [--repeat 5]
+"""
+
+import time
+from typing import Callable
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer  # type: ignore
+from django_app.middleware import RESPONSE_ENCODINGS, compress_body
+from django_app.models import RANK_GAP, Todos
+from django_app.renderers import msgpack, render_camel_case_list, render_columnar_list, render_msgpack_list
+from django_app.serializers import TodosSerializer
+
+
+def render_with_drf() -> bytes:
+    """docstring for helper function"""
+    return JSONRenderer().render(TodosSerializer(Todos.objects.order_by('sorted_rank', 'id'), many=True).data)
+
+
+def render_fast() -> bytes:
+    """docstring for helper function"""
+    return render_camel_case_list(Todos.objects.order_by('sorted_rank', 'id'))
+
+
+def render_columnar() -> bytes:
+    """docstring for helper function"""
+    return render_columnar_list(Todos.objects.order_by('sorted_rank', 'id'))
+
+
+def render_msgpack() -> bytes:
+    """docstring for helper function"""
+    return render_msgpack_list(Todos.objects.order_by('sorted_rank', 'id'))
+
+
+# (name, renderer) -- msgpack only if installed
+RENDERERS: list[tuple[str, Callable[[], bytes]]] = [('drf', render_with_drf), ('camel', render_fast), ('columnar', render_columnar)] + ([('msgpack', render_msgpack)] if msgpack is not None else [])
+
+
+def best_of(repeat: int, render: Callable[[], bytes]) -> tuple[float, int]:
+    """docstring for helper function - best wall time (seconds) over 'repeat' runs + size of the rendered body"""
+    timings: list[float] = []
+    body: bytes = b''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render()
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(body)
+
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Benchmark the DRF serializer against the fast camelCase, columnar & MessagePack renderers (raw & compressed) at several list sizes'
+
+    def add_arguments(self, parser):
+        """docstring for function"""
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        """docstring for function"""
+        header: str = f"{'rows':>8} {'format':>9} {'encode ms':>10} {'speedup':>8} {'KB':>8}"
+        for encoding in RESPONSE_ENCODINGS:
+            header += f" {encoding + ' ms':>9} {encoding + ' KB':>9}"
+        self.stdout.write(header)
+        for size in options['sizes']:
+            with transaction.atomic():
+                Todos.objects.all().delete()
+                Todos.objects.bulk_create((Todos(sorted_rank=(i + 1) * RANK_GAP, task=f'Benchmark task {i}', status_complete=i % 3 == 0) for i in range(size)), batch_size=5_000)
+
+                drf_seconds: float = 0.0
+                for name, render in RENDERERS:
+                    seconds, body_bytes = best_of(options['repeat'], render)
+                    drf_seconds = drf_seconds or seconds  # DRF runs first -- the baseline
+                    line: str = f'{size:>8} {name:>9} {seconds * 1000:>10.1f} {drf_seconds / seconds:>7.1f}x {body_bytes / 1024:>8.0f}'
+                    body: bytes = render()
+                    for encoding in RESPONSE_ENCODINGS:  # per-request compression cost & size on the wire (see CompressionMiddleware)
+                        compress_seconds, compressed_bytes = best_of(options['repeat'], lambda body=body, encoding=encoding: compress_body(body, encoding))
+                        line += f' {compress_seconds * 1000:>9.1f} {compressed_bytes / 1024:>9.0f}'
+                    self.stdout.write(line)
+
+                transaction.set_rollback(True)  # leave the DB exactly as it was
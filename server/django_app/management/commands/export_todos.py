@@ -0,0 +1,36 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Stream every todo of one list, in list order, to an NDJSON / CSV file (constant memory, see transfer.py) -- the output can be loaded back w/ import_todos
+
+RUN in CLI --> python3 server/manage.py export_todos [todos.csv] [--type ndjson|csv] [--list 1]   (default: NDJSON of list 1 to stdout)
+"""
+
+from django.core.management.base import BaseCommand, CommandParser
+from django_app.models import DEFAULT_LIST_ID
+from django_app.transfer import CONTENT_TYPES, file_type_for, stream_export
+
+# ----------
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Stream every todo of a list (in list order) to an NDJSON / CSV file'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('path', nargs='?', default='-', help="output file, '-' for stdout (default)")
+        parser.add_argument('--type', choices=list(CONTENT_TYPES), help='file type (default: from the file extension, .csv = csv, otherwise ndjson)')
+        parser.add_argument('--list', type=int, default=DEFAULT_LIST_ID, help='list to export')
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        file_type: str = options['type'] or file_type_for(options['path'])
+        if options['path'] == '-':
+            for chunk in stream_export(file_type, list_id=options['list']):
+                self.stdout.write(chunk.decode(), ending='')
+            return
+        with open(options['path'], 'wb') as file:
+            for chunk in stream_export(file_type, list_id=options['list']):
+                file.write(chunk)
+        self.stderr.write(f"Exported list {options['list']} to {options['path']}")
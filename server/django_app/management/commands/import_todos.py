@@ -0,0 +1,48 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Stream an NDJSON / CSV file into the todos table -- read line by line & inserted in batches (see transfer.py), so memory use does not grow w/ the file size
+Rows are appended to the end of the list in file order, all-or-nothing (one transaction, one list version bump)
+Note: w/ DEBUG on, Django also keeps the SQL of every statement in connection.queries -- run very large imports w/ DEBUG off
+
+RUN in CLI --> python3 server/manage.py import_todos todos.ndjson [--type ndjson|csv] [--batch-size 1000] [--list 1]   ('-' reads stdin)
+"""
+
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django_app.models import DEFAULT_LIST_ID
+from django_app.transfer import CONTENT_TYPES, ImportRowError, file_type_for, import_lines
+
+# ----------
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Stream an NDJSON / CSV file of todos into the database (appended in file order, all-or-nothing)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('path', help="file to import, '-' for stdin")
+        parser.add_argument('--type', choices=list(CONTENT_TYPES), help='file type (default: from the file extension, .csv = csv, otherwise ndjson)')
+        parser.add_argument('--batch-size', type=int, default=1_000, help='rows per INSERT statement')
+        parser.add_argument('--list', type=int, default=DEFAULT_LIST_ID, help='list to append the rows to')
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        if options['batch_size'] < 1 or options['list'] < 1:
+            raise CommandError('--batch-size & --list must be at least 1')
+        file_type: str = options['type'] or file_type_for(options['path'])
+        start: float = time.perf_counter()
+        try:
+            if options['path'] == '-':
+                imported, version = import_lines(sys.stdin.buffer, file_type, options['batch_size'], options['list'])
+            else:
+                with open(options['path'], 'rb') as file:
+                    imported, version = import_lines(file, file_type, options['batch_size'], options['list'])
+        except OSError as e:
+            raise CommandError(str(e)) from e
+        except ImportRowError as e:
+            raise CommandError(f'Nothing imported -- {e}') from e
+        elapsed: float = time.perf_counter() - start
+        self.stdout.write(f"Imported {imported:,} todos into list {options['list']} in {elapsed:.2f} s, list version {version}")
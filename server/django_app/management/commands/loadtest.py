@@ -0,0 +1,54 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Load test: requests/sec & tail latency of already-running servers, at one or more concurrency levels (load generator in 'django_app/loadgen.py')
+Start the servers to compare first, e.g.
+    sync WSGI workers -->  cd server && gunicorn django_server.wsgi:application --workers 4 --bind 127.0.0.1:8000
+    async ASGI path  -->  cd server && uvicorn django_server.asgi:application --workers 4 --port 8001
+
+RUN in CLI --> python3 server/manage.py loadtest wsgi=http://127.0.0.1:8000/api/allTodos async=http://127.0.0.1:8001/api/async/allTodos [--concurrency 10 100 500] [--duration 10] [--header 'X-Response-Shape: camel'] [--json]
+"""
+
+import asyncio
+import json
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django_app.loadgen import run_load
+
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Compare requests/sec & p50 / p95 / p99 latency of running servers (e.g. sync WSGI vs async ASGI) at several concurrency levels'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('targets', nargs='+', help="label=url pairs, e.g. wsgi=http://127.0.0.1:8000/api/allTodos")
+        parser.add_argument('--concurrency', nargs='+', type=int, default=[10, 100, 500])
+        parser.add_argument('--duration', type=float, default=10.0, help='seconds per target & concurrency level')
+        parser.add_argument('--header', action='append', default=[], help="extra request header, e.g. 'X-Response-Shape: camel' (repeatable)")
+        parser.add_argument('--json', action='store_true', help='print the results as JSON instead of a table')
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        targets: list[tuple[str, str]] = []
+        for target in options['targets']:
+            label, separator, url = target.partition('=')
+            if not separator or not url.startswith('http://'):
+                raise CommandError(f"Expected label=http://host:port/path, got '{target}'")
+            targets.append((label, url))
+        headers: dict[str, str] = {}
+        for header in options['header']:
+            name, _, value = header.partition(':')
+            headers[name.strip()] = value.strip()
+
+        report: list[dict] = []
+        for concurrency in options['concurrency']:
+            for label, url in targets:  # targets run one after the other (never at the same time), so they don't compete for CPU
+                summary = asyncio.run(run_load(url, concurrency, options['duration'], headers)).summary()
+                report.append({'target': label, **summary})
+                if not options['json']:
+                    self.stdout.write(
+                        f"{label:>10}  c={concurrency:<5}  {summary['rps']:>9} req/s  p50 {summary['p50_ms']:>8} ms  p95 {summary['p95_ms']:>8} ms  p99 {summary['p99_ms']:>8} ms  errors {summary['errors']}"
+                    )
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
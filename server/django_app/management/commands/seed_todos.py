@@ -0,0 +1,75 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Bulk-seed N synthetic todos (1k ... 1M) w/ a configurable completion ratio & task length distribution (multi-row INSERTs in one transaction, see Todos.bulk_seed)
+W/ '--lists', N todos are seeded into EACH of that many consecutive lists (e.g. 10k lists of 100 todos, see 'benchmark_api --lists')
+
+RUN in CLI --> python3 server/manage.py seed_todos 100000 [--completed-ratio 0.3] [--length-distribution uniform|normal|short] [--min-length 5] [--max-length 50] [--seed 42] [--list 1] [--lists 1] [--clear]
+"""
+
+import random
+import time
+from typing import Callable
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django_app.models import DEFAULT_LIST_ID, INSERT_ROWS_COLUMNS, Todos, TodosListVersion
+
+# ----------
+
+LENGTH_DISTRIBUTIONS = ('uniform', 'normal', 'short')
+
+
+def task_length_sampler(distribution: str, min_length: int, max_length: int, rng: random.Random) -> Callable[[], int]:
+    """docstring for helper function - 'uniform' over [min, max], 'normal' centred between them, 'short' skewed towards min (most real tasks are a few words)"""
+    span: int = max_length - min_length
+    if distribution == 'uniform':
+        return lambda: rng.randint(min_length, max_length)
+    if distribution == 'normal':
+        return lambda: min(max_length, max(min_length, round(rng.gauss(min_length + span / 2, span / 6 or 1))))
+    return lambda: min(max_length, min_length + int(rng.expovariate(4 / (span or 1))))
+
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Bulk-seed N synthetic todos w/ a configurable completion ratio & task length distribution'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('count', type=int, help='number of todos to add (to each list), e.g. 1000 ... 1000000')
+        parser.add_argument('--completed-ratio', type=float, default=0.3, help='share of tasks created as complete (0 ... 1)')
+        parser.add_argument('--length-distribution', choices=LENGTH_DISTRIBUTIONS, default='uniform')
+        parser.add_argument('--min-length', type=int, default=5)
+        parser.add_argument('--max-length', type=int, default=50, help='at most 50 (Todos.task max_length)')
+        parser.add_argument('--seed', type=int, default=None, help='random seed, for reproducible data sets')
+        parser.add_argument('--batch-size', type=int, default=1_000, help=f'rows per INSERT statement ({len(INSERT_ROWS_COLUMNS)} parameters per row)')
+        parser.add_argument('--list', type=int, default=DEFAULT_LIST_ID, help='(first) list to seed')
+        parser.add_argument('--lists', type=int, default=1, help='number of consecutive lists to seed, starting at --list')
+        parser.add_argument('--clear', action='store_true', help="delete the seeded lists' existing todos first")
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        if options['count'] < 1:
+            raise CommandError('count must be at least 1')
+        if not 0 <= options['completed_ratio'] <= 1:
+            raise CommandError('--completed-ratio must be between 0 and 1')
+        if not 1 <= options['min_length'] <= options['max_length'] <= 50:
+            raise CommandError('need 1 <= --min-length <= --max-length <= 50')
+        if options['list'] < 1 or options['lists'] < 1:
+            raise CommandError('--list & --lists must be at least 1')
+
+        rng = random.Random(options['seed'])
+        task_length = task_length_sampler(options['length_distribution'], options['min_length'], options['max_length'], rng)
+        start: float = time.perf_counter()
+        list_ids = range(options['list'], options['list'] + options['lists'])
+        with transaction.atomic():
+            if options['clear']:
+                Todos.objects.filter(list_id__range=(list_ids[0], list_ids[-1])).delete()  # one range scan on the list-led index
+                for list_id in list_ids:
+                    TodosListVersion.bump(reordered=True, list_id=list_id)
+            for list_id in list_ids:
+                version: int = Todos.bulk_seed(options['count'], options['completed_ratio'], task_length, rng, options['batch_size'], list_id)
+        elapsed: float = time.perf_counter() - start
+        total: int = options['count'] * options['lists']
+        lists: str = f"list {options['list']}" if options['lists'] == 1 else f"{options['lists']:,} lists"
+        self.stdout.write(f"Seeded {total:,} todos into {lists} in {elapsed:.2f} s ({total / elapsed:,.0f} rows/s), list version {version}")
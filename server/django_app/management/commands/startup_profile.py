@@ -0,0 +1,54 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+Import-time / cold start profile of a server worker (fresh interpreter each run, see django_app/startup.py): time to set up Django, load the URLconf & serve the first request, & which packages the import time goes to
+
+RUN in CLI --> python3 server/manage.py startup_profile [--env production] [--runs 3] [--top 15] [--json] [--budget 2.0]
+"""
+
+import json
+from typing import Any
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django_app.startup import STARTUP_BUDGET_SECONDS, profile_startup_runs
+
+# ----------
+
+class Command(BaseCommand):
+    """docstring for class"""
+    help = 'Profile worker cold start: setup / URLconf / first request times & import time per package'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """docstring for function"""
+        parser.add_argument('--env', choices=['production', 'development'], default='production', help="PYTHON_ENV for the profiled worker (default: production)")
+        parser.add_argument('--runs', type=int, default=3, help='cold starts to run; the median one is reported')
+        parser.add_argument('--top', type=int, default=15, help='packages / imports to list')
+        parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+        parser.add_argument('--budget', type=float, default=None, help=f'fail (exit code 1) if the total exceeds this many seconds (default: no check; the test suite uses {STARTUP_BUDGET_SECONDS})')
+
+    def handle(self, *args, **options) -> None:
+        """docstring for function"""
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+        try:
+            report: dict[str, Any] = profile_startup_runs(options['runs'], {'PYTHON_ENV': options['env']}, options['top'])
+        except RuntimeError as e:
+            raise CommandError(str(e)) from e
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            seconds: dict[str, float] = report['seconds']
+            self.stdout.write(f"Cold start ({options['env']}, median of {options['runs']}): {seconds['total'] * 1000:.0f} ms  =  setup {seconds['setup'] * 1000:.0f} ms + URLconf {seconds['urlconf'] * 1000:.0f} ms + first request {seconds['firstRequest'] * 1000:.0f} ms  (process incl. interpreter: {seconds['process'] * 1000:.0f} ms)")
+            self.stdout.write(f"{report['modules']} modules imported, {report['importSeconds'] * 1000:.0f} ms import time; first request: {report['firstRequestStatus']}")
+            self.stdout.write('\nImport time by package (self time):')
+            for package in report['packages']:
+                self.stdout.write(f"  {package['ms']:>8.1f} ms  {package['package']}  ({package['modules']} modules)")
+            self.stdout.write('\nSlowest top-level imports (cumulative):')
+            for module in report['slowestImports']:
+                self.stdout.write(f"  {module['cumulativeMs']:>8.1f} ms  {module['module']}")
+            if report['output']:
+                self.stdout.write(f"\nPrinted at import time:\n{report['output']}")
+
+        if options['budget'] is not None and report['seconds']['total'] > options['budget']:
+            raise CommandError(f"Startup budget exceeded: {report['seconds']['total']:.3f} s > {options['budget']:.3f} s")
@@ -0,0 +1,174 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements always-on, low-overhead request instrumentation: per-request timings (wall / DB / serializer time, query count, response size) & process-wide Prometheus histograms
+Per-request numbers live in a ContextVar, so they follow the request into sync_to_async threads (async views) & are recorded by a DB execute wrapper installed on every connection (see apps.py)
+Served as 'Server-Timing' response headers (see middleware.py) & in Prometheus text format at /metrics
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+# ----------
+
+DURATION_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+QUERY_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS: tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)  # bytes
+
+# ----------
+
+class RequestTimings:
+    """docstring for class - accumulators for ONE request"""
+    __slots__ = ('start', 'db_seconds', 'queries', 'serializer_seconds')
+
+    def __init__(self):
+        self.start: float = time.perf_counter()
+        self.db_seconds: float = 0.0
+        self.queries: int = 0
+        self.serializer_seconds: float = 0.0
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+def start_request() -> Any:
+    """docstring for helper function - returns the token to pass to end_request()"""
+    return _current.set(RequestTimings())
+
+
+def end_request(token: Any) -> RequestTimings:
+    """docstring for helper function"""
+    timings: RequestTimings = _current.get()  # type: ignore
+    _current.reset(token)
+    return timings
+
+
+def query_timer(execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+    """docstring for helper function - DB execute wrapper (connection.execute_wrappers), a no-op outside an instrumented request"""
+    timings: RequestTimings | None = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start: float = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_seconds += time.perf_counter() - start
+        timings.queries += 1
+
+
+def install_query_timer(sender: Any, connection: Any, **kwargs: Any) -> None:  # pylint: disable=unused-argument
+    """docstring for helper function - 'connection_created' signal receiver"""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+@contextmanager
+def serializer_timer() -> Iterator[None]:
+    """docstring for helper function - wrap serialization (DRF serializer / fast renderer); queries run lazily inside the block are excluded, they already count as DB time"""
+    timings: RequestTimings | None = _current.get()
+    if timings is None:
+        yield
+        return
+    start: float = time.perf_counter()
+    db_seconds_before: float = timings.db_seconds
+    try:
+        yield
+    finally:
+        timings.serializer_seconds += (time.perf_counter() - start) - (timings.db_seconds - db_seconds_before)
+
+# ----------
+
+class Histogram:
+    """docstring for class - Prometheus-style cumulative histogram per label set (observe() is a bisect + 3 additions under a lock)"""
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], list[float]] = {}  # (route, method) --> per-bucket counts + [sum, count]
+
+    def observe(self, labels: tuple[str, str], value: float) -> None:
+        """docstring for function"""
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):  # non-cumulative here, summed when exported
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def expose(self) -> list[str]:
+        """docstring for function - Prometheus text exposition format lines"""
+        lines: list[str] = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for (route, method), series in sorted(snapshot.items()):
+            label_text = f'route="{_escape(route)}",method="{method}"'
+            cumulative: float = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound:g}"}} {cumulative:g}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {series[-1]:g}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series[-2]:.6g}')
+            lines.append(f'{self.name}_count{{{label_text}}} {series[-1]:g}')
+        return lines
+
+    def reset(self) -> None:
+        """docstring for function"""
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(label_value: str) -> str:
+    """docstring for helper function"""
+    return label_value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_DURATION = Histogram('todos_http_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS)
+DB_DURATION = Histogram('todos_http_db_duration_seconds', 'Time spent in DB queries per request.', DURATION_BUCKETS)
+DB_QUERIES = Histogram('todos_http_db_queries', 'DB queries per request.', QUERY_COUNT_BUCKETS)
+SERIALIZER_DURATION = Histogram('todos_http_serializer_duration_seconds', 'Time spent serializing per request (excluding DB time).', DURATION_BUCKETS)
+RESPONSE_SIZE = Histogram('todos_http_response_size_bytes', 'Response body size per request.', SIZE_BUCKETS)
+HISTOGRAMS: tuple[Histogram, ...] = (REQUEST_DURATION, DB_DURATION, DB_QUERIES, SERIALIZER_DURATION, RESPONSE_SIZE)
+
+# ----------
+
+def record(route: str, method: str, timings: RequestTimings, wall_seconds: float, response_size: int | None) -> None:
+    """docstring for helper function"""
+    labels: tuple[str, str] = (route, method)
+    REQUEST_DURATION.observe(labels, wall_seconds)
+    DB_DURATION.observe(labels, timings.db_seconds)
+    DB_QUERIES.observe(labels, timings.queries)
+    SERIALIZER_DURATION.observe(labels, timings.serializer_seconds)
+    if response_size is not None:  # unknown for streamed responses
+        RESPONSE_SIZE.observe(labels, response_size)
+
+
+def server_timing_header(timings: RequestTimings, wall_seconds: float) -> str:
+    """docstring for helper function - durations in milliseconds, as the Server-Timing spec expects"""
+    return (
+        f'app;dur={wall_seconds * 1000:.2f}, '
+        f'db;dur={timings.db_seconds * 1000:.2f};desc="{timings.queries} queries", '
+        f'ser;dur={timings.serializer_seconds * 1000:.2f}'
+    )
+
+
+def render_prometheus() -> str:
+    """docstring for helper function"""
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.expose())
+    return '\n'.join(lines) + '\n'
+
+
+def reset() -> None:
+    """docstring for helper function"""
+    for histogram in HISTOGRAMS:
+        histogram.reset()
@@ -0,0 +1,136 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements the Django app's middleware
+"""
+
+import gzip
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django_app.db_pool import is_pool_exhausted
+from django_app import metrics
+from django_app.static_assets import brotli, negotiate_encoding
+
+# ----------
+
+POOL_EXHAUSTED_RETRY_AFTER_SECONDS = 1
+
+COMPRESS_MIN_BYTES = 1024  # smaller bodies fit in a packet or two anyway -- not worth the CPU (& keeps small token-bearing bodies, e.g. /api/setCSRFtokenAsCookie, out of reach of BREACH-style attacks)
+COMPRESSIBLE_MEDIA_TYPES = frozenset(('application/json', 'application/vnd.todos.columnar+json', 'application/msgpack', 'application/javascript', 'image/svg+xml'))  # + every text/* type
+GZIP_LEVEL = 6  # per-request compression: zlib's default speed / size trade-off (precompressed static files use the maximum, see static_assets.py)
+BROTLI_QUALITY = 5  # ~gzip -9 size at ~gzip -6 speed; the maximum (11) is far too slow per request
+RESPONSE_ENCODINGS: tuple[str, ...] = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+class PoolExhaustedMiddleware(MiddlewareMixin):  # MiddlewareMixin: works in both the sync (WSGI) & async (ASGI) request paths
+    """docstring for class - no free DB connection w/in the pool's (short) checkout timeout --> fail fast w/ 503 + Retry-After, rather than a generic 500"""
+    # pylint: disable=unused-argument
+    def process_exception(self, request: HttpRequest, exception: Exception) -> HttpResponse | None:
+        """docstring for function"""
+        if not is_pool_exhausted(exception):
+            return None  # not ours -- default exception handling
+        response = JsonResponse({'error': 'Database connection pool exhausted, retry shortly'}, status=503)
+        response['Retry-After'] = str(POOL_EXHAUSTED_RETRY_AFTER_SECONDS)
+        return response
+
+
+class MetricsMiddleware:
+    """docstring for class - per-request wall / DB / serializer time, query count & response size --> 'Server-Timing' header + histograms at /metrics (see metrics.py)
+    Native sync AND async (no thread hop on the ASGI path), so it is cheap enough to leave on in production
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore
+        token = metrics.start_request()
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            timings = metrics.end_request(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """docstring for function"""
+        token = metrics.start_request()
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            timings = metrics.end_request(token)
+        return self.finish(request, response, timings)
+
+    @staticmethod
+    def finish(request: HttpRequest, response: HttpResponse, timings: metrics.RequestTimings) -> HttpResponse:
+        """docstring for function"""
+        wall_seconds: float = time.perf_counter() - timings.start
+        match = getattr(request, 'resolver_match', None)
+        route: str = match.route if match is not None else 'unmatched'  # URL pattern, not the path -- keeps label cardinality bounded (e.g. 'api/deleteTodo/<int:id_to_delete>')
+        response_size: int | None = None if response.streaming else len(response.content)
+        metrics.record(route, request.method or '', timings, wall_seconds, response_size)
+        response['Server-Timing'] = metrics.server_timing_header(timings, wall_seconds)
+        return response
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """docstring for helper function"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """docstring for class - gzip / brotli (per Accept-Encoding) for API & page responses of at least COMPRESS_MIN_BYTES
+    Streaming responses (SSE change feed, exports) & already-encoded ones (precompressed static files) are passed through untouched
+    A compressed body gets a weak ETag (as Django's GZipMiddleware does), which the conditional GETs compare weakly (see views.etag_matches)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """docstring for function"""
+        return self.compress(request, await self.get_response(request))
+
+    @staticmethod
+    def compress(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """docstring for function"""
+        if response.streaming or response.status_code != 200 or response.has_header('Content-Encoding') or len(response.content) < COMPRESS_MIN_BYTES:
+            return response
+        media_type: str = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if media_type not in COMPRESSIBLE_MEDIA_TYPES and not media_type.startswith('text/'):
+            return response
+
+        patch_vary_headers(response, ['Accept-Encoding'])  # whichever encoding this client gets, caches must not hand it to a client that accepts a different one
+        encoding: str = negotiate_encoding(request.headers.get('Accept-Encoding', ''), RESPONSE_ENCODINGS)
+        if encoding == 'identity':
+            return response
+        with metrics.serializer_timer():  # encode CPU shows up under Server-Timing 'ser'
+            compressed: bytes = compress_body(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(compressed))
+        etag: str | None = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:12
+
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+"""docstring for auto-generated module"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """docstring for auto-generated class"""
+
+    dependencies = [
+        ('django_app', '0003_todoslistversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='todos',
+            name='sorted_rank',
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:13
+
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+"""docstring for auto-generated module"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """docstring for auto-generated class"""
+
+    dependencies = [
+        ('django_app', '0004_alter_todos_sorted_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todos',
+            name='client_temp_id',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
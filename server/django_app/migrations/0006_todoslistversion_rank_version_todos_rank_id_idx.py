@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:14
+
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+"""docstring for auto-generated module"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """docstring for auto-generated class"""
+
+    dependencies = [
+        ('django_app', '0005_todos_client_temp_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todoslistversion',
+            name='rank_version',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(fields=['sorted_rank', 'id'], name='todos_rank_id_idx'),
+        ),
+    ]
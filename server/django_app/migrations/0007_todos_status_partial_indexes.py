@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:14
+
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+"""docstring for auto-generated module"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """docstring for auto-generated class"""
+
+    dependencies = [
+        ('django_app', '0006_todoslistversion_rank_version_todos_rank_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(condition=models.Q(('status_complete', False)), fields=['sorted_rank', 'id'], name='todos_active_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(condition=models.Q(('status_complete', True)), fields=['sorted_rank', 'id'], name='todos_completed_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:47
+
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+"""docstring for auto-generated module"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """docstring for auto-generated class - existing tasks land in list 1 (the field default), whose version row already exists (see 0003); new indexes are built before the old ones are dropped"""
+
+    dependencies = [
+        ('django_app', '0007_todos_status_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todos',
+            name='list_id',
+            field=models.BigIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(fields=['list_id', 'sorted_rank', 'id'], name='todos_list_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(condition=models.Q(('status_complete', False)), fields=['list_id', 'sorted_rank', 'id'], name='todos_list_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(condition=models.Q(('status_complete', True)), fields=['list_id', 'sorted_rank', 'id'], name='todos_list_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todos',
+            index=models.Index(fields=['list_id', 'client_temp_id'], name='todos_list_temp_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='todos',
+            name='todos_rank_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='todos',
+            name='todos_active_rank_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='todos',
+            name='todos_completed_rank_idx',
+        ),
+        migrations.AlterField(
+            model_name='todos',
+            name='client_temp_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:05
+
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+"""docstring for auto-generated module - substring search index on todos.task (see Todos.search)
+PostgreSQL: trigram GIN index led by list_id (pg_trgm + btree_gin, both 'trusted' extensions since PostgreSQL 13, so the database owner can create them) -- serves 'list_id = ... AND task ILIKE %...%'
+SQLite (tests / local runs): external-content FTS5 table w/ the trigram tokenizer (SQLite >= 3.34), kept in step w/ todos by triggers -- so the raw SQL writes (multi-row INSERT, DELETE ... RETURNING) are covered too
+Note: on SQLite, a later migration that rebuilds the todos table (e.g. AlterField) drops the triggers, & must re-run create_search_index
+"""
+from django.db import migrations
+
+SQLITE_SEARCH_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todos_search USING fts5(task, content='todos', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS todos_search_insert AFTER INSERT ON todos BEGIN INSERT INTO todos_search(rowid, task) VALUES (new.id, new.task); END',
+    "CREATE TRIGGER IF NOT EXISTS todos_search_delete AFTER DELETE ON todos BEGIN INSERT INTO todos_search(todos_search, rowid, task) VALUES ('delete', old.id, old.task); END",
+    "CREATE TRIGGER IF NOT EXISTS todos_search_update AFTER UPDATE OF task ON todos BEGIN INSERT INTO todos_search(todos_search, rowid, task) VALUES ('delete', old.id, old.task); INSERT INTO todos_search(rowid, task) VALUES (new.id, new.task); END",
+    "INSERT INTO todos_search(todos_search) VALUES ('rebuild')",  # index the existing rows
+)
+SQLITE_DROP_SQL = (
+    'DROP TRIGGER IF EXISTS todos_search_insert',
+    'DROP TRIGGER IF EXISTS todos_search_delete',
+    'DROP TRIGGER IF EXISTS todos_search_update',
+    'DROP TABLE IF EXISTS todos_search',
+)
+POSTGRESQL_SEARCH_SQL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE EXTENSION IF NOT EXISTS btree_gin',  # GIN operator class for the bigint list_id column
+    'CREATE INDEX IF NOT EXISTS todos_list_task_trgm_idx ON todos USING gin (list_id, task gin_trgm_ops)',
+)
+POSTGRESQL_DROP_SQL = (
+    'DROP INDEX IF EXISTS todos_list_task_trgm_idx',  # extensions are left installed (other objects may use them)
+)
+
+
+def create_search_index(apps, schema_editor):  # pylint: disable=unused-argument
+    """docstring for function - nothing on other backends (Todos.search falls back to an unindexed icontains there)"""
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        statements: tuple[str, ...] = POSTGRESQL_SEARCH_SQL
+    elif connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 34):
+        statements = SQLITE_SEARCH_SQL
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):  # pylint: disable=unused-argument
+    """docstring for function"""
+    connection = schema_editor.connection
+    for statement in {'postgresql': POSTGRESQL_DROP_SQL, 'sqlite': SQLITE_DROP_SQL}.get(connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    """docstring for auto-generated class"""
+
+    dependencies = [
+        ('django_app', '0008_todos_list_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
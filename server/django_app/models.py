@@ -13,23 +13,156 @@ docstring for module
 This module implements the Todos model for the To Do List app
 """
 
-from typing import Dict
-from django.db import models, transaction, IntegrityError
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable
+from django.db import models, connection, transaction, IntegrityError
+from django.db.models import Count, F
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
+from django_app.events import publish_delta_on_commit, publish_reset_on_commit
 
 # ----------
 
 # To Do data structure typing
 ToDoType = Dict[str, int | str | bool]
 
+# Gap-based ranking: new / moved tasks get a sorted_rank w/ a wide gap to their neighbours, so a single drag & drop move only needs to write ONE row (the midpoint between its new neighbours)
+# Ranks are only renormalised (re-spaced by RANK_GAP across the whole list) once two neighbours end up w/ no integer left between them
+RANK_GAP = 1 << 16
+
+# Every task belongs to ONE list ('list_id'); every query, rank & list version is scoped to a single list, so per-request cost follows the size of that list, not of the whole table
+# List 1 is the original single list (existing rows were migrated into it) & the default for clients that don't pick one
+DEFAULT_LIST_ID = 1
+
+# Columns written by Todos.insert_rows (bulk seed / import) -- one bind parameter per column per row
+INSERT_ROWS_COLUMNS = ('list_id', 'sorted_rank', 'created_at', 'task', 'status_complete')
+
+# Substring search over task text (see Todos.search & migration 0009): trigram GIN index on PostgreSQL, FTS5 trigram table kept in step by triggers on SQLite
+SEARCH_TABLE = 'todos_search'  # SQLite only
+SEARCH_MIN_TRIGRAM_LENGTH = 3  # shorter queries contain no trigram, so no index can serve them -- they scan the list instead
+
+# ----------
+
+@models.CharField.register_lookup
+class ILikeContains(models.Lookup):
+    """docstring for class - 'task__ilike_contains=...' --> "task ILIKE '%...%'" (PostgreSQL only)
+    Django's own icontains compares UPPER(task), which a trigram index on the plain column can't serve
+    """
+    lookup_name = 'ilike_contains'
+
+    def as_sql(self, compiler: Any, conn: Any) -> tuple[str, list[Any]]:  # pylint: disable=arguments-renamed  # conn -- the module-level connection is imported above
+        """docstring for function"""
+        lhs, lhs_params = self.process_lhs(compiler, conn)
+        rhs, rhs_params = self.process_rhs(compiler, conn)
+        pattern_params: list[str] = [f'%{conn.ops.prep_for_like_query(param)}%' for param in rhs_params]  # escapes '%', '_' & '\\' in the query
+        return f'{lhs} ILIKE {rhs}', [*lhs_params, *pattern_params]
+
+# ----------
+
+# Rows created / changed / deleted by a single committed write, plus the list version that write produced (used for 'delta' responses in views.py)
+@dataclass
+class TodosDelta:
+    """docstring for class"""
+    version: int
+    created: list[Any] = field(default_factory=list)  # Todos instances
+    updated: list[Any] = field(default_factory=list)  # Todos instances
+    deleted: list[int] = field(default_factory=list)  # ids only (row no longer exists)
+    list_id: int = DEFAULT_LIST_ID  # list the write happened in (its change feed gets the event)
+
+# ----------
+
+# Synthetic task text (bulk seeding / benchmarks) -- real words, so text search has something to match
+SYNTHETIC_WORDS: tuple[str, ...] = (
+    'buy', 'milk', 'call', 'mom', 'fix', 'bug', 'write', 'report', 'book', 'flight', 'clean', 'kitchen', 'review', 'pull', 'request',
+    'pay', 'rent', 'walk', 'dog', 'plan', 'trip', 'update', 'resume', 'water', 'plants', 'email', 'team', 'read', 'chapter', 'gym',
+)
+
+def synthetic_task(rng: random.Random, length: int) -> str:
+    """docstring for helper function - random words, cut to ~'length' characters (capped by Todos.task max_length)"""
+    length = max(1, min(length, 50))
+    words: list[str] = rng.choices(SYNTHETIC_WORDS, k=length // 3 + 1)  # shortest word is 3 characters (+ space), so always enough text
+    return ' '.join(words)[:length].rstrip()
+
+# ----------
+
+# Full-list DnD payload ('toDosArrayFull', see Todos.apply_sorted_ranks) -- checked the same way by /api/updateSortingOrderPostDnD (sync & async) & the batch 'reorder' operation
+def is_integer(value: Any) -> bool:
+    """docstring for helper function - JSON integer (bool is an int subclass in Python, so it is excluded)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def sorted_todos_error(sorted_todos_array: Any) -> str | None:
+    """docstring for helper function - None if valid, else what is wrong w/ it"""
+    if not isinstance(sorted_todos_array, list):
+        return "'toDosArrayFull' must be a list"
+    if not all(isinstance(todo, dict) and is_integer(todo.get('id')) and is_integer(todo.get('newSortedRank')) for todo in sorted_todos_array):
+        return "every 'toDosArrayFull' entry needs an integer 'id' & 'newSortedRank'"
+    return None
+
+# ----------
+
+class TodosListVersion(models.Model):
+    """docstring for class - one row per list (primary key = list id): monotonically increasing version counter for that list (bumped by every write, inside the writer's transaction)"""
+
+    version = models.BigIntegerField(default=0)  # type: ignore
+    rank_version = models.BigIntegerField(default=0)  # type: ignore  # only bumped by writes that re-order existing tasks (invalidates keyset pagination cursors, see pagination.py)
+
+    objects = models.Manager()
+
+    # pylint: disable=too-few-public-methods
+    class Meta:
+        """docstring for class"""
+        db_table = 'todos_list_version'
+
+    def __str__(self) -> str:
+        """docstring for function"""
+        return f'v{self.version}'
+
+    @classmethod
+    def current(cls, list_id: int = DEFAULT_LIST_ID) -> int:
+        """docstring for function - O(1) primary key lookup of the current list version (0 for a list that was never written to)"""
+        version = cls.objects.filter(pk=list_id).values_list('version', flat=True).first()
+        return version or 0
+
+    @classmethod
+    async def acurrent(cls, list_id: int = DEFAULT_LIST_ID) -> int:
+        """docstring for function - async ORM version of current() (used by the async views)"""
+        version = await cls.objects.filter(pk=list_id).values_list('version', flat=True).afirst()
+        return version or 0
+
+    @classmethod
+    def current_rank_version(cls, list_id: int = DEFAULT_LIST_ID) -> int:
+        """docstring for function - O(1) primary key lookup of the current rank (ordering) version"""
+        rank_version = cls.objects.filter(pk=list_id).values_list('rank_version', flat=True).first()
+        return rank_version or 0
+
+    @classmethod
+    def bump(cls, reordered: bool = False, list_id: int = DEFAULT_LIST_ID) -> int:
+        """docstring for function - increment & return the list's version (call INSIDE the writer's transaction.atomic() block so the bump commits / rolls back together w/ the write)
+        Pass reordered=True for writes that change the relative order of EXISTING tasks (appends, toggles & deletes leave keyset cursors valid)
+        """
+        changes: dict[str, Any] = {'version': F('version') + 1}
+        if reordered:
+            changes['rank_version'] = F('rank_version') + 1
+        # Note: the UPDATE takes a row lock on this list's version row, so concurrent writers to the SAME list are serialized until the surrounding transaction commits (other lists are not blocked)
+        if not cls.objects.filter(pk=list_id).update(**changes):
+            cls.objects.get_or_create(pk=list_id)  # first write to this list (or flushed DB) -- create its version row & bump again
+            cls.objects.filter(pk=list_id).update(**changes)
+        return cls.current(list_id)
+
 # ----------
 
 class Todos(models.Model):
     """docstring for class"""
-    sorted_rank = models.IntegerField()  # type: ignore
+    sorted_rank = models.BigIntegerField()  # type: ignore  # 64-bit so ranks can be spaced RANK_GAP apart
     created_at = models.DateTimeField(auto_now_add=True)  # type: ignore  # replaced 'blank=True, null=True' w/ default timestamp using Django's 'auto_now_add=True'
     task = models.CharField(max_length=50)  # type: ignore
     status_complete = models.BooleanField(default=False)  # type: ignore
+    client_temp_id = models.BigIntegerField(null=True, blank=True)  # type: ignore  # negative temp id the client used for this task before it knew the server id (resolves ids in 'updateSortingOrderPostDnD' payloads)
+    list_id = models.BigIntegerField(default=DEFAULT_LIST_ID)  # type: ignore  # list (tenant) the task belongs to -- leads every index below
 
     objects = models.Manager()  # including this to avoid 'no-member' pylint error in Django (noting that this is unnecessary as Django automatically adds an objects attribute to every model, an instance of django.db.models.Manager)
 
@@ -37,47 +170,344 @@ class Todos(models.Model):
     class Meta:
         """docstring for class"""
         db_table = 'todos'  # specify the exact table name used in PostgreSQL DB
+        indexes = [
+            models.Index(fields=['list_id', 'sorted_rank', 'id'], name='todos_list_rank_idx'),  # one list in order + keyset pagination (see pagination.py) + MAX(sorted_rank) of a list
+            models.Index(fields=['list_id', 'sorted_rank', 'id'], condition=models.Q(status_complete=False), name='todos_list_active_idx'),  # ?status=active (ordered scan of one list's active tasks only) + active count
+            models.Index(fields=['list_id', 'sorted_rank', 'id'], condition=models.Q(status_complete=True), name='todos_list_completed_idx'),  # ?status=completed + 'Clear Completed' + completed count
+            models.Index(fields=['list_id', 'client_temp_id'], name='todos_list_temp_id_idx'),  # temp id lookups (temp ids are only unique w/in a list)
+        ]
 
     def __str__(self) -> str:
         """docstring for function - displays task name in Django Admin Panel for improved readability"""
         return f'{self.task}'
 
     @classmethod
-    def seed_db(cls):  # seed database w/ sample data
+    def in_list(cls, list_id: int = DEFAULT_LIST_ID) -> models.QuerySet:  # starting point of every query -- one list's tasks
+        """docstring for function - 'WHERE list_id = ...' is the leading column of every index, so whatever is chained on stays w/in that list's index range"""
+        return cls.objects.filter(list_id=list_id)
+
+    @classmethod
+    def search(cls, query: str, list_id: int = DEFAULT_LIST_ID) -> models.QuerySet:  # case-insensitive substring match on task, w/in one list
+        """docstring for function - unordered QuerySet (chain status filters / keyset pagination on); indexed per backend, see migration 0009"""
+        queryset: models.QuerySet = cls.in_list(list_id)
+        if connection.vendor == 'postgresql':
+            return queryset.filter(task__ilike_contains=query)  # bitmap scan of the (list_id, task) trigram GIN index
+        if connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 34) and len(query) >= SEARCH_MIN_TRIGRAM_LENGTH:  # type: ignore
+            phrase: str = '"' + query.replace('"', '""') + '"'  # one FTS5 phrase -- w/ the trigram tokenizer, a case-insensitive substring match (no query syntax leaks through)
+            return queryset.filter(id__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [phrase]))
+        return queryset.filter(task__icontains=query)  # no usable index -- scans the list (still only that list's rows)
+
+    @classmethod
+    def status_counts(cls, list_id: int = DEFAULT_LIST_ID) -> dict[str, int]:  # active / completed totals in a single aggregate query
+        """docstring for function"""
+        return cls.in_list(list_id).aggregate(
+            active=Count('id', filter=models.Q(status_complete=False)),
+            completed=Count('id', filter=models.Q(status_complete=True)),
+        )
+
+    @classmethod
+    def seed_db(cls, list_id: int = DEFAULT_LIST_ID) -> TodosDelta:  # seed database w/ sample data
         """docstring for function - seeding DB transaction"""
         try:
             # Start DB transaction using Django's transaction.atomic() context manager
             with transaction.atomic():
                 # Note: Use bulk_create() for large data sets
+                created: list[Todos] = []
                 for i in range(6, 0, -1):
                     if i == 5:
-                        cls.objects.create(sorted_rank=i, task=f'Sample Task {i}', status_complete=True)
+                        created.append(cls.objects.create(sorted_rank=i * RANK_GAP, task=f'Sample Task {i}', status_complete=True, list_id=list_id))
                     else:
-                        cls.objects.create(sorted_rank=i, task=f'Sample Task {i}', status_complete=False)
+                        created.append(cls.objects.create(sorted_rank=i * RANK_GAP, task=f'Sample Task {i}', status_complete=False, list_id=list_id))
+                return publish_delta_on_commit(TodosDelta(version=TodosListVersion.bump(list_id=list_id), created=created, list_id=list_id))
         except IntegrityError as e:
             # Note:  Transaction roll back in case of error handled automatically / implicitly above by Django
             raise IntegrityError('An error occurred, rolling back transaction: ' + str(e)) from e
 
     @classmethod
-    def update_sorted_rank(cls, sorted_todos_array: list[ToDoType]):  # update sorted_rank key fields w/in DB based on latest DnD positioning
-        """docstring for function - DB transaction"""
+    def bulk_seed(cls, count: int, completed_ratio: float = 0.0, task_length: Callable[[], int] = lambda: 20, rng: random.Random | None = None, batch_size: int = 1_000, list_id: int = DEFAULT_LIST_ID) -> int:  # seed database w/ synthetic data at scale
+        """docstring for function - appends 'count' synthetic tasks (see insert_rows) in one transaction w/ one version bump, returns the new list version"""
+        rng = rng or random.Random()
+        created_at: Any = cls._meta.get_field('created_at').get_db_prep_save(timezone.now(), connection)  # one timestamp for the whole seed
+        with transaction.atomic():
+            version: int = TodosListVersion.bump(list_id=list_id)  # lock first, like add_new_task, so concurrent inserts can't take the same ranks
+            max_sorted_rank: int = cls.in_list(list_id).aggregate(max_rank=models.Max('sorted_rank'))['max_rank'] or 0
+            for batch_start in range(0, count, batch_size):
+                cls.insert_rows([
+                    (max_sorted_rank + (i + 1) * RANK_GAP, created_at, synthetic_task(rng, task_length()), rng.random() < completed_ratio)
+                    for i in range(batch_start, min(batch_start + batch_size, count))
+                ], list_id)
+            publish_reset_on_commit(version, list_id)  # too many rows for a delta event -- open /api/events streams tell their clients to re-fetch
+            return version
+
+    @classmethod
+    def bulk_import(cls, rows: Iterable[tuple[str, bool, datetime | None]], batch_size: int = 1_000, list_id: int = DEFAULT_LIST_ID) -> tuple[int, int]:  # append imported tasks (see transfer.py)
+        """docstring for function - appends (task, status_complete, created_at or None) rows in the given order, in one transaction w/ one version bump; returns (rows imported, new list version)
+        'rows' is consumed lazily, one batch at a time (e.g. a file being parsed line by line), so memory use depends on 'batch_size', not on the number of rows
+        """
+        created_at_field = cls._meta.get_field('created_at')
+        now: datetime = timezone.now()
+        imported: int = 0
+        rows = iter(rows)
+        with transaction.atomic():
+            version: int = TodosListVersion.bump(list_id=list_id)
+            next_rank: int = (cls.in_list(list_id).aggregate(max_rank=models.Max('sorted_rank'))['max_rank'] or 0) + RANK_GAP
+            while batch := list(islice(rows, batch_size)):
+                cls.insert_rows([
+                    (next_rank + i * RANK_GAP, created_at_field.get_db_prep_save(created_at or now, connection), task, status_complete)
+                    for i, (task, status_complete, created_at) in enumerate(batch)
+                ], list_id)
+                next_rank += len(batch) * RANK_GAP
+                imported += len(batch)
+            publish_reset_on_commit(version, list_id)
+            return imported, version
+
+    @classmethod
+    def insert_rows(cls, rows: list[tuple[int, Any, str, bool]], list_id: int = DEFAULT_LIST_ID) -> None:  # ONE multi-row INSERT
+        """docstring for function - (sorted_rank, created_at, task, status_complete) tuples w/ values already prepared for the DB -- no model instances or per-field prep, which dominate bulk_create() at scale
+        Call inside a transaction holding the list's version row lock; keep len(rows) * len(INSERT_ROWS_COLUMNS) under the backend's parameter limit (SQLite 32766, PostgreSQL 65535)
+        """
+        if not rows:
+            return
+        quote_name = connection.ops.quote_name
+        columns: str = ', '.join(quote_name(column) for column in INSERT_ROWS_COLUMNS)
+        placeholders: str = '(' + ', '.join(['%s'] * len(INSERT_ROWS_COLUMNS)) + ')'
+        params: list[Any] = [value for row in rows for value in (list_id, *row)]
+        with connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {quote_name(cls._meta.db_table)} ({columns}) VALUES ' + ', '.join([placeholders] * len(rows)), params)
+
+    @classmethod
+    def bulk_set_ranks(cls, new_ranks: dict[int, int]) -> None:  # write many sorted_rank values as ONE set-based statement
+        """docstring for function - {id: new sorted_rank}; the whole mapping travels as a single JSON parameter, so the statement (and its parameter count) stays the same size however many rows change"""
+        if not new_ranks:
+            return
+        payload: str = json.dumps([{'id': todo_id, 'sorted_rank': rank} for todo_id, rank in new_ranks.items()])
+        table: str = connection.ops.quote_name(cls._meta.db_table)
+        if connection.vendor == 'postgresql':
+            sql = f'UPDATE {table} SET sorted_rank = v.sorted_rank FROM jsonb_to_recordset(%s::jsonb) AS v(id bigint, sorted_rank bigint) WHERE {table}.id = v.id'
+        elif connection.vendor == 'sqlite':
+            sql = f"UPDATE {table} SET sorted_rank = json_extract(v.value, '$.sorted_rank') FROM json_each(%s) AS v WHERE {table}.id = json_extract(v.value, '$.id')"
+        else:  # other backends -- fall back to Django's CASE-based bulk_update()
+            cls.objects.bulk_update([cls(id=todo_id, sorted_rank=rank) for todo_id, rank in new_ranks.items()], ['sorted_rank'])
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [payload])
+
+    @classmethod
+    def update_sorted_rank(cls, sorted_todos_array: list[ToDoType], list_id: int = DEFAULT_LIST_ID) -> TodosDelta:  # update sorted_rank key fields w/in DB based on latest DnD positioning
+        """docstring for function - DB transaction applying the full DnD array (see apply_sorted_ranks)"""
         try:
             # Start DB transaction using Django's transaction.atomic() context manager
             with transaction.atomic():
-                for todo in sorted_todos_array:
-                    if todo['id'] != -1:  # check if 'id' key on todo object represents newly added task (-1) that needs to be auto-assigned by PostgreSQL
-                        obj = cls.objects.get(id=todo['id'])
-                    else:  # if 'id' key in todo object = -1, add new task to DB (changing / auto-incrementing 'id' field in PostgreSQL)
-                        obj = cls.objects.get(task=todo['task'], status_complete=todo['statusComplete'])  # Note: assuming this 2 field combo is unique
-                    obj.sorted_rank = todo['newSortedRank']  # update sorted_rank key field w/in pre-existing DB row
-                    # Make the existing datetime timezone-aware (avoids following CLI error: 'RuntimeWarning: DateTimeField Todos.created_at received a naive datetime (2024-05-29 06:04:16.935156) while time zone support is active.')
-                    aware_datetime = timezone.make_aware(obj.created_at, timezone=timezone.get_default_timezone())
-                    obj.created_at = aware_datetime  # Set created_at to the timezone-aware datetime
-                    obj.save()
+                version: int = TodosListVersion.bump(reordered=True, list_id=list_id)  # bump first -- the version row lock keeps concurrent writers out while ranks are compared
+                return publish_delta_on_commit(TodosDelta(version=version, updated=cls.apply_sorted_ranks(sorted_todos_array, list_id), list_id=list_id), reordered=True)
         except IntegrityError as e:
             # Note:  Transaction roll back in case of error handled automatically / implicitly above by Django
             raise IntegrityError('An error occurred, rolling back transaction: ' + str(e)) from e
 
+    @classmethod
+    def apply_sorted_ranks(cls, sorted_todos_array: list[ToDoType], list_id: int = DEFAULT_LIST_ID) -> list['Todos']:  # returns the rows whose rank changed
+        """docstring for function - call inside a transaction; applies the full DnD array (checked w/ sorted_todos_error first) w/ a constant number of queries (1 read + 1 set-based UPDATE, whatever the list size)
+        Tasks the client has not yet seen a server id for are sent w/ their negative client temp id (see add_new_task) & resolved via 'client_temp_id' in the same read
+        Only rows whose rank actually changed are written; ids that no longer exist (e.g. deleted from another tab) or belong to another list are skipped
+        """
+        by_id: dict[int, Todos] = {}
+        by_temp_id: dict[int, Todos] = {}
+        for obj in cls.in_list(list_id).order_by('id'):  # single read of current ranks (the payload is the full list, so no IN-list needed)
+            by_id[obj.id] = obj
+            if obj.client_temp_id is not None:
+                by_temp_id[obj.client_temp_id] = obj  # ordered by id, so a reused temp id (e.g. legacy '-1') resolves to the most recently added task
+
+        updated: list[Todos] = []
+        for todo in sorted_todos_array:
+            todo_id = int(todo['id'])
+            new_rank = int(todo['newSortedRank'])  # convert BEFORE comparing w/ the stored rank
+            obj = by_id.get(todo_id) if todo_id >= 0 else by_temp_id.get(todo_id)
+            if obj is None or obj.sorted_rank == new_rank:
+                continue  # unknown id or unchanged rank -- nothing to write
+            obj.sorted_rank = new_rank  # update sorted_rank key field on the in-memory row (for the delta response)
+            updated.append(obj)
+
+        cls.bulk_set_ranks({obj.id: obj.sorted_rank for obj in updated})
+        return updated
+
+    @classmethod
+    def add_new_task(cls, validated_data: dict[str, Any], client_temp_id: int | None = None, list_id: int = DEFAULT_LIST_ID) -> TodosDelta:  # append new task to bottom of list
+        """docstring for function - DB transaction"""
+        with transaction.atomic():
+            version: int = TodosListVersion.bump(list_id=list_id)  # bump FIRST -- its row lock serializes concurrent inserts, so no two can read the same MAX(sorted_rank) below
+            created: Todos = cls.insert_at_end(cls(client_temp_id=client_temp_id, list_id=list_id, **validated_data))
+            return publish_delta_on_commit(TodosDelta(version=version, created=[created], list_id=list_id))  # change feed event sent to open /api/events streams once this commits
+
+    @classmethod
+    def insert_at_end(cls, todo: 'Todos') -> 'Todos':
+        """docstring for function - allocate the next rank & insert in ONE round trip: 'INSERT ... VALUES ((SELECT COALESCE(MAX(sorted_rank), 0) + gap ...), ...) RETURNING id, sorted_rank' (2 round trips where RETURNING is missing)
+        Call inside a transaction that holds the list version row lock (see add_new_task) -- the rank is only race-free while writers are serialized
+        """
+        fields = [model_field for model_field in cls._meta.concrete_fields if model_field.attname not in ('id', 'sorted_rank')]
+        params: list[Any] = [RANK_GAP, todo.list_id]
+        for model_field in fields:
+            params.append(model_field.get_db_prep_save(model_field.pre_save(todo, add=True), connection))  # pre_save() fills created_at (auto_now_add) on the instance too
+        quote_name = connection.ops.quote_name
+        table: str = quote_name(cls._meta.db_table)
+        columns: str = ', '.join(quote_name(model_field.column) for model_field in fields)
+        placeholders: str = ', '.join(['%s'] * len(fields))
+        # Note: the MAX() is an index-only lookup on 'todos_list_rank_idx' (last entry of this list's range), not a table scan
+        # Note: scalar subquery inside VALUES (rather than 'INSERT ... SELECT') so PostgreSQL types each parameter by its target column
+        sql: str = f'INSERT INTO {table} (sorted_rank, {columns}) VALUES ((SELECT COALESCE(MAX(sorted_rank), 0) + %s FROM {table} WHERE list_id = %s), {placeholders})'
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql' or (connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)):  # type: ignore
+                cursor.execute(f'{sql} RETURNING id, sorted_rank', params)
+                todo.id, todo.sorted_rank = cursor.fetchone()
+            else:  # other backends / SQLite < 3.35 (no RETURNING) -- same single INSERT, then read the id & the allocated rank back
+                cursor.execute(sql, params)
+                todo.id = connection.ops.last_insert_id(cursor, cls._meta.db_table, 'id')
+                todo.sorted_rank = cls.objects.values_list('sorted_rank', flat=True).get(id=todo.id)
+        todo._state.adding = False  # pylint: disable=protected-access  # mark as a saved row (as objects.create() would)
+        todo._state.db = connection.alias  # pylint: disable=protected-access
+        return todo
+
+    @staticmethod
+    def rank_between(before_rank: int | None, after_rank: int | None) -> int | None:
+        """docstring for function - rank for a task placed between 2 neighbours (None = no neighbour on that side), or None if there is no integer gap left"""
+        if before_rank is None and after_rank is None:
+            return 0
+        if before_rank is None:
+            return after_rank - RANK_GAP  # type: ignore  # moved to top of list
+        if after_rank is None:
+            return before_rank + RANK_GAP  # moved to bottom of list
+        if after_rank - before_rank < 2:
+            return None
+        return before_rank + (after_rank - before_rank) // 2
+
+    @classmethod
+    def renormalise_ranks(cls, list_id: int = DEFAULT_LIST_ID) -> list['Todos']:  # re-space every sorted_rank RANK_GAP apart, keeping the current order
+        """docstring for function - call inside a transaction; rare (only when a gap runs out), so it is allowed to touch every row of the list"""
+        todos: list[Todos] = list(cls.in_list(list_id).order_by('sorted_rank', 'id'))
+        for position, todo in enumerate(todos, start=1):
+            todo.sorted_rank = position * RANK_GAP
+        cls.bulk_set_ranks({todo.id: todo.sorted_rank for todo in todos})
+        return todos
+
+    @classmethod
+    def move_todo(cls, id_to_move: int, before_id: int | None, after_id: int | None, list_id: int = DEFAULT_LIST_ID) -> TodosDelta:  # single-item drag & drop move
+        """docstring for function - DB transaction placing a task between its new neighbours (see apply_move)"""
+        with transaction.atomic():
+            version: int = TodosListVersion.bump(reordered=True, list_id=list_id)  # bump first -- the version row lock serializes concurrent moves so they don't pick the same midpoint
+            return publish_delta_on_commit(TodosDelta(version=version, updated=cls.apply_move(id_to_move, before_id, after_id, list_id), list_id=list_id), reordered=True)
+
+    @classmethod
+    def apply_move(cls, id_to_move: int, before_id: int | None, after_id: int | None, list_id: int = DEFAULT_LIST_ID) -> list['Todos']:  # returns the rows whose rank changed
+        """docstring for function - call inside a transaction; before_id = task directly above, after_id = task directly below (None at either end of the list)
+        Writes exactly one row unless the gap between the neighbours has run out, in which case the whole list is renormalised first
+        Raises Todos.DoesNotExist if any of the ids are unknown (or in another list), ValueError if before_id is not ranked above after_id
+        """
+        neighbour_ids: list[int] = [i for i in (before_id, after_id) if i is not None]
+        if id_to_move in neighbour_ids:
+            raise ValueError('A task cannot be moved relative to itself')
+        rows: dict[int, Todos] = cls.in_list(list_id).in_bulk([id_to_move, *neighbour_ids])  # moved task + both neighbours in a single query
+        if len(rows) != len({id_to_move, *neighbour_ids}):
+            raise cls.DoesNotExist(f'No Todos matches ids {[id_to_move, *neighbour_ids]}')
+
+        if before_id is not None and after_id is not None and (rows[before_id].sorted_rank, before_id) >= (rows[after_id].sorted_rank, after_id):  # list order is (sorted_rank, id)
+            raise ValueError('before_id must be ranked above after_id')  # before any write -- a bad request never costs a renormalisation
+
+        updated: list[Todos] = []
+        new_rank = cls.rank_between(rows[before_id].sorted_rank if before_id is not None else None, rows[after_id].sorted_rank if after_id is not None else None)
+        if new_rank is None:  # correctly ordered, but no gap left between the neighbours -- re-space the list & try again
+            updated = cls.renormalise_ranks(list_id)
+            ranks: dict[int, int] = {todo.id: todo.sorted_rank for todo in updated}
+            new_rank = cls.rank_between(ranks[before_id] if before_id is not None else None, ranks[after_id] if after_id is not None else None)
+            if new_rank is None:
+                raise ValueError('before_id must be ranked above after_id')
+
+        moved: Todos = rows[id_to_move]
+        if before_id is None and after_id is None:
+            new_rank = moved.sorted_rank  # only task in the list, nothing to move relative to
+        moved.sorted_rank = new_rank
+        cls.objects.filter(id=id_to_move).update(sorted_rank=new_rank)  # the single row write for this move
+        return [todo for todo in updated if todo.id != id_to_move] + [moved]
+
+    @classmethod
+    def toggle_rows(cls, id_to_update: int, list_id: int = DEFAULT_LIST_ID) -> list['Todos']:  # flip status_complete on a single task as ONE statement
+        """docstring for function - call inside a transaction; 'UPDATE ... SET status_complete = NOT status_complete ... RETURNING' flips the value in the database (no read-modify-write, so concurrent toggles can't lose each other's updates), writes only that column & returns the changed row in the same round trip
+        Returns [] if no task w/ this id in this list"""
+        table: str = connection.ops.quote_name(cls._meta.db_table)
+        where: str = 'id = %s AND list_id = %s'
+        params: list[Any] = [id_to_update, list_id]
+        if connection.vendor == 'postgresql' or (connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)):  # type: ignore
+            columns: str = ', '.join(connection.ops.quote_name(field.column) for field in cls._meta.concrete_fields)
+            return list(cls.objects.raw(f'UPDATE {table} SET status_complete = NOT status_complete WHERE {where} RETURNING {columns}', params))  # raw() applies the backend's value converters (e.g. SQLite datetimes & booleans)
+        # other backends -- the same atomic flip w/ an F() expression, then read back the changed row (the affected-row count still decides 404)
+        queryset: models.QuerySet = cls.in_list(list_id).filter(id=id_to_update)
+        if not queryset.update(status_complete=~F('status_complete')):
+            return []
+        return list(queryset)
+
+    @classmethod
+    def toggle_status_complete(cls, id_to_update: int, list_id: int = DEFAULT_LIST_ID) -> TodosDelta:  # flip status_complete on a single task
+        """docstring for function - DB transaction (raises Todos.DoesNotExist if no task w/ this id in this list)"""
+        with transaction.atomic():
+            version: int = TodosListVersion.bump(list_id=list_id)  # bump first -- same lock order as every other writer
+            updated: list[Todos] = cls.toggle_rows(id_to_update, list_id)
+            if not updated:
+                raise cls.DoesNotExist(f'Todos matching id={id_to_update} in list {list_id} does not exist.')  # rolls back the bump
+            return publish_delta_on_commit(TodosDelta(version=version, updated=updated, list_id=list_id))
+
+    @classmethod
+    def delete_single_todo(cls, id_to_delete: int, list_id: int = DEFAULT_LIST_ID) -> TodosDelta:  # delete a single task
+        """docstring for function - DB transaction (raises Todos.DoesNotExist if no task w/ this id in this list)"""
+        with transaction.atomic():
+            version: int = TodosListVersion.bump(list_id=list_id)  # bump first -- same lock order as every other writer (version row, then task row), so a concurrent toggle / move / batch can't deadlock w/ this delete
+            table: str = connection.ops.quote_name(cls._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {table} WHERE id = %s AND list_id = %s', [id_to_delete, list_id])  # one statement, no read first & no model instance (nothing cascades to a task)
+                if not cursor.rowcount:
+                    raise cls.DoesNotExist(f'Todos matching id={id_to_delete} in list {list_id} does not exist.')  # rolls back the bump
+            return publish_delta_on_commit(TodosDelta(version=version, deleted=[id_to_delete], list_id=list_id))
+
+    @classmethod
+    def delete_completed_rows(cls, limit: int | None = None, list_id: int = DEFAULT_LIST_ID) -> list[int]:  # delete a list's completed tasks as ONE set-based statement
+        """docstring for function - call inside a transaction holding the list version lock; 'DELETE ... RETURNING id' deletes & reports the ids in one round trip, w/o loading model instances (the model has no signal receivers & nothing cascades to it); 'limit' deletes at most that many rows"""
+        table: str = connection.ops.quote_name(cls._meta.db_table)
+        where: str = 'list_id = %s AND status_complete = %s'  # served by the partial index on completed tasks
+        params: list[Any] = [list_id, True]
+        if limit is not None:
+            where = f'id IN (SELECT id FROM {table} WHERE {where} LIMIT %s)'
+            params.append(limit)
+        if connection.vendor == 'postgresql' or (connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)):  # type: ignore
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {table} WHERE {where} RETURNING id', params)
+                return [row[0] for row in cursor.fetchall()]
+        # other backends -- read the ids, then one raw DELETE (still no model instances / collector)
+        queryset: models.QuerySet = cls.in_list(list_id).filter(status_complete=True)
+        deleted_ids: list[int] = list((queryset if limit is None else queryset[:limit]).values_list('id', flat=True))
+        cls.objects.filter(id__in=deleted_ids)._raw_delete(queryset.db)  # pylint: disable=protected-access
+        return deleted_ids
+
+    @classmethod
+    def delete_all_completed(cls, chunk_size: int | None = None, list_id: int = DEFAULT_LIST_ID) -> TodosDelta | None:  # delete every completed task of a list
+        """docstring for function - ONE transaction & ONE statement by default; w/ 'chunk_size', every chunk of at most that many rows is its own short transaction (own version bump & change-feed event), so a huge delete never holds its locks for long -- but is no longer all-or-nothing
+        Returns the combined delta (latest version, every deleted id), or None, w/o bumping the list version, if there was nothing to delete"""
+        if chunk_size is None:
+            chunk_size = 0
+        deleted_ids: list[int] = []
+        version: int | None = None
+        while True:
+            with transaction.atomic():
+                chunk_version: int = TodosListVersion.bump(list_id=list_id)  # bump first -- the version row lock keeps concurrent writers out while the rows go
+                chunk_ids: list[int] = cls.delete_completed_rows(chunk_size or None, list_id)
+                if not chunk_ids:
+                    transaction.set_rollback(True)  # nothing deleted -- undo the bump
+                    break
+                publish_delta_on_commit(TodosDelta(version=chunk_version, deleted=chunk_ids, list_id=list_id))
+            deleted_ids.extend(chunk_ids)
+            version = chunk_version
+            if not chunk_size or len(chunk_ids) < chunk_size:
+                break
+        if version is None:
+            return None
+        return TodosDelta(version=version, deleted=deleted_ids, list_id=list_id)
+
 # ----------
 
 # Note: .env file has connection string for PostgreSQL DB
@@ -0,0 +1,72 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements opt-in keyset (cursor) pagination over one todos list, ordered by (sorted_rank, id)
+Each page is a single index range scan on 'todos_list_rank_idx' ('WHERE list_id = ... AND (sorted_rank, id) > (cursor) ORDER BY sorted_rank, id LIMIT n'), so page cost does not grow w/ how far into the list the client is
+"""
+
+import base64
+import binascii
+import json
+from django.db.models import Q, QuerySet
+from django_app.models import DEFAULT_LIST_ID, TodosListVersion
+
+# ----------
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# ----------
+
+class InvalidCursor(ValueError):
+    """docstring for class - cursor / limit could not be decoded (respond 400)"""
+
+
+class StaleCursor(Exception):
+    """docstring for class - tasks were re-ordered since the cursor was issued, so continuing could skip or repeat rows (respond 409 & restart from the first page)"""
+
+
+# Opaque cursor = urlsafe base64 of the last row's (sorted_rank, id) + the rank version it was read at
+# Deleting the row a cursor points at is fine (the cursor holds values, not a row reference) & new tasks are appended at the end of the list, so only re-orders make a cursor stale
+def encode_cursor(sorted_rank: int, todo_id: int, rank_version: int) -> str:
+    """docstring for helper function"""
+    raw: bytes = json.dumps([sorted_rank, todo_id, rank_version], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[int, int, int]:
+    """docstring for helper function"""
+    try:
+        padded: str = cursor + '=' * (-len(cursor) % 4)
+        sorted_rank, todo_id, rank_version = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(sorted_rank), int(todo_id), int(rank_version)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def parse_limit(raw_limit: str) -> int:
+    """docstring for helper function"""
+    try:
+        limit = int(raw_limit) if raw_limit else DEFAULT_PAGE_SIZE
+    except ValueError as e:
+        raise InvalidCursor('limit must be an integer') from e
+    if limit < 1:
+        raise InvalidCursor('limit must be at least 1')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_page(queryset: QuerySet, limit: int, cursor: str | None, list_id: int = DEFAULT_LIST_ID) -> tuple[list, str | None]:
+    """docstring for helper function - 'queryset' is already scoped to 'list_id'; returns (rows for this page, cursor for the next page or None on the last page)"""
+    rank_version: int = TodosListVersion.current_rank_version(list_id)
+    if cursor:
+        last_rank, last_id, cursor_rank_version = decode_cursor(cursor)
+        if cursor_rank_version != rank_version:
+            raise StaleCursor('Tasks were re-ordered since this cursor was issued, restart from the first page')
+        queryset = queryset.filter(Q(sorted_rank__gt=last_rank) | Q(sorted_rank=last_rank, id__gt=last_id))
+
+    rows: list = list(queryset.order_by('sorted_rank', 'id')[:limit + 1])  # fetch 1 extra row to know if there is a next page
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].sorted_rank, rows[-1].id, rank_version)
@@ -0,0 +1,124 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements the opt-in fast serialization path for todos: reads plain tuples w/ values_list() (no model instances, no DRF field-by-field OrderedDicts) & writes JSON bytes directly
+Rows are emitted in the frontend's camelCase shape ('statusComplete', 'newSortedRank'), so the client no longer needs its own key-mapping pass
+Large lists can also be sent column by column (one array per key, so no key is repeated per row) as JSON or MessagePack, picked via 'Accept' (see views.list_representation)
+"""
+
+import json
+from typing import Any, Iterable
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotAcceptable  # type: ignore
+from rest_framework.negotiation import DefaultContentNegotiation  # type: ignore
+
+try:  # optional dependency -- python3 -m pip install orjson (falls back to the standard library encoder if not installed)
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore[assignment]  # pylint: disable=invalid-name  # orjson ships its own type hints, so mypy sees a module here
+
+try:  # optional dependency -- python3 -m pip install msgpack (w/o it, 'Accept: application/msgpack' gets JSON)
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None  # pylint: disable=invalid-name
+
+# ----------
+
+# Columns needed by the frontend (created_at is not used client-side, so it is not read or sent)
+CAMEL_CASE_COLUMNS = ('id', 'task', 'status_complete', 'sorted_rank')
+COLUMNAR_KEYS = ('id', 'task', 'statusComplete', 'newSortedRank')  # same names as the camelCase rows, in CAMEL_CASE_COLUMNS order
+
+COLUMNAR_CONTENT_TYPE = 'application/vnd.todos.columnar+json'
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+
+# ----------
+
+def dumps(data: Any) -> bytes:
+    """docstring for helper function - JSON encode to bytes w/ the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def camel_case_rows(todos: QuerySet | Iterable[Any]) -> list[dict[str, Any]]:
+    """docstring for helper function - QuerySet (read as tuples via values_list) OR already-loaded Todos instances --> frontend-shaped dicts"""
+    if isinstance(todos, QuerySet):
+        rows: Iterable[tuple] = todos.values_list(*CAMEL_CASE_COLUMNS)
+    else:
+        rows = ((todo.id, todo.task, todo.status_complete, todo.sorted_rank) for todo in todos)
+    return [
+        {'id': todo_id, 'task': task, 'statusComplete': status_complete, 'newSortedRank': sorted_rank}
+        for todo_id, task, status_complete, sorted_rank in rows
+    ]
+
+
+def render_camel_case_list(queryset: QuerySet) -> bytes:
+    """docstring for helper function"""
+    return dumps(camel_case_rows(queryset))
+
+
+async def arender_camel_case_list(queryset: QuerySet) -> bytes:
+    """docstring for helper function - async ORM iteration version of the above"""
+    rows: list[dict[str, Any]] = [
+        {'id': todo_id, 'task': task, 'statusComplete': status_complete, 'newSortedRank': sorted_rank}
+        async for todo_id, task, status_complete, sorted_rank in queryset.values_list(*CAMEL_CASE_COLUMNS)
+    ]
+    return dumps(rows)
+
+
+def columns_from_rows(rows: Iterable[tuple]) -> dict[str, list[Any]]:
+    """docstring for helper function - values_list() tuples --> {'id': [...], 'task': [...], 'statusComplete': [...], 'newSortedRank': [...]}"""
+    columns: list[tuple] = list(zip(*rows)) or [()] * len(COLUMNAR_KEYS)  # transpose in C
+    return {key: list(column) for key, column in zip(COLUMNAR_KEYS, columns)}
+
+
+def render_columnar_list(queryset: QuerySet) -> bytes:
+    """docstring for helper function"""
+    return dumps(columns_from_rows(queryset.values_list(*CAMEL_CASE_COLUMNS)))
+
+
+def render_msgpack_list(queryset: QuerySet) -> bytes:
+    """docstring for helper function - same columns as render_columnar_list(), MessagePack-encoded (raises RuntimeError if msgpack is not installed)"""
+    if msgpack is None:
+        raise RuntimeError('msgpack is not installed')
+    return msgpack.packb(columns_from_rows(queryset.values_list(*CAMEL_CASE_COLUMNS)))
+
+
+async def arender_columnar_list(queryset: QuerySet) -> bytes:
+    """docstring for helper function - async ORM iteration version of render_columnar_list()"""
+    return dumps(columns_from_rows([row async for row in queryset.values_list(*CAMEL_CASE_COLUMNS)]))
+
+
+async def arender_msgpack_list(queryset: QuerySet) -> bytes:
+    """docstring for helper function - async ORM iteration version of render_msgpack_list()"""
+    if msgpack is None:
+        raise RuntimeError('msgpack is not installed')
+    return msgpack.packb(columns_from_rows([row async for row in queryset.values_list(*CAMEL_CASE_COLUMNS)]))
+
+
+def accepted_media_types(accept: str) -> list[str]:
+    """docstring for helper function - 'Accept' header --> media types in the client's order of preference (highest q first, header order breaks ties; q=0 dropped)"""
+    ranked: list[tuple[float, int, str]] = []
+    for position, part in enumerate(accept.lower().split(',')):
+        media_type, *params = (piece.strip() for piece in part.split(';'))
+        quality: float = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            ranked.append((-quality, position, media_type))
+    return [media_type for _, _, media_type in sorted(ranked)]
+
+
+class LenientContentNegotiation(DefaultContentNegotiation):
+    """docstring for class - DRF's negotiation, but an 'Accept' header no renderer matches (e.g. 'application/msgpack' on an endpoint that only speaks JSON) gets the default renderer instead of a 406"""
+    def select_renderer(self, request: Any, renderers: list[Any], format_suffix: str | None = None) -> tuple[Any, str]:
+        """docstring for function"""
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            return renderers[0], renderers[0].media_type
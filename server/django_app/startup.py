@@ -0,0 +1,114 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module measures worker cold start in a FRESH interpreter: settings + django.setup() (apps, models), the URLconf (imports every view module) & the first request through the WSGI handler
+The child runs under 'python -X importtime'; its per-module report is summed by top-level package, so it is clear which imports the time goes to
+Used by 'python3 server/manage.py startup_profile' & the startup budget test (STARTUP_BUDGET_SECONDS -- the test only runs when it is set in the environment)
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+from django.conf import settings
+
+# ----------
+
+STARTUP_BUDGET_SECONDS = float(os.getenv('STARTUP_BUDGET_SECONDS', '2.0'))  # production worker: setup + URLconf + first request
+PROBE_PATH = '/api/cacheStats'  # served w/o a DB query, so the probe needs no database
+RESULT_MARKER = 'STARTUP_PROFILE '
+
+# Runs in the child interpreter -- everything it imports counts towards the profile, so keep it to the standard library until the timed steps
+PROBE_SCRIPT = f'''
+import io, json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+setup_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urlconf_done = time.perf_counter()
+statuses = []
+environ = {{
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': {PROBE_PATH!r}, 'SCRIPT_NAME': '', 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost', 'REMOTE_ADDR': '198.51.100.1',
+    'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+}}
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+request_done = time.perf_counter()
+print({RESULT_MARKER!r} + json.dumps({{
+    'setup': setup_done - start, 'urlconf': urlconf_done - setup_done, 'firstRequest': request_done - urlconf_done, 'status': statuses[0] if statuses else None,
+}}))
+'''
+
+# ----------
+
+def parse_importtime(report: str) -> list[tuple[str, int, int, int]]:
+    """docstring for helper function - 'import time: self [us] | cumulative | imported package' lines --> (module, nesting level, self us, cumulative us)"""
+    entries: list[tuple[str, int, int, int]] = []
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name: str = fields[2].rstrip()
+        level: int = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), level, int(fields[0]), int(fields[1])))
+    return entries
+
+
+def summarize_imports(entries: list[tuple[str, int, int, int]], top: int) -> dict[str, Any]:
+    """docstring for helper function - self time summed per top-level package + the slowest top-level imports (their cumulative times add up to the total)"""
+    packages: dict[str, list[int]] = {}
+    for name, _, self_us, _ in entries:
+        package = packages.setdefault(name.split('.')[0], [0, 0])
+        package[0] += self_us
+        package[1] += 1
+    by_package = sorted(packages.items(), key=lambda item: item[1][0], reverse=True)
+    top_level = sorted((entry for entry in entries if entry[1] == 0), key=lambda entry: entry[3], reverse=True)
+    return {
+        'importSeconds': round(sum(entry[2] for entry in entries) / 1e6, 4),
+        'modules': len(entries),
+        'packages': [{'package': name, 'ms': round(self_us / 1000, 1), 'modules': count} for name, (self_us, count) in by_package[:top]],
+        'slowestImports': [{'module': name, 'cumulativeMs': round(cumulative_us / 1000, 1), 'selfMs': round(self_us / 1000, 1)} for name, _, self_us, cumulative_us in top_level[:top]],
+        'loadedPackages': sorted(packages),
+    }
+
+
+def profile_startup(env: dict[str, str] | None = None, top: int = 15) -> dict[str, Any]:
+    """docstring for helper function - one cold start in a child process (same settings module as this process, plus 'env' overrides)"""
+    child_env: dict[str, str] = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'django_server.settings'), **(env or {})}
+    start: float = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE_SCRIPT], cwd=settings.BASE_DIR, env=child_env, capture_output=True, text=True, timeout=120, check=False)
+    process_seconds: float = time.perf_counter() - start
+    result_lines: list[str] = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+    if completed.returncode != 0 or not result_lines:
+        errors: str = '\n'.join(line for line in completed.stderr.splitlines() if not line.startswith('import time:'))
+        raise RuntimeError(f'startup probe failed (exit code {completed.returncode}):\n{errors[-4000:]}')
+
+    phases: dict[str, Any] = json.loads(result_lines[-1][len(RESULT_MARKER):])
+    return {
+        'seconds': {
+            'setup': round(phases['setup'], 4),
+            'urlconf': round(phases['urlconf'], 4),
+            'firstRequest': round(phases['firstRequest'], 4),
+            'total': round(phases['setup'] + phases['urlconf'] + phases['firstRequest'], 4),
+            'process': round(process_seconds, 4),  # + interpreter start & exit
+        },
+        'firstRequestStatus': phases['status'],
+        'output': '\n'.join(line for line in completed.stdout.splitlines() if not line.startswith(RESULT_MARKER)),  # anything printed at import time (should be empty)
+        **summarize_imports(parse_importtime(completed.stderr), top),
+    }
+
+
+def profile_startup_runs(runs: int, env: dict[str, str] | None = None, top: int = 15) -> dict[str, Any]:
+    """docstring for helper function - the run w/ the median total (the first run may also pay for writing .pyc files), plus every run's total"""
+    results: list[dict[str, Any]] = [profile_startup(env, top) for _ in range(runs)]
+    totals: list[float] = [result['seconds']['total'] for result in results]
+    median_result: dict[str, Any] = min(results, key=lambda result: abs(result['seconds']['total'] - statistics.median(totals)))
+    return {**median_result, 'runs': totals}
@@ -0,0 +1,244 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements production static file serving for the Vite build (see 'serve_production_file' in views.py)
+At 'collectstatic' time, CompressedStaticFilesStorage writes gzip (& brotli, if installed) variants next to each compressible file, so nothing is compressed per request
+At request time the variant is picked from 'Accept-Encoding', looked up in an in-memory stat cache & sent as a FileResponse -- WSGI servers w/ 'wsgi.file_wrapper' (e.g. gunicorn) send it w/ sendfile(), no Python-side reads
+Vite's content-hashed files (e.g. 'index-DLm4jeKW.js') never change content, so they are cached by browsers for a year as 'immutable'; anything else is revalidated w/ its ETag
+Which files are hashed comes from Vite's build manifest (written to dist/assets/manifest.json, see vite.config.ts, & collected into STATIC_ROOT w/ the files) -- a name pattern can't tell 'app-frontend.js' from a real hash; w/o a manifest nothing is immutable
+"""
+
+import gzip
+import json
+import mimetypes
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+
+try:  # optional dependency -- python3 -m pip install brotli (only gzip variants are built if not installed)
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None  # pylint: disable=invalid-name
+
+# ----------
+
+COMPRESSIBLE_EXTENSIONS = frozenset(('.js', '.mjs', '.css', '.html', '.svg', '.json', '.map', '.txt', '.xml', '.ico', '.wasm'))  # images / fonts are already compressed
+MIN_COMPRESS_SIZE = 256  # bytes -- smaller files don't gain enough to be worth a variant
+MAX_COMPRESSED_RATIO = 0.95  # only keep a variant that is at least 5% smaller than the original
+ENCODINGS: tuple[tuple[str, str], ...] = (('br', '.br'), ('gzip', '.gz'))  # (Content-Encoding, file suffix) in server preference order
+
+BUILD_MANIFEST_NAME = 'manifest.json'  # Vite build manifest, relative to the static root
+VITE_ASSETS_DIR = 'assets'  # manifest paths are relative to dist/ -- the static root holds the contents of dist/assets
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+STAT_CACHE_SECONDS = 60.0  # how long a non-hashed file's stat result is trusted (hashed files are trusted until restart)
+STAT_CACHE_MAX_ENTRIES = 4096
+
+# ----------
+
+def is_compressible(name: str) -> bool:
+    """docstring for helper function"""
+    return os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def compress_file(path: str) -> list[str]:
+    """docstring for helper function - (re)write the .gz / .br variants of one file unless they are already newer than it; returns the encodings that have a variant"""
+    source_mtime: float = os.stat(path).st_mtime
+    data: bytes | None = None
+    encodings: list[str] = []
+    for encoding, suffix in ENCODINGS:
+        if encoding == 'br' and brotli is None:
+            continue
+        variant_path: str = path + suffix
+        if os.path.exists(variant_path) and os.stat(variant_path).st_mtime >= source_mtime:
+            encodings.append(encoding)
+            continue
+        if data is None:
+            with open(path, 'rb') as file:
+                data = file.read()
+        compressed: bytes = b''
+        if len(data) >= MIN_COMPRESS_SIZE:
+            compressed = brotli.compress(data, quality=11) if encoding == 'br' else gzip.compress(data, compresslevel=9, mtime=0)  # mtime=0 -- identical input gives an identical (cacheable) file
+        if not compressed or len(compressed) > len(data) * MAX_COMPRESSED_RATIO:
+            if os.path.exists(variant_path):
+                os.remove(variant_path)  # stale variant of an earlier build
+            continue
+        with open(variant_path, 'wb') as file:
+            file.write(compressed)
+        encodings.append(encoding)
+    return encodings
+
+
+class CompressedStaticFilesStorage(StaticFilesStorage):
+    """docstring for class - STORAGES['staticfiles'] backend: collectstatic copies files as usual, then post_process() builds the precompressed variants"""
+    def post_process(self, paths: dict[str, Any], dry_run: bool = False, **options: Any) -> Iterator[tuple[str, str, bool]]:
+        """docstring for function - called by collectstatic w/ every collected file"""
+        if dry_run:
+            return
+        for name in paths:
+            if is_compressible(name):
+                yield name, name, bool(compress_file(self.path(name)))
+
+# ----------
+
+_manifests: dict[str, tuple[int, frozenset[str]]] = {}  # static root --> (manifest mtime_ns, hashed names)
+
+
+def hashed_names(root: str) -> frozenset[str]:
+    """docstring for helper function - names (relative to 'root') of the content-hashed files the build manifest lists: every chunk's 'file', 'css' & 'assets'; re-read only when the manifest changes"""
+    path: str = os.path.join(root, BUILD_MANIFEST_NAME)
+    try:
+        mtime_ns: int = os.stat(path).st_mtime_ns
+    except OSError:
+        return frozenset()
+    cached = _manifests.get(root)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with open(path, 'rb') as file:
+            manifest: Any = json.load(file)
+    except (OSError, ValueError):
+        return frozenset()
+    names: set[str] = set()
+    for chunk in manifest.values() if isinstance(manifest, dict) else ():
+        if not isinstance(chunk, dict):
+            continue
+        for file_name in [chunk.get('file'), *chunk.get('css', []), *chunk.get('assets', [])]:
+            if isinstance(file_name, str) and file_name.startswith(f'{VITE_ASSETS_DIR}/'):
+                names.add(file_name.removeprefix(f'{VITE_ASSETS_DIR}/'))
+    _manifests[root] = (mtime_ns, frozenset(names))
+    return _manifests[root][1]
+
+# ----------
+
+@dataclass(frozen=True)
+class StaticAsset:
+    """docstring for class - everything needed to answer a request for one file, w/o touching the filesystem again"""
+    path: str
+    content_type: str
+    last_modified: str
+    cache_control: str
+    representations: dict[str, tuple[str, str]] = field(default_factory=dict)  # Content-Encoding ('identity', 'br', 'gzip') --> (file path, ETag)
+    checked_at: float = 0.0
+
+
+def stat_asset(root: str, name: str) -> StaticAsset | None:
+    """docstring for helper function - None if 'name' is not a file under 'root' (or tries to escape it)"""
+    try:
+        path: str = safe_join(root, name)
+        stat = os.stat(path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        return None
+    if not os.path.isfile(path):
+        return None
+    representations: dict[str, tuple[str, str]] = {'identity': (path, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"')}
+    for encoding, suffix in ENCODINGS:
+        try:
+            variant = os.stat(path + suffix)
+        except OSError:
+            continue
+        if variant.st_mtime >= stat.st_mtime:  # ignore a variant left over from an older version of the file
+            representations[encoding] = (path + suffix, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding}"')
+    content_type, _ = mimetypes.guess_type(path)
+    return StaticAsset(
+        path=path,
+        content_type=content_type or 'application/octet-stream',
+        last_modified=http_date(stat.st_mtime),
+        cache_control=IMMUTABLE_CACHE_CONTROL if name in hashed_names(root) else REVALIDATE_CACHE_CONTROL,
+        representations=representations,
+        checked_at=time.monotonic(),
+    )
+
+
+class StatCache:
+    """docstring for class - (root, name) --> StaticAsset, so a request costs no stat() calls (only found files are cached, so unknown names can't grow it)"""
+    def __init__(self, max_entries: int = STAT_CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], StaticAsset] = {}
+        self.max_entries = max_entries
+
+    def get(self, root: str, name: str) -> StaticAsset | None:
+        """docstring for function"""
+        key = (root, name)
+        asset = self._entries.get(key)
+        if asset is not None and (asset.cache_control == IMMUTABLE_CACHE_CONTROL or time.monotonic() - asset.checked_at < STAT_CACHE_SECONDS):
+            return asset
+        asset = stat_asset(root, name)
+        with self._lock:
+            if asset is None:
+                self._entries.pop(key, None)
+            else:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+                self._entries[key] = asset
+        return asset
+
+    def discard(self, root: str, name: str) -> None:
+        """docstring for function"""
+        with self._lock:
+            self._entries.pop((root, name), None)
+
+    def clear(self) -> None:
+        """docstring for function"""
+        with self._lock:
+            self._entries.clear()
+
+
+stat_cache = StatCache()
+
+# ----------
+
+def negotiate_encoding(accept_encoding: str, available: Any) -> str:
+    """docstring for helper function - best available Content-Encoding the client accepts ('identity' if none); honours 'q=0' & '*'"""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        quality: float = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding] = quality
+    for encoding, _ in ENCODINGS:
+        if encoding in available and accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return 'identity'
+
+
+def serve_static_asset(request: HttpRequest, root: str, name: str) -> HttpResponse:
+    """docstring for helper function - GET / HEAD one file under 'root' (conditional on If-None-Match)"""
+    asset = stat_cache.get(root, name)
+    if asset is None:
+        raise Http404(f'"{name}" does not exist')
+    encoding: str = negotiate_encoding(request.headers.get('Accept-Encoding', ''), asset.representations)
+    path, etag = asset.representations[encoding]
+
+    response: HttpResponse
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            file = open(path, 'rb')  # pylint: disable=consider-using-with  # closed by FileResponse
+        except OSError as e:  # removed since it was cached (e.g. a new build) -- forget it
+            stat_cache.discard(root, name)
+            raise Http404(f'"{name}" does not exist') from e
+        response = FileResponse(file, content_type=asset.content_type, filename=os.path.basename(name))  # explicit type & name -- not guessed from the .gz / .br variant
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+        response['Last-Modified'] = asset.last_modified
+    response['ETag'] = etag
+    response['Cache-Control'] = asset.cache_control
+    if len(asset.representations) > 1:
+        response['Vary'] = 'Accept-Encoding'
+    return response
@@ -5,8 +5,42 @@ docstring for module
 This module includes tests for the Django app
 """
 
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock, skipIf, skipUnless
+from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection, connections, transaction
 from django.test import TestCase  # Django's TestCase class is a subclass of 'unittest.TestCase' that runs each test inside a transaction to provide isolation between tests
-from django_app.views import map_todo_keys_for_backend
+from django.http import Http404
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test import modify_settings, override_settings
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.test import AsyncClient
+from rest_framework.test import APIClient  # type: ignore
+from django_app import cache as todos_cache
+from django_app.db_pool import is_pool_exhausted
+from django_app.db_router import PIN_COOKIE_NAME, PrimaryReplicaRouter, pinned_until
+from django_app.events import EventBroker, EventBrokers, brokers
+from django_app.loadgen import percentile
+from django_app import metrics
+from django_app.middleware import PoolExhaustedMiddleware
+from django_app.management.commands.seed_todos import task_length_sampler
+from django_app.index_shell import IndexShell, index_shell
+from django_app.renderers import COLUMNAR_CONTENT_TYPE, MSGPACK_CONTENT_TYPE, msgpack
+from django_app.models import DEFAULT_LIST_ID, RANK_GAP, Todos, TodosListVersion
+from django_app.startup import STARTUP_BUDGET_SECONDS, parse_importtime, profile_startup
+from django_app.static_assets import IMMUTABLE_CACHE_CONTROL, CompressedStaticFilesStorage, negotiate_encoding, stat_cache
+from django_app.views import map_todo_keys_for_backend, serve_production_file
 
 # Create your tests here.
 
@@ -47,3 +81,1167 @@ class TestMapTodoKeysForBackend(TestCase):
             'status_complete': False  # <-- expected value is True
         }
         self.assertNotEqual(map_todo_keys_for_backend(todo_input), expected_backend_todo)
+
+class TestDeltaResponses(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+
+    def test_full_list_is_default_response(self):
+        """docstring for test function"""
+        todo = Todos.objects.get(task='Sample Task 3')
+        response = self.client.patch(f'/api/updateTodoStatus/{todo.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 6)
+
+    def test_delta_response_returns_only_changed_rows(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        todo = Todos.objects.get(task='Sample Task 3')
+        response = self.client.patch(f'/api/updateTodoStatus/{todo.id}', HTTP_X_RESPONSE_MODE='delta')
+        body = response.json()
+        self.assertEqual(body['version'], version_before + 1)
+        self.assertEqual([row['id'] for row in body['updated']], [todo.id])
+        self.assertTrue(body['updated'][0]['status_complete'])
+        self.assertEqual(body['created'], [])
+
+        response = self.client.post('/api/addNewTask?response=delta', {'newTaskToAdd': {'id': -1, 'task': 'New task', 'statusComplete': False}}, format='json')
+        body = response.json()
+        self.assertEqual(body['version'], version_before + 2)
+        self.assertEqual(body['created'][0]['task'], 'New task')
+
+        completed_ids = sorted(Todos.objects.filter(status_complete=True).values_list('id', flat=True))
+        response = self.client.delete('/api/deleteAllCompletedTodos', HTTP_X_RESPONSE_MODE='delta')
+        self.assertEqual(sorted(response.json()['deleted']), completed_ids)
+
+    def test_delete_bumps_version_before_touching_the_task(self):
+        """docstring for test function"""
+        todo = Todos.objects.get(task='Sample Task 3')
+        with CaptureQueriesContext(connection) as queries:
+            delta = Todos.delete_single_todo(todo.id)
+        statements = [query['sql'] for query in queries.captured_queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertIn('todos_list_version', statements[0])  # version row locked first -- same lock order as every other writer
+        self.assertEqual([sql for sql in statements if 'todos_list_version' not in sql], [statements[-1]])  # then a single DELETE, no read of the task
+        self.assertTrue(statements[-1].startswith('DELETE'))
+        self.assertEqual(delta.deleted, [todo.id])
+        self.assertFalse(Todos.objects.filter(id=todo.id).exists())
+
+    def test_delete_missing_task_is_404_and_keeps_version(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        self.assertEqual(self.client.delete('/api/deleteTodo/999999').status_code, 404)
+        self.assertEqual(TodosListVersion.current(), version_before)  # the bump is rolled back w/ the empty DELETE
+
+
+class TestMoveTodo(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+        self.ids = list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True))  # Sample Task 1 ... 6
+
+    def test_move_writes_only_the_moved_row(self):
+        """docstring for test function"""
+        ranks_before = dict(Todos.objects.values_list('id', 'sorted_rank'))
+        response = self.client.patch(f'/api/moveTodo/{self.ids[5]}', {'beforeId': self.ids[0], 'afterId': self.ids[1]}, format='json', HTTP_X_RESPONSE_MODE='delta')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['updated']], [self.ids[5]])
+
+        ranks_after = dict(Todos.objects.values_list('id', 'sorted_rank'))
+        self.assertEqual([todo_id for todo_id in ranks_before if ranks_before[todo_id] != ranks_after[todo_id]], [self.ids[5]])
+        self.assertEqual(list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True)), [self.ids[0], self.ids[5], *self.ids[1:5]])
+
+    def test_move_renormalises_when_gap_runs_out(self):
+        """docstring for test function"""
+        Todos.objects.filter(id=self.ids[0]).update(sorted_rank=10)
+        Todos.objects.filter(id=self.ids[1]).update(sorted_rank=11)
+        delta = Todos.move_todo(self.ids[3], self.ids[0], self.ids[1])
+        self.assertEqual(len(delta.updated), 6)  # whole list re-spaced
+        self.assertEqual(list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True)), [self.ids[0], self.ids[3], self.ids[1], self.ids[2], self.ids[4], self.ids[5]])
+
+    def test_misordered_neighbours_rejected_before_any_write(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        for before_id, after_id in ((self.ids[2], self.ids[1]), (self.ids[1], self.ids[1])):  # below instead of above / same task on both sides
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.patch(f'/api/moveTodo/{self.ids[5]}', {'beforeId': before_id, 'afterId': after_id}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "todos"')])  # no renormalisation of the list
+        self.assertEqual(TodosListVersion.current(), version_before)
+
+    def test_move_unknown_id_returns_404(self):
+        """docstring for test function"""
+        response = self.client.patch('/api/moveTodo/999999', {'beforeId': None, 'afterId': self.ids[0]}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_move_non_integer_neighbour_returns_400(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        for payload in ({'beforeId': 'x', 'afterId': self.ids[0]}, {'beforeId': None, 'afterId': 1.5}, {'beforeId': True}):
+            for path in (f'/api/moveTodo/{self.ids[5]}', f'/api/async/moveTodo/{self.ids[5]}'):
+                response = self.client.patch(path, payload, format='json')
+                self.assertEqual(response.status_code, 400, (path, payload))
+                self.assertIn('Must be an integer or null.', str(response.json()))
+        self.assertEqual(TodosListVersion.current(), version_before)  # rejected before the transaction
+
+class TestUpdateSortedRank(TestCase):
+    """docstring for class"""
+    def seed_rows(self, count: int) -> list[int]:
+        """docstring for helper function"""
+        Todos.objects.all().delete()
+        Todos.objects.bulk_create([Todos(sorted_rank=i, task=f'Task {i}') for i in range(count)])
+        return list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True))
+
+    def test_reorder_writes_only_changed_rows_and_resolves_temp_ids(self):
+        """docstring for test function"""
+        ids = self.seed_rows(3)
+        Todos.add_new_task({'task': 'Added offline', 'status_complete': False}, client_temp_id=-42)
+        payload = [
+            {'id': ids[0], 'task': 'Task 0', 'statusComplete': False, 'newSortedRank': 0},  # unchanged
+            {'id': -42, 'task': 'Added offline', 'statusComplete': False, 'newSortedRank': 1},
+            {'id': ids[1], 'task': 'Task 1', 'statusComplete': False, 'newSortedRank': 2},
+            {'id': ids[2], 'task': 'Task 2', 'statusComplete': False, 'newSortedRank': 3},
+        ]
+        delta = Todos.update_sorted_rank(payload)
+        self.assertEqual(len(delta.updated), 3)
+        self.assertEqual(list(Todos.objects.order_by('sorted_rank').values_list('task', flat=True)), ['Task 0', 'Added offline', 'Task 1', 'Task 2'])
+
+    def test_query_count_is_constant_as_list_grows(self):
+        """docstring for test function - query-count benchmark for the full-array DnD payload (10 --> 10k rows)"""
+        query_counts: dict[int, int] = {}
+        for size in (10, 100, 1000, 10000):
+            ids = self.seed_rows(size)
+            payload = [{'id': todo_id, 'task': '', 'statusComplete': False, 'newSortedRank': size - position} for position, todo_id in enumerate(ids)]  # reverse the list
+            with CaptureQueriesContext(connection) as queries:
+                Todos.update_sorted_rank(payload)
+            query_counts[size] = len(queries)
+            self.assertEqual(list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True)), ids[::-1])
+        self.assertEqual(len(set(query_counts.values())), 1, query_counts)
+
+    def test_malformed_payload_is_400(self):
+        """docstring for test function"""
+        ids = self.seed_rows(2)
+        client = APIClient()
+        version_before = TodosListVersion.current()
+        for body in ({}, {'toDosArrayFull': [{'id': 'x', 'newSortedRank': 1}]}, {'toDosArrayFull': [{'id': ids[0], 'newSortedRank': None}]}, {'toDosArrayFull': [ids[0]]}):
+            for path in ('/api/updateSortingOrderPostDnD', '/api/async/updateSortingOrderPostDnD'):
+                response = client.patch(path, body, format='json')
+                self.assertEqual(response.status_code, 400, (path, body))
+                self.assertIn('toDosArrayFull', response.json())
+        self.assertEqual(TodosListVersion.current(), version_before)
+
+    def test_rank_is_converted_before_comparing(self):
+        """docstring for test function"""
+        ids = self.seed_rows(2)
+        delta = Todos.update_sorted_rank([{'id': ids[0], 'newSortedRank': '0'}, {'id': str(ids[1]), 'newSortedRank': '5'}])
+        self.assertEqual([todo.id for todo in delta.updated], [ids[1]])  # '0' equals the stored 0 -- not rewritten
+
+class TestKeysetPagination(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+        self.ids = list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True))
+
+    def test_pages_walk_whole_list_despite_deletes(self):
+        """docstring for test function"""
+        first_page = self.client.get('/api/allTodos?limit=4').json()
+        self.assertEqual([row['id'] for row in first_page['results']], self.ids[:4])
+
+        Todos.delete_single_todo(self.ids[3])  # delete the row the cursor points at
+        second_page = self.client.get(f"/api/allTodos?limit=4&cursor={first_page['next']}").json()
+        self.assertEqual([row['id'] for row in second_page['results']], self.ids[4:])
+        self.assertIsNone(second_page['next'])
+
+    def test_reorder_invalidates_cursor(self):
+        """docstring for test function"""
+        first_page = self.client.get('/api/allTodos?limit=2').json()
+        Todos.move_todo(self.ids[5], None, self.ids[0])
+        response = self.client.get(f"/api/allTodos?limit=2&cursor={first_page['next']}")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get('/api/allTodos?limit=2&cursor=not-a-cursor').status_code, 400)
+
+class TestConditionalGet(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+
+    def test_unchanged_list_returns_304_without_reading_todos(self):
+        """docstring for test function"""
+        response = self.client.get('/api/allTodos')
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{TodosListVersion.current()}"')
+
+        with self.assertNumQueries(1):  # version lookup only
+            response = self.client.get('/api/allTodos', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Todos.toggle_status_complete(Todos.objects.first().id)
+        response = self.client.get('/api/allTodos', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+class TestStatusFilter(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()  # 5 active, 1 completed
+        self.client = APIClient()
+
+    def test_status_filter_returns_matching_rows_and_counts(self):
+        """docstring for test function"""
+        body = self.client.get('/api/allTodos?status=completed').json()
+        self.assertEqual([row['task'] for row in body['results']], ['Sample Task 5'])
+        self.assertEqual(body['counts'], {'active': 5, 'completed': 1})
+
+        body = self.client.get('/api/allTodos?status=active&limit=3').json()
+        self.assertEqual(len(body['results']), 3)
+        self.assertFalse(any(row['status_complete'] for row in body['results']))
+        self.assertIsNotNone(body['next'])
+
+    def test_unknown_status_returns_400(self):
+        """docstring for test function"""
+        self.assertEqual(self.client.get('/api/allTodos?status=everything').status_code, 400)
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}, 'todos': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'todos-tests'}})
+class TestTodosListCache(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        caches['todos'].clear()
+        todos_cache.reset_stats()
+        Todos.seed_db()
+        self.client = APIClient()
+
+    def test_repeat_reads_are_served_from_cache(self):
+        """docstring for test function"""
+        first = self.client.get('/api/allTodos')
+        with self.assertNumQueries(1):  # version lookup only -- no todos query, no serializer
+            second = self.client.get('/api/allTodos')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual((todos_cache.stats()['hits'], todos_cache.stats()['misses']), (1, 1))
+
+    def test_write_invalidates_and_writes_through(self):
+        """docstring for test function"""
+        self.client.get('/api/allTodos')
+        todo = Todos.objects.get(task='Sample Task 1')
+        written = self.client.patch(f'/api/updateTodoStatus/{todo.id}')  # full-list response for the new version is stored ...
+        with self.assertNumQueries(1):  # ... so the next read is a hit
+            read = self.client.get('/api/allTodos')
+        self.assertEqual(written.content, read.content)
+        self.assertTrue(next(row for row in read.json() if row['id'] == todo.id)['status_complete'])
+
+class TestCamelCaseRenderer(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+
+    def test_camel_case_matches_drf_output(self):
+        """docstring for test function"""
+        drf_rows = self.client.get('/api/allTodos').json()
+        fast_rows = self.client.get('/api/allTodos', HTTP_X_RESPONSE_SHAPE='camel').json()
+        self.assertEqual(fast_rows, [
+            {'id': row['id'], 'task': row['task'], 'statusComplete': row['status_complete'], 'newSortedRank': row['sorted_rank']}
+            for row in drf_rows
+        ])
+
+    def test_camel_case_delta(self):
+        """docstring for test function"""
+        todo = Todos.objects.get(task='Sample Task 2')
+        body = self.client.patch(f'/api/updateTodoStatus/{todo.id}?response=delta&shape=camel').json()
+        self.assertEqual(body['updated'], [{'id': todo.id, 'task': 'Sample Task 2', 'statusComplete': True, 'newSortedRank': todo.sorted_rank}])
+
+class TestBatch(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+        self.ids = list(Todos.objects.order_by('sorted_rank').values_list('id', flat=True))  # Sample Task 1 ... 6 (only Sample Task 5 is complete)
+
+    def test_mixed_batch_in_one_transaction(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        operations = [
+            {'op': 'add', 'task': 'Offline 1', 'tempId': -1},
+            {'op': 'add', 'task': 'Offline 2', 'tempId': -2},
+            {'op': 'toggle', 'id': -1},  # refers to the task added above
+            {'op': 'toggle', 'id': self.ids[1]},
+            {'op': 'delete', 'id': self.ids[2]},
+            {'op': 'move', 'id': -2, 'beforeId': None, 'afterId': self.ids[0]},
+        ]
+        with self.assertNumQueries(13):  # independent of how many adds / toggles / deletes are in each run
+            response = self.client.post('/api/batch?response=delta', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['version'], version_before + 1)  # one bump for the whole batch
+        self.assertEqual([result['op'] for result in body['results']], [operation['op'] for operation in operations])
+        new_id_1, new_id_2 = body['results'][0]['id'], body['results'][1]['id']
+        self.assertEqual([row['id'] for row in body['created']], [new_id_1, new_id_2])
+        self.assertTrue(body['created'][0]['status_complete'])
+        self.assertEqual([row['id'] for row in body['updated']], [self.ids[1]])
+        self.assertEqual(body['deleted'], [self.ids[2]])
+        self.assertEqual(Todos.objects.order_by('sorted_rank', 'id').values_list('id', flat=True)[0], new_id_2)
+
+    def test_failed_operation_rolls_back_whole_batch(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        response = self.client.post('/api/batch', {'operations': [{'op': 'add', 'task': 'Never saved'}, {'op': 'delete', 'id': 999999}]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['index'], 1)
+        self.assertEqual(TodosListVersion.current(), version_before)
+        self.assertFalse(Todos.objects.filter(task='Never saved').exists())
+
+    def test_malformed_move_and_reorder_are_400(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        for operation in (
+            {'op': 'move', 'id': self.ids[0], 'beforeId': 'x'},
+            {'op': 'move', 'id': self.ids[0], 'afterId': 1.5},
+            {'op': 'reorder', 'toDosArrayFull': [{}]},
+            {'op': 'reorder', 'toDosArrayFull': [{'id': self.ids[0], 'newSortedRank': '5'}]},
+            {'op': 'reorder', 'toDosArrayFull': [self.ids[0]]},
+        ):
+            response = self.client.post('/api/batch', {'operations': [{'op': 'toggle', 'id': self.ids[1]}, operation]}, format='json')
+            self.assertEqual(response.status_code, 400, operation)
+            self.assertEqual(response.json()['index'], 1)
+        self.assertEqual(TodosListVersion.current(), version_before)
+
+    def test_deleting_same_task_twice_is_400(self):
+        """docstring for test function"""
+        operations = [{'op': 'add', 'task': 'Offline', 'tempId': -7}, {'op': 'delete', 'id': self.ids[0]}, {'op': 'delete', 'id': -7}, {'op': 'delete', 'id': self.ids[0]}]
+        response = self.client.post('/api/batch', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['index'], 3)
+        self.assertTrue(Todos.objects.filter(id=self.ids[0]).exists())  # whole batch rolled back
+        self.assertFalse(Todos.objects.filter(task='Offline').exists())
+
+    def test_full_list_response(self):
+        """docstring for test function"""
+        body = self.client.post('/api/batch', {'operations': [{'op': 'deleteCompleted'}]}, format='json', HTTP_X_RESPONSE_SHAPE='camel').json()
+        self.assertEqual(body['results'][0]['deleted'], [self.ids[4]])
+        self.assertEqual(body['todos'], self.client.get('/api/allTodos', HTTP_X_RESPONSE_SHAPE='camel').json())
+
+class TestAddNewTaskRankAllocation(TestCase):
+    """docstring for class"""
+    def test_insert_is_one_round_trip(self):
+        """docstring for test function"""
+        Todos.seed_db()
+        with CaptureQueriesContext(connection) as queries:
+            delta = Todos.add_new_task({'task': 'Appended', 'status_complete': False})
+        self.assertEqual(len([query for query in queries if 'INSERT' in query['sql']]), 1)
+        self.assertFalse([query for query in queries if query['sql'].startswith('SELECT MAX')])  # no separate aggregate round trip
+        created = delta.created[0]
+        self.assertEqual(created.sorted_rank, 7 * RANK_GAP)
+        self.assertEqual(Todos.objects.get(id=created.id).created_at, created.created_at)
+
+    @skipIf(connection.vendor != 'sqlite', 'SQLite-only fallback')
+    def test_insert_without_returning_support(self):
+        """docstring for test function - SQLite < 3.35 has no RETURNING"""
+        Todos.seed_db()
+        with mock.patch.object(connection.Database, 'sqlite_version_info', (3, 31, 1)), CaptureQueriesContext(connection) as queries:
+            delta = Todos.add_new_task({'task': 'Appended', 'status_complete': False}, list_id=DEFAULT_LIST_ID)
+        self.assertFalse([query for query in queries if 'RETURNING' in query['sql']])
+        created = delta.created[0]
+        self.assertEqual((created.sorted_rank, created.task), (7 * RANK_GAP, 'Appended'))
+        self.assertEqual(Todos.objects.get(id=created.id).sorted_rank, created.sorted_rank)
+
+class TestAddNewTaskConcurrency(TransactionTestCase):
+    """docstring for class - real transactions (not wrapped in a test transaction) so parallel writers actually contend"""
+    WORKERS = 8
+    INSERTS_PER_WORKER = 10
+
+    def insert_many(self, worker: int) -> None:
+        """docstring for helper function - runs in its own thread, i.e. on its own DB connection"""
+        try:
+            for i in range(self.INSERTS_PER_WORKER):
+                while True:
+                    try:
+                        Todos.add_new_task({'task': f'Worker {worker} task {i}', 'status_complete': False})
+                        break
+                    except OperationalError:  # SQLite only: another writer holds the database lock (PostgreSQL waits on the version row lock instead)
+                        continue
+        finally:
+            connections.close_all()
+
+    def test_parallel_inserts_get_unique_ranks(self):
+        """docstring for test function"""
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            list(executor.map(self.insert_many, range(self.WORKERS)))
+        ranks = list(Todos.objects.values_list('sorted_rank', flat=True))
+        self.assertEqual(len(ranks), self.WORKERS * self.INSERTS_PER_WORKER)
+        self.assertEqual(len(set(ranks)), len(ranks))
+        self.assertEqual(sorted(ranks), [i * RANK_GAP for i in range(1, len(ranks) + 1)])
+
+class TestToggleStatusComplete(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+
+    def test_toggle_is_one_update_of_one_column(self):
+        """docstring for test function"""
+        todo = Todos.objects.get(task='Sample Task 3')
+        with CaptureQueriesContext(connection) as queries:
+            delta = Todos.toggle_status_complete(todo.id)
+        statements = [query['sql'] for query in queries.captured_queries if 'todos_list_version' not in query['sql'] and not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(len(statements), 1)  # no SELECT of the task before (or after) the UPDATE
+        self.assertIn('SET status_complete = NOT status_complete', statements[0])
+        self.assertEqual([row.id for row in delta.updated], [todo.id])
+        self.assertEqual(delta.updated[0].status_complete, not todo.status_complete)
+        self.assertEqual(delta.updated[0].created_at, todo.created_at)  # other columns come back unchanged (& timezone-aware)
+
+    def test_missing_task_is_404_and_keeps_version(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        self.assertEqual(self.client.patch('/api/updateTodoStatus/999999').status_code, 404)
+        self.assertEqual(TodosListVersion.current(), version_before)  # the bump is rolled back w/ the empty UPDATE
+
+
+class TestToggleConcurrency(TransactionTestCase):
+    """docstring for class - parallel toggles of the same task on their own connections; every flip must land (no lost updates)"""
+    WORKERS = 8
+    TOGGLES_PER_WORKER = 5
+
+    def toggle_many(self, todo_id: int) -> list[int]:
+        """docstring for helper function - runs in its own thread, i.e. on its own DB connection; returns the versions its toggles got"""
+        versions: list[int] = []
+        try:
+            for _ in range(self.TOGGLES_PER_WORKER):
+                while True:
+                    try:
+                        versions.append(Todos.toggle_status_complete(todo_id).version)
+                        break
+                    except OperationalError:  # SQLite only: another writer holds the database lock
+                        continue
+        finally:
+            connections.close_all()
+        return versions
+
+    def test_parallel_toggles_are_not_lost(self):
+        """docstring for test function"""
+        todo = Todos.objects.create(task='Contended task', status_complete=False, sorted_rank=RANK_GAP)
+        version_before = TodosListVersion.current()
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            versions = [version for worker_versions in executor.map(self.toggle_many, [todo.id] * self.WORKERS) for version in worker_versions]
+        toggles = self.WORKERS * self.TOGGLES_PER_WORKER
+        self.assertEqual(sorted(versions), list(range(version_before + 1, version_before + toggles + 1)))  # one version per toggle, none shared
+        todo.refresh_from_db()
+        self.assertEqual(todo.status_complete, toggles % 2 == 1)
+
+class TestAsyncViews(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.async_client = AsyncClient()
+
+    async def test_async_list_matches_sync_list(self):
+        """docstring for test function"""
+        async_response = await self.async_client.get('/api/async/allTodos', headers={'X-Response-Shape': 'camel'})
+        sync_response = await self.async_client.get('/api/allTodos', headers={'X-Response-Shape': 'camel'})  # sync DRF route, still served
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+        not_modified = await self.async_client.get('/api/async/allTodos', headers={'X-Response-Shape': 'camel', 'If-None-Match': async_response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_async_writes(self):
+        """docstring for test function"""
+        added = await self.async_client.post('/api/async/addNewTask?response=delta', {'newTaskToAdd': {'id': -5, 'task': 'Async task', 'statusComplete': False}}, content_type='application/json')
+        self.assertEqual(added.status_code, 200)
+        new_id = added.json()['created'][0]['id']
+        toggled = await self.async_client.patch(f'/api/async/updateTodoStatus/{new_id}?response=delta&shape=camel')
+        self.assertTrue(toggled.json()['updated'][0]['statusComplete'])
+        deleted = await self.async_client.delete(f'/api/async/deleteTodo/{new_id}')
+        self.assertNotIn(new_id, [row['id'] for row in deleted.json()])  # full list by default
+        missing = await self.async_client.delete(f'/api/async/deleteTodo/{new_id}')
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_async_add_matches_sync_add(self):
+        """docstring for test function - a reused client temp id, & a write the database rejects, get the same status & body on both routes"""
+        payload = {'newTaskToAdd': {'id': -3, 'task': 'Same temp id', 'statusComplete': False}}
+        for path in ('/api/addNewTask', '/api/async/addNewTask', '/api/addNewTask', '/api/async/addNewTask'):
+            response = await self.async_client.post(f'{path}?response=delta', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 200, path)
+        with mock.patch.object(Todos, 'add_new_task', side_effect=IntegrityError('duplicate key')):
+            sync_response = await self.async_client.post('/api/addNewTask', payload, content_type='application/json')
+            async_response = await self.async_client.post('/api/async/addNewTask', payload, content_type='application/json')
+        self.assertEqual((async_response.status_code, async_response.json()), (sync_response.status_code, sync_response.json()))
+        self.assertEqual(async_response.json(), {'error': 'duplicate key'})
+
+class TestLoadgen(TestCase):
+    """docstring for class"""
+    def test_percentile(self):
+        """docstring for test function"""
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+class TestEventFeed(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        brokers.clear()  # list versions restart in every test DB
+        self.client = APIClient()
+        self.async_client = AsyncClient()
+
+    def test_committed_write_publishes_one_event(self):
+        """docstring for test function"""
+        todo = Todos.objects.get(task='Sample Task 1')
+        with self.captureOnCommitCallbacks(execute=True):
+            delta = Todos.toggle_status_complete(todo.id)
+        event_id, message = brokers.get(DEFAULT_LIST_ID).since(delta.version - 1)[-1]
+        self.assertEqual(event_id, delta.version)
+        self.assertIn(b'event: updated\n', message)
+        self.assertIn(f'"id":{todo.id},'.encode(), message)
+
+    def test_rolled_back_write_publishes_nothing(self):
+        """docstring for test function"""
+        latest_before = brokers.get(DEFAULT_LIST_ID).latest_id()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/batch', {'operations': [{'op': 'toggle', 'id': 999999}]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(brokers.get(DEFAULT_LIST_ID).latest_id(), latest_before)
+
+    def test_stream_is_not_served_under_wsgi(self):
+        """docstring for test function"""
+        self.assertEqual(self.client.get('/api/events').status_code, 204)
+
+    def test_ring_buffer_eviction(self):
+        """docstring for test function"""
+        small_broker = EventBroker(buffer_size=2)
+        for event_id in (1, 2, 3):
+            small_broker.publish(event_id, 'updated', {'version': event_id})
+        self.assertIsNone(small_broker.since(0))  # event 1 was evicted -- client must reset
+        self.assertEqual([event_id for event_id, _ in small_broker.since(1)], [2, 3])
+
+    def delete_and_commit(self, todo_id: int) -> None:
+        """docstring for helper function - runs in the sync thread, where the test transaction's on_commit callbacks are captured"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Todos.delete_single_todo(todo_id)
+
+    async def test_stream_resumes_from_last_event_id(self):
+        """docstring for test function"""
+        version_before = await TodosListVersion.acurrent()
+        todo = await Todos.objects.aget(task='Sample Task 2')
+        await sync_to_async(self.delete_and_commit)(todo.id)
+        response = await self.async_client.get('/api/events', headers={'Last-Event-ID': str(version_before)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        replayed = await anext(stream)
+        self.assertIn(f'id: {version_before + 1}\nevent: deleted\n'.encode(), replayed)
+        await stream.aclose()
+
+    async def test_stream_resets_when_events_are_missing(self):
+        """docstring for test function"""
+        response = await self.async_client.get('/api/events', headers={'Last-Event-ID': '0'})  # seed_db ran w/o publishing (on_commit never fires in TestCase)
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        self.assertIn(b'event: reset\n', await anext(stream))
+        await stream.aclose()
+
+class TestConnectionPool(TestCase):
+    """docstring for class"""
+    def test_pool_stats_without_pool(self):
+        """docstring for test function"""
+        stats = APIClient().get('/api/poolStats').json()
+        self.assertIn(stats['mode'], ('persistent', 'per-request'))
+
+    def test_pool_exhaustion_returns_503(self):
+        """docstring for test function"""
+        class PoolTimeout(Exception):
+            """docstring for class - stand-in w/ the same name as psycopg_pool.PoolTimeout (psycopg 3 is optional)"""
+
+        wrapped = OperationalError('couldn\'t get a connection after 2.00 sec')
+        wrapped.__cause__ = PoolTimeout('couldn\'t get a connection after 2.00 sec')  # as re-raised by Django's database error wrapper
+        self.assertTrue(is_pool_exhausted(wrapped))
+        response = PoolExhaustedMiddleware(lambda request: None).process_exception(RequestFactory().get('/api/allTodos'), wrapped)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(is_pool_exhausted(OperationalError('server closed the connection unexpectedly')))
+
+class TestRequestMetrics(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        metrics.reset()
+        self.client = APIClient()
+
+    def test_server_timing_header(self):
+        """docstring for test function"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/allTodos')
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", ser;dur=[\d.]+$')
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+    async def test_async_views_are_instrumented(self):
+        """docstring for test function"""
+        response = await AsyncClient().get('/api/async/allTodos')
+        self.assertIn('desc="3 queries"', response['Server-Timing'])  # version, rows & post-render version check -- run in the async ORM's worker thread, still counted
+
+    def test_metrics_endpoint_histograms(self):
+        """docstring for test function"""
+        todo = Todos.objects.get(task='Sample Task 1')
+        self.client.get('/api/allTodos')
+        self.client.patch(f'/api/updateTodoStatus/{todo.id}')
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('# TYPE todos_http_request_duration_seconds histogram', body)
+        self.assertIn('todos_http_request_duration_seconds_count{route="api/allTodos",method="GET"} 1', body)
+        self.assertIn('todos_http_db_queries_bucket{route="api/updateTodoStatus/<int:id_to_update>",method="PATCH",le="+Inf"} 1', body)
+        self.assertIn('todos_http_response_size_bytes_sum{route="api/allTodos",method="GET"}', body)
+
+
+class TestBulkSeed(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+
+    def test_bulk_seed_appends_after_existing_rows(self):
+        """docstring for test function"""
+        max_rank = max(Todos.objects.values_list('sorted_rank', flat=True))
+        version_before = TodosListVersion.current()
+        with self.assertNumQueries(8):  # savepoint, version bump (UPDATE + SELECT), max rank, one INSERT per batch of 100, release
+            version = Todos.bulk_seed(250, completed_ratio=0.5, task_length=lambda: 50, rng=random.Random(1), batch_size=100)
+        self.assertEqual(version, version_before + 1)
+        seeded = Todos.objects.filter(sorted_rank__gt=max_rank).order_by('sorted_rank')
+        self.assertEqual([todo.sorted_rank for todo in seeded], [max_rank + i * RANK_GAP for i in range(1, 251)])
+        self.assertTrue(80 < seeded.filter(status_complete=True).count() < 170)
+        self.assertTrue(all(0 < len(todo.task) <= 50 for todo in seeded))
+
+    def test_task_length_sampler_bounds(self):
+        """docstring for test function"""
+        for distribution in ('uniform', 'normal', 'short'):
+            sample = task_length_sampler(distribution, 5, 50, random.Random(7))
+            self.assertTrue(all(5 <= sample() <= 50 for _ in range(500)), distribution)
+
+    def test_seed_todos_command(self):
+        """docstring for test function"""
+        out = StringIO()
+        call_command('seed_todos', 100, '--clear', '--seed', '3', '--completed-ratio', '1', stdout=out)
+        self.assertEqual(Todos.objects.count(), 100)
+        self.assertEqual(Todos.objects.filter(status_complete=False).count(), 0)
+        self.assertIn('Seeded 100 todos', out.getvalue())
+
+
+
+class TestDeleteAllCompleted(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.bulk_seed(50, completed_ratio=0.5, task_length=lambda: 10, rng=random.Random(5))
+        self.completed_ids = sorted(Todos.objects.filter(status_complete=True).values_list('id', flat=True))
+        self.client = APIClient()
+
+    def test_single_statement_returns_ids_and_count(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete('/api/deleteAllCompletedTodos', HTTP_X_RESPONSE_MODE='delta')
+        body = response.json()
+        self.assertEqual(sorted(body['deleted']), self.completed_ids)
+        self.assertEqual(body['deletedCount'], len(self.completed_ids))
+        self.assertEqual(body['version'], version_before + 1)
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([sql for sql in statements if sql.startswith('DELETE')]), 1)
+        self.assertFalse([sql for sql in statements if sql.startswith('SELECT') and 'FROM "todos"' in sql])  # no rows fetched before / after the DELETE
+        self.assertFalse(Todos.objects.filter(status_complete=True).exists())
+
+    def test_nothing_to_delete_keeps_version(self):
+        """docstring for test function"""
+        Todos.objects.filter(status_complete=True).delete()
+        version_before = TodosListVersion.current()
+        response = self.client.delete('/api/deleteAllCompletedTodos')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(TodosListVersion.current(), version_before)  # bump rolled back
+
+    def test_chunked_mode(self):
+        """docstring for test function"""
+        version_before = TodosListVersion.current()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            delta = Todos.delete_all_completed(chunk_size=10)
+        chunks = -(-len(self.completed_ids) // 10)
+        self.assertEqual(sorted(delta.deleted), self.completed_ids)
+        self.assertEqual(delta.version, version_before + chunks)  # one bump (& one change-feed event) per chunk
+        self.assertEqual(len(callbacks), chunks)
+        self.assertEqual(Todos.objects.count(), 50 - len(self.completed_ids))
+
+        response = self.client.delete('/api/deleteAllCompletedTodos?chunkSize=0')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestListScoping(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()  # list 1
+        Todos.bulk_seed(3, completed_ratio=1.0, task_length=lambda: 10, rng=random.Random(2), list_id=7)
+        self.client = APIClient()
+
+    def test_reads_and_versions_are_per_list(self):
+        """docstring for test function"""
+        other_ids = set(Todos.in_list(7).values_list('id', flat=True))
+        response = self.client.get('/api/allTodos?list=7')
+        self.assertEqual({row['id'] for row in response.json()}, other_ids)
+        self.assertEqual(response['ETag'], f'"{TodosListVersion.current(7)}"')
+        self.assertIn('X-Todo-List', response['Vary'])
+        self.assertEqual(len(self.client.get('/api/allTodos').json()), 6)  # no list given -- list 1
+        camel_rows = self.client.get('/api/allTodos', HTTP_X_TODO_LIST='7', HTTP_X_RESPONSE_SHAPE='camel').json()
+        self.assertEqual([row['id'] for row in camel_rows], list(Todos.in_list(7).order_by('sorted_rank', 'id').values_list('id', flat=True)))
+        self.assertEqual(self.client.get('/api/allTodos?list=abc').status_code, 400)
+
+        version_before = TodosListVersion.current()
+        response = self.client.delete('/api/deleteAllCompletedTodos?list=7', HTTP_X_RESPONSE_MODE='delta')
+        self.assertEqual(sorted(response.json()['deleted']), sorted(other_ids))
+        self.assertEqual(TodosListVersion.current(), version_before)  # list 1 untouched
+        self.assertEqual(Todos.in_list().filter(status_complete=True).count(), 1)
+
+    def test_writes_cannot_reach_other_lists(self):
+        """docstring for test function"""
+        todo = Todos.in_list(7).first()
+        self.assertEqual(self.client.patch(f'/api/updateTodoStatus/{todo.id}').status_code, 404)  # list 1
+        self.assertEqual(self.client.delete(f'/api/deleteTodo/{todo.id}').status_code, 404)
+        response = self.client.post('/api/batch?list=1', {'operations': [{'op': 'toggle', 'id': todo.id}]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Todos.objects.get(id=todo.id).status_complete)
+
+        response = self.client.post('/api/addNewTask?list=7&response=delta', {'newTaskToAdd': {'id': -1, 'task': 'List 7 task', 'statusComplete': False}}, format='json')
+        created = Todos.objects.get(id=response.json()['created'][0]['id'])
+        self.assertEqual(created.list_id, 7)
+        self.assertEqual(created.sorted_rank, 4 * RANK_GAP)  # after list 7's last task, not list 1's
+
+    def test_queries_are_scoped_to_the_list(self):
+        """docstring for test function"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/allTodos?list=7&status=active&limit=10')
+            self.client.post('/api/addNewTask?list=7', {'newTaskToAdd': {'id': -2, 'task': 'Scoped', 'statusComplete': False}}, format='json')
+        todo_queries = [query['sql'] for query in queries.captured_queries if '"todos"' in query['sql'] or 'todos ' in query['sql']]
+        self.assertTrue(todo_queries)
+        self.assertTrue(all('list_id' in sql for sql in todo_queries), todo_queries)
+
+    def test_event_brokers_are_per_list_and_bounded(self):
+        """docstring for test function"""
+        registry = EventBrokers(max_lists=2, buffer_size=10)
+        registry.get(1).publish(1, 'updated', {'version': 1})
+        registry.get(2).publish(1, 'updated', {'version': 1})
+        self.assertEqual(registry.get(3).since(0), [])
+        self.assertEqual(len(registry.get(2).since(0)), 1)
+        self.assertEqual(registry.get(1).since(0), [])  # least recently used idle list was dropped -- a resuming client gets a reset
+
+class TestBulkTransfer(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        brokers.clear()
+        self.client = APIClient()
+
+    def test_export_ndjson_streams_list_in_order(self):
+        """docstring for test function"""
+        response = self.client.get('/api/exportTodos')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['task'] for row in rows], [f'Sample Task {i}' for i in range(1, 7)])
+        self.assertEqual(set(rows[0]), {'id', 'sorted_rank', 'created_at', 'task', 'status_complete'})
+
+    def test_export_csv(self):
+        """docstring for test function"""
+        response = self.client.get('/api/exportTodos?type=csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,sorted_rank,created_at,task,status_complete')
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(lines[5].endswith(',Sample Task 5,true'))
+
+    def test_import_ndjson_appends_in_file_order(self):
+        """docstring for test function"""
+        max_rank = max(Todos.objects.values_list('sorted_rank', flat=True))
+        body = b'{"task": "Imported 1", "statusComplete": true}\n\n{"task": "Imported 2", "created_at": "2024-01-02T03:04:05Z"}\n'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/importTodos', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'imported': 2, 'version': TodosListVersion.current()})
+        imported = list(Todos.objects.filter(sorted_rank__gt=max_rank).order_by('sorted_rank'))
+        self.assertEqual([(todo.task, todo.status_complete, todo.sorted_rank) for todo in imported], [('Imported 1', True, max_rank + RANK_GAP), ('Imported 2', False, max_rank + 2 * RANK_GAP)])
+        self.assertEqual(imported[1].created_at.year, 2024)
+        self.assertIn(b'event: reset', brokers.get(DEFAULT_LIST_ID).since(0)[-1][1])
+
+    def test_import_invalid_row_imports_nothing(self):
+        """docstring for test function"""
+        version = TodosListVersion.current()
+        response = self.client.post('/api/importTodos?type=csv', 'task,status_complete\nOk,false\n,true\n', content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['line'], 3)
+        self.assertEqual(Todos.objects.count(), 6)
+        self.assertEqual(TodosListVersion.current(), version)
+
+    def test_export_then_import_commands_round_trip(self):
+        """docstring for test function"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'todos.csv')
+            call_command('export_todos', path, stderr=StringIO())
+            Todos.objects.all().delete()
+            out = StringIO()
+            call_command('import_todos', path, '--batch-size', '4', stdout=out)
+        self.assertIn('Imported 6 todos', out.getvalue())
+        self.assertEqual(list(Todos.objects.order_by('sorted_rank').values_list('task', 'status_complete')), [(f'Sample Task {i}', i == 5) for i in range(1, 7)])
+
+
+class TestStaticAssets(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.root = self.directory.name
+        self.script = b'console.log("todos");\n' * 200
+        with open(os.path.join(self.root, 'index-DLm4jeKW.js'), 'wb') as file:
+            file.write(self.script)
+        with open(os.path.join(self.root, 'tiny.css'), 'wb') as file:
+            file.write(b'a{}')
+        with open(os.path.join(self.root, 'manifest.json'), 'w', encoding='utf-8') as file:  # as written by 'vite build' (see vite.config.ts)
+            json.dump({'index.html': {'file': 'assets/index-DLm4jeKW.js', 'css': ['assets/index-B3xK9fQz.css'], 'isEntry': True}}, file)
+        storage = CompressedStaticFilesStorage(location=self.root)
+        self.processed = list(storage.post_process({'index-DLm4jeKW.js': (storage, 'index-DLm4jeKW.js'), 'tiny.css': (storage, 'tiny.css')}))
+        stat_cache.clear()
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        """docstring for teardown function"""
+        stat_cache.clear()
+        self.directory.cleanup()
+
+    def get(self, filename, **headers):
+        """docstring for helper function"""
+        with override_settings(STATIC_ROOT=self.root):
+            return serve_production_file(self.factory.get(f'/static/{filename}', headers=headers), filename)
+
+    def test_collectstatic_post_process_builds_gzip_variant(self):
+        """docstring for test function"""
+        self.assertIn(('index-DLm4jeKW.js', 'index-DLm4jeKW.js', True), self.processed)
+        self.assertIn(('tiny.css', 'tiny.css', False), self.processed)  # too small to be worth a variant
+        with gzip.open(os.path.join(self.root, 'index-DLm4jeKW.js.gz')) as file:
+            self.assertEqual(file.read(), self.script)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'tiny.css.gz')))
+
+    def test_serves_negotiated_variant_with_immutable_caching(self):
+        """docstring for test function"""
+        response = self.get('index-DLm4jeKW.js', accept_encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('javascript', response['Content-Type'])
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.script)
+
+        identity = self.get('index-DLm4jeKW.js')
+        self.assertFalse(identity.has_header('Content-Encoding'))
+        self.assertEqual(int(identity['Content-Length']), len(self.script))
+        self.assertNotEqual(identity['ETag'], response['ETag'])  # one ETag per representation
+
+    def test_only_manifest_files_are_immutable(self):
+        """docstring for test function - names that merely look hashed are revalidated"""
+        for filename in ('my-settings.json', 'app-frontend.js'):
+            with open(os.path.join(self.root, filename), 'wb') as file:
+                file.write(b'{}')
+            self.assertEqual(self.get(filename)['Cache-Control'], 'public, max-age=0, must-revalidate', filename)
+        os.remove(os.path.join(self.root, 'manifest.json'))
+        stat_cache.clear()
+        self.assertIn('must-revalidate', self.get('index-DLm4jeKW.js')['Cache-Control'])  # no manifest --> nothing is immutable
+
+    def test_conditional_get_and_missing_files(self):
+        """docstring for test function"""
+        etag = self.get('tiny.css')['ETag']
+        response = self.get('tiny.css', if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        for filename in ('missing.js', '../settings.py'):
+            with self.assertRaises(Http404):
+                self.get(filename)
+
+    def test_negotiate_encoding(self):
+        """docstring for test function"""
+        both = {'identity', 'br', 'gzip'}
+        self.assertEqual(negotiate_encoding('gzip, deflate, br', both), 'br')
+        self.assertEqual(negotiate_encoding('br;q=0, gzip', both), 'gzip')
+        self.assertEqual(negotiate_encoding('*', {'identity', 'gzip'}), 'gzip')
+        self.assertEqual(negotiate_encoding('', both), 'identity')
+
+
+class TestIndexShell(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        index_shell.reset()
+
+    def test_root_and_catch_all_served_from_memory_with_etag(self):
+        """docstring for test function"""
+        renders_before = index_shell.renders
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<div id="root"></div>', response.content)
+        self.assertIn(b'/static/index-', response.content)  # {% static %} rendered
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        catch_all = self.client.get('/some/client/route')
+        self.assertEqual(catch_all.content, response.content)
+        self.assertEqual(catch_all['ETag'], response['ETag'])
+        self.assertEqual(index_shell.renders, renders_before + 1)  # rendered once for both requests
+
+        not_modified = self.client.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+
+    def test_rerenders_when_template_file_changes(self):
+        """docstring for test function"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.html')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write("{% load static %}<script src=\"{% static 'index-AAAAAAAA.js' %}\"></script>")
+            shell = IndexShell(path=path, check_seconds=0)
+            body, etag = shell.get()
+            self.assertEqual(body, b'<script src="/static/index-AAAAAAAA.js"></script>')
+            self.assertEqual(shell.get(), (body, etag))
+            self.assertEqual(shell.renders, 1)
+
+            with open(path, 'w', encoding='utf-8') as file:  # new build
+                file.write("{% load static %}<script src=\"{% static 'index-BBBBBBBB.js' %}\"></script>")
+            os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000_000))
+            new_body, new_etag = shell.get()
+        self.assertIn(b'index-BBBBBBBB.js', new_body)
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(shell.renders, 2)
+
+
+class TestStartupBudget(SimpleTestCase):
+    """docstring for class - cold start of a production worker in a fresh interpreter (timing only runs where STARTUP_BUDGET_SECONDS is set -- wall-clock budgets are flaky on shared CI machines)"""
+    @skipUnless('STARTUP_BUDGET_SECONDS' in os.environ, 'set STARTUP_BUDGET_SECONDS to check the cold-start budget')
+    def test_production_cold_start_within_budget(self):
+        """docstring for test function"""
+        report = profile_startup({'PYTHON_ENV': 'production'})
+        self.assertEqual(report['firstRequestStatus'], '200 OK')
+        self.assertLessEqual(report['seconds']['total'], STARTUP_BUDGET_SECONDS, report['packages'])
+        self.assertEqual(report['output'], '')  # nothing printed at import time
+        self.assertNotIn('debug_toolbar', report['loadedPackages'])  # dev-only
+
+    def test_parse_importtime(self):
+        """docstring for test function"""
+        report = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   django.utils\n'
+            'import time:       300 |        420 | django\n'
+        )
+        self.assertEqual(parse_importtime(report), [('django.utils', 1, 120, 120), ('django', 0, 300, 420)])
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_ROUTERS=['django_app.db_router.PrimaryReplicaRouter'], READ_YOUR_WRITES_SECONDS=5)
+@modify_settings(MIDDLEWARE={'prepend': 'django_app.db_router.ReadYourWritesMiddleware'})
+class TestReadReplicaRouting(TransactionTestCase):
+    """docstring for class - the 'replica' test alias (see settings.py) stands in for a replica: a second connection to the test database, which only sees committed rows, like a real one"""
+    databases = {'default', 'replica', 'replica_2'}
+
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.seed_db()
+        self.client = APIClient()
+
+    def get_all_todos(self) -> tuple[list, int, int]:
+        """docstring for helper function - (rows, queries on the primary, queries on the replica)"""
+        with CaptureQueriesContext(connections['default']) as primary, CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get('/api/allTodos')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(primary), len(replica)
+
+    def test_reads_follow_writes_to_the_primary(self):
+        """docstring for test function"""
+        _, primary_queries, replica_queries = self.get_all_todos()
+        self.assertEqual(primary_queries, 0)
+        self.assertGreater(replica_queries, 0)
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.post('/api/addNewTask', {'newTaskToAdd': {'id': -1, 'task': 'Pinned task', 'statusComplete': False}}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(replica), 0)  # the write request's own reads (e.g. the full list it returns) stay on the primary
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+        rows, primary_queries, replica_queries = self.get_all_todos()  # the client sends the cookie back --> pinned
+        self.assertEqual((primary_queries > 0, replica_queries), (True, 0))
+        self.assertIn('Pinned task', [row['task'] for row in rows])
+
+        self.client.cookies[PIN_COOKIE_NAME] = f'{time.time() - 1:.3f}'  # window over
+        _, primary_queries, replica_queries = self.get_all_todos()
+        self.assertEqual(primary_queries, 0)
+        self.assertGreater(replica_queries, 0)
+
+    def test_transactions_and_failed_writes(self):
+        """docstring for test function"""
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Todos), 'replica')
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(Todos), 'default')  # in-transaction reads see the transaction's own writes
+        self.assertEqual(router.db_for_write(Todos), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'django_app'))
+
+        response = self.client.patch('/api/updateTodoStatus/999999')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)  # nothing written, nothing to pin
+
+    @override_settings(DATABASE_REPLICAS=['replica', 'replica_2'])
+    def test_one_replica_per_request(self):
+        """docstring for test function - the version, the rows & the cache re-check of a request must come from the same replica"""
+        used: set[str] = set()
+        for _ in range(20):
+            with CaptureQueriesContext(connections['replica']) as first, CaptureQueriesContext(connections['replica_2']) as second:
+                self.assertEqual(self.client.get('/api/allTodos').status_code, 200)
+            aliases = {alias for alias, queries in (('replica', first), ('replica_2', second)) if len(queries)}
+            self.assertEqual(len(aliases), 1, aliases)  # never split across replicas
+            used |= aliases
+        self.assertEqual(used, {'replica', 'replica_2'})  # ... but spread across them (a 2 ** -19 chance of a false failure)
+
+    def test_forged_cookie_is_capped_to_one_window(self):
+        """docstring for test function"""
+        request = RequestFactory().get('/api/allTodos', HTTP_COOKIE=f'{PIN_COOKIE_NAME}=99999999999')
+        self.assertLessEqual(pinned_until(request), time.time() + 5)
+        self.assertEqual(pinned_until(RequestFactory().get('/api/allTodos', HTTP_COOKIE=f'{PIN_COOKIE_NAME}=junk')), 0.0)
+
+
+class TestResponseEncodings(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        Todos.bulk_seed(200, completed_ratio=0.25, rng=random.Random(7))  # ~10 KB of JSON -- well above the compression threshold
+        self.client = APIClient()
+
+    def test_gzip_above_threshold_with_weak_etag(self):
+        """docstring for test function"""
+        plain = self.client.get('/api/allTodos')
+        compressed = self.client.get('/api/allTodos', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertLess(len(compressed.content), len(plain.content) / 3)
+        self.assertEqual(compressed['ETag'], f'W/{plain["ETag"]}')
+        self.assertEqual(self.client.get('/api/allTodos', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=compressed['ETag']).status_code, 304)  # weak comparison
+
+        small = self.client.get('/api/cacheStats', HTTP_ACCEPT_ENCODING='gzip')  # below the threshold
+        self.assertFalse(small.has_header('Content-Encoding'))
+
+    def test_columnar_representation_via_accept(self):
+        """docstring for test function"""
+        rows = self.client.get('/api/allTodos', HTTP_X_RESPONSE_SHAPE='camel').json()
+        response = self.client.get('/api/allTodos', HTTP_ACCEPT=f'{COLUMNAR_CONTENT_TYPE}, application/json;q=0.5')
+        self.assertEqual(response['Content-Type'], COLUMNAR_CONTENT_TYPE)
+        self.assertTrue(response['ETag'].endswith('-columnar"'))
+        self.assertIn('Accept', response['Vary'])
+        columns = json.loads(response.content)
+        self.assertEqual(list(columns), ['id', 'task', 'statusComplete', 'newSortedRank'])
+        self.assertEqual([dict(zip(columns, values)) for values in zip(*columns.values())], rows)
+
+        preferred_json = self.client.get('/api/allTodos', HTTP_ACCEPT=f'application/json, {COLUMNAR_CONTENT_TYPE};q=0.5')
+        self.assertEqual(preferred_json['Content-Type'], 'application/json')
+
+    def test_paged_response_etag_names_the_json_it_sends(self):
+        """docstring for test function - the page envelope is always JSON, whatever Accept asks for"""
+        version = TodosListVersion.current()
+        for accept in (COLUMNAR_CONTENT_TYPE, MSGPACK_CONTENT_TYPE):
+            response = self.client.get('/api/allTodos?status=active&limit=10', HTTP_ACCEPT=accept)
+            self.assertEqual(response['Content-Type'], 'application/json')
+            self.assertEqual(response['ETag'], f'"{version}"')
+            camel = self.client.get('/api/allTodos?limit=10', HTTP_ACCEPT=accept, HTTP_X_RESPONSE_SHAPE='camel')
+            self.assertEqual(camel['ETag'], f'"{version}-camel"')
+            self.assertEqual(self.client.get('/api/allTodos?limit=10', HTTP_ACCEPT=accept, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    @skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack_representation_for_reads_and_writes(self):
+        """docstring for test function"""
+        columns = json.loads(self.client.get('/api/allTodos', HTTP_ACCEPT=COLUMNAR_CONTENT_TYPE).content)
+        response = self.client.get('/api/allTodos', HTTP_ACCEPT=MSGPACK_CONTENT_TYPE)
+        self.assertEqual(response['Content-Type'], MSGPACK_CONTENT_TYPE)
+        self.assertEqual(msgpack.unpackb(response.content), columns)
+        self.assertLess(len(response.content), len(self.client.get('/api/allTodos').content) / 2)
+
+        todo_id = columns['id'][0]
+        written = self.client.patch(f'/api/updateTodoStatus/{todo_id}', HTTP_ACCEPT=MSGPACK_CONTENT_TYPE)  # full-list response of a write
+        self.assertEqual(written['Content-Type'], MSGPACK_CONTENT_TYPE)
+        self.assertEqual(msgpack.unpackb(written.content)['statusComplete'][0], not columns['statusComplete'][0])
+
+    async def test_async_route_serves_the_same_representations(self):
+        """docstring for test function"""
+        async_client = AsyncClient()
+        sync_response = await async_client.get('/api/allTodos', headers={'Accept': COLUMNAR_CONTENT_TYPE, 'Accept-Encoding': 'gzip'})
+        async_response = await async_client.get('/api/async/allTodos', headers={'Accept': COLUMNAR_CONTENT_TYPE, 'Accept-Encoding': 'gzip'})
+        self.assertEqual((async_response['Content-Type'], async_response['Content-Encoding']), (COLUMNAR_CONTENT_TYPE, 'gzip'))
+        self.assertEqual(gzip.decompress(async_response.content), gzip.decompress(sync_response.content))
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+
+    def test_unsupported_accept_falls_back_to_json(self):
+        """docstring for test function"""
+        response = self.client.get('/api/cacheStats', HTTP_ACCEPT=MSGPACK_CONTENT_TYPE)  # JSON-only endpoint -- not a 406
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(self.client.get('/api/allTodos', HTTP_ACCEPT='application/xml')['Content-Type'], 'application/json')
+
+
+class TestSearchTodos(TestCase):
+    """docstring for class"""
+    def setUp(self):
+        """docstring for setup function"""
+        tasks = [('Buy MILK', False), ('Call mom', False), ('Milkshake run', True), ('50% off shoes', False), ('500 emails', False), ('buy oat milk', False)]
+        Todos.objects.bulk_create([Todos(task=task, status_complete=done, sorted_rank=(i + 1) * RANK_GAP) for i, (task, done) in enumerate(tasks)])
+        Todos.objects.create(task='Milk for list 2', sorted_rank=RANK_GAP, list_id=2)
+        self.client = APIClient()
+
+    def search(self, query_string: str) -> dict:
+        """docstring for helper function"""
+        response = self.client.get(f'/api/searchTodos?{query_string}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_case_insensitive_substring_in_list_order(self):
+        """docstring for test function"""
+        body = self.search('q=milk')
+        self.assertEqual([row['task'] for row in body['results']], ['Buy MILK', 'Milkshake run', 'buy oat milk'])
+        self.assertIsNone(body['next'])
+        self.assertNotIn('counts', body)
+        self.assertEqual([row['task'] for row in self.search('q=milk&list=2')['results']], ['Milk for list 2'])
+        with CaptureQueriesContext(connection) as queries:
+            self.search('q=milk')
+        self.assertIn({'postgresql': 'ILIKE', 'sqlite': 'todos_search'}.get(connection.vendor, 'LIKE'), queries.captured_queries[-1]['sql'])  # served by the search index
+
+    def test_status_filter_and_keyset_pagination(self):
+        """docstring for test function"""
+        first = self.search('q=milk&status=active&limit=1&shape=camel')
+        self.assertEqual([row['task'] for row in first['results']], ['Buy MILK'])
+        second = self.search(f"q=milk&status=active&limit=1&cursor={first['next']}")
+        self.assertEqual([row['task'] for row in second['results']], ['buy oat milk'])
+        self.assertIsNone(second['next'])
+
+    def test_short_queries_and_like_wildcards(self):
+        """docstring for test function"""
+        self.assertEqual([row['task'] for row in self.search('q=mo')['results']], ['Call mom'])  # too short for trigrams -- unindexed fallback
+        self.assertEqual([row['task'] for row in self.search('q=50%25')['results']], ['50% off shoes'])  # '%' is matched literally
+        self.assertEqual(self.search('q=_')['results'], [])
+        self.assertEqual(self.client.get('/api/searchTodos?q=').status_code, 400)
+
+    def test_index_follows_raw_sql_writes(self):
+        """docstring for test function"""
+        Todos.objects.filter(task='Call mom').update(task='Call dad')
+        self.assertEqual(self.search('q=mom')['results'], [])
+        self.assertEqual([row['task'] for row in self.search('q=call dad')['results']], ['Call dad'])
+
+        Todos.bulk_seed(3, task_length=lambda: 50, rng=random.Random(1))  # multi-row raw INSERT
+        seeded = Todos.in_list(DEFAULT_LIST_ID).order_by('-sorted_rank').first()
+        self.assertIn(seeded.id, [row['id'] for row in self.search(urlencode({'q': seeded.task[-10:], 'limit': 1000}))['results']])
+
+        Todos.delete_all_completed()  # DELETE ... RETURNING
+        self.assertEqual([row['task'] for row in self.search('q=milk')['results']], ['Buy MILK', 'buy oat milk'])
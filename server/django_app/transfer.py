@@ -0,0 +1,153 @@
+# pylint: disable=line-too-long
+
+"""
+docstring for module
+This module implements streaming bulk export & import of one todos list as NDJSON (one JSON object per line) or CSV
+Export walks the table w/ QuerySet.iterator(chunk_size=...) -- a server-side cursor on PostgreSQL -- & yields output one chunk at a time, so memory stays flat however many rows there are
+Import parses its input line by line & feeds Todos.bulk_import() lazily, so peak memory depends on the batch size, not the file size
+Rows are written in the TodosSerializer (snake_case) shape; import also accepts the frontend's camelCase keys, ignores ids / ranks & appends the rows in file order
+"""
+
+import codecs
+import csv
+import io
+import json
+from datetime import timezone as dt_timezone
+from typing import Any, Iterable, Iterator
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_app.models import DEFAULT_LIST_ID, Todos
+from django_app.renderers import dumps
+
+# ----------
+
+EXPORT_COLUMNS = ('id', 'sorted_rank', 'created_at', 'task', 'status_complete')
+EXPORT_CHUNK_SIZE = 2_000  # rows fetched per round trip (& per chunk of output)
+CONTENT_TYPES: dict[str, str] = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+
+TASK_MAX_LENGTH: int = Todos._meta.get_field('task').max_length  # pylint: disable=protected-access
+CSV_TRUE = frozenset(('true', 't', 'yes', 'y', '1'))
+CSV_FALSE = frozenset(('false', 'f', 'no', 'n', '0', ''))
+
+ImportRow = tuple[str, bool, Any]  # (task, status_complete, created_at or None) -- see Todos.bulk_import
+
+# ----------
+
+class ImportRowError(ValueError):
+    """docstring for class - a line of the input that can't be imported (the whole import is rolled back)"""
+    def __init__(self, line: int, message: str):
+        super().__init__(f'line {line}: {message}')
+        self.line = line
+
+
+def file_type_for(name: str | None, content_type: str = '') -> str:
+    """docstring for helper function - 'csv' for a .csv file name or a text/csv content type, 'ndjson' otherwise"""
+    if (name or '').lower().endswith('.csv') or 'csv' in content_type.lower():
+        return 'csv'
+    return 'ndjson'
+
+# --------- EXPORT ---------
+
+def export_rows(chunk_size: int = EXPORT_CHUNK_SIZE, list_id: int = DEFAULT_LIST_ID) -> Iterator[tuple]:
+    """docstring for helper function - every task of the list in list order as plain tuples, fetched 'chunk_size' rows at a time"""
+    return Todos.in_list(list_id).order_by('sorted_rank', 'id').values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+
+
+def iter_ndjson(rows: Iterable[tuple], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """docstring for helper function - one JSON object per line, yielded 'chunk_size' lines at a time (one write per chunk rather than per row)"""
+    lines: list[bytes] = []
+    for todo_id, sorted_rank, created_at, task, status_complete in rows:
+        lines.append(dumps({
+            'id': todo_id,
+            'sorted_rank': sorted_rank,
+            'created_at': created_at.isoformat() if created_at else None,
+            'task': task,
+            'status_complete': status_complete,
+        }))
+        if len(lines) >= chunk_size:
+            yield b'\n'.join(lines) + b'\n'
+            lines = []
+    if lines:
+        yield b'\n'.join(lines) + b'\n'
+
+
+def iter_csv(rows: Iterable[tuple], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """docstring for helper function - header row, then one row per task, yielded 'chunk_size' rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, (todo_id, sorted_rank, created_at, task, status_complete) in enumerate(rows, start=1):
+        writer.writerow((todo_id, sorted_rank, created_at.isoformat() if created_at else '', task, 'true' if status_complete else 'false'))
+        if count % chunk_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def stream_export(file_type: str, chunk_size: int = EXPORT_CHUNK_SIZE, list_id: int = DEFAULT_LIST_ID) -> Iterator[bytes]:
+    """docstring for helper function"""
+    render = iter_csv if file_type == 'csv' else iter_ndjson
+    return render(export_rows(chunk_size, list_id), chunk_size)
+
+# --------- IMPORT ---------
+
+def clean_row(line: int, record: dict[str, Any], status_complete: Any) -> ImportRow:
+    """docstring for helper function - validate one input record (same rules as TodosSerializer: non-empty task of at most 50 characters)"""
+    task: Any = record.get('task')
+    if not isinstance(task, str) or not task.strip():
+        raise ImportRowError(line, "'task' is required")
+    if len(task) > TASK_MAX_LENGTH:
+        raise ImportRowError(line, f"'task' has more than {TASK_MAX_LENGTH} characters")
+    if not isinstance(status_complete, bool):
+        raise ImportRowError(line, "'status_complete' must be true or false")
+
+    raw_created_at: Any = record.get('created_at', record.get('createdAt')) or None
+    created_at = None
+    if raw_created_at is not None:
+        try:
+            created_at = parse_datetime(raw_created_at) if isinstance(raw_created_at, str) else None
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise ImportRowError(line, "'created_at' must be an ISO 8601 date & time")
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at, dt_timezone.utc)
+    return task, status_complete, created_at
+
+
+def parse_ndjson(lines: Iterable[bytes]) -> Iterator[ImportRow]:
+    """docstring for helper function - blank lines are skipped"""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record: Any = json.loads(line)
+        except ValueError as e:
+            raise ImportRowError(line_number, 'invalid JSON') from e
+        if not isinstance(record, dict):
+            raise ImportRowError(line_number, 'expected a JSON object')
+        yield clean_row(line_number, record, record.get('status_complete', record.get('statusComplete', False)))
+
+
+def parse_csv(lines: Iterable[bytes]) -> Iterator[ImportRow]:
+    """docstring for helper function - first row is the header (needs a 'task' column); a UTF-8 byte order mark is ignored"""
+    reader = csv.DictReader(codecs.iterdecode(lines, 'utf-8-sig'))
+    if reader.fieldnames is None:
+        return
+    if 'task' not in reader.fieldnames:
+        raise ImportRowError(1, "header row has no 'task' column")
+    for record in reader:
+        raw_status: str = (record.get('status_complete') or record.get('statusComplete') or '').strip().lower()
+        status_complete: Any = True if raw_status in CSV_TRUE else False if raw_status in CSV_FALSE else raw_status
+        yield clean_row(reader.line_num, record, status_complete)
+
+
+def import_lines(lines: Iterable[bytes], file_type: str, batch_size: int = 1_000, list_id: int = DEFAULT_LIST_ID) -> tuple[int, int]:
+    """docstring for helper function - raises ImportRowError (nothing imported) on the first invalid row; returns (rows imported, new list version)"""
+    rows: Iterator[ImportRow] = parse_csv(lines) if file_type == 'csv' else parse_ndjson(lines)
+    try:
+        return Todos.bulk_import(rows, batch_size, list_id)
+    except UnicodeDecodeError as e:
+        raise ImportRowError(0, 'input is not valid UTF-8') from e
@@ -6,16 +6,33 @@ This module implements URL route configuration for the Django app
 """
 
 from django.urls import path
-from . import views
+from . import async_views, views
 
 # URL Configuration
 urlpatterns = [
     path('', views.root_path, name='root_path'),  # /
     path('setCSRFtokenAsCookie', views.SetCsrfTokenAsCookie.as_view()),  # /api/setCSRFtokenAsCookie
     path('allTodos', views.GetAllTodos.as_view()),  # /api/allTodos
+    path('searchTodos', views.SearchTodos.as_view()),  # /api/searchTodos?q=milk
+    path('cacheStats', views.GetCacheStats.as_view()),  # /api/cacheStats
+    path('poolStats', views.GetPoolStats.as_view()),  # /api/poolStats
+    path('metrics', views.metrics_endpoint),  # /metrics (Prometheus scrape target, also at /api/metrics)
     path('addNewTask', views.AddNewTask.as_view()),  # /api/addNewTask
     path('updateTodoStatus/<int:id_to_update>', views.UpdateTodoStatus.as_view()),  # /api/updateTodoStatus/4
     path('updateSortingOrderPostDnD', views.UpdateSortingOrderPostDnD.as_view()),  # /api/updateSortingOrderPostDnD
+    path('moveTodo/<int:id_to_move>', views.MoveTodo.as_view()),  # /api/moveTodo/4
     path('deleteTodo/<int:id_to_delete>', views.DeleteSingleTodo.as_view()),  # /api/deleteTodo/3
+    path('batch', views.BatchTodos.as_view()),  # /api/batch
+    path('exportTodos', views.ExportTodos.as_view()),  # /api/exportTodos?type=ndjson|csv
+    path('importTodos', views.ImportTodos.as_view()),  # /api/importTodos?type=ndjson|csv
     path('deleteAllCompletedTodos', views.DeleteAllCompletedTodos.as_view()),  # /api/deleteAllCompletedTodos
+    path('events', async_views.events),  # /api/events (Server-Sent Events change feed, async)
+    # Native async versions of the above (run under an ASGI server, see async_views.py)
+    path('async/allTodos', async_views.all_todos),  # /api/async/allTodos
+    path('async/addNewTask', async_views.add_new_task),  # /api/async/addNewTask
+    path('async/updateTodoStatus/<int:id_to_update>', async_views.update_todo_status),  # /api/async/updateTodoStatus/4
+    path('async/updateSortingOrderPostDnD', async_views.update_sorting_order_post_dnd),  # /api/async/updateSortingOrderPostDnD
+    path('async/moveTodo/<int:id_to_move>', async_views.move_todo),  # /api/async/moveTodo/4
+    path('async/deleteTodo/<int:id_to_delete>', async_views.delete_single_todo),  # /api/async/deleteTodo/3
+    path('async/deleteAllCompletedTodos', async_views.delete_all_completed_todos),  # /api/async/deleteAllCompletedTodos
 ]
@@ -7,23 +7,33 @@ It includes handlers for GET, POST, PUT, PATCH and DELETE requests
 It incorporates Django REST Framework, Django's ORM (built-in), auto-reload (built-in), type checking (mypy) and linting (pylint)
 """
 
-import psycopg2  # python3 -m pip install psycopg2-binary (must activate venv first) -- https://www.psycopg.org/docs/install.html
-from django.shortcuts import render, get_object_or_404  # render can be imported to render dynamic HTML templates
-from django.views.static import serve
-from django.http import FileResponse
+from typing import Any, Callable
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.conf import settings
 from django.middleware.csrf import get_token
-from django.db.models import QuerySet, Max
-from django.utils import timezone
+from django.db import IntegrityError
+from django.db.models import QuerySet
+from django.http import Http404
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
 from rest_framework.views import APIView  # type: ignore
 from rest_framework.request import Request  # type: ignore
 from rest_framework.response import Response  # type: ignore
 from rest_framework import status  # type: ignore
-from rest_framework.exceptions import ValidationError  # type: ignore
-from django_basic_server import initiate_django_server  # import server function to initiate Django server (based on environment)
+from rest_framework.exceptions import ParseError, ValidationError  # type: ignore
+from rest_framework.renderers import JSONRenderer  # type: ignore
 from django_app.serializers import TodosSerializer
-from django_app.models import Todos, ToDoType
+from django_app.models import DEFAULT_LIST_ID, Todos, TodosListVersion, ToDoType, TodosDelta, is_integer, sorted_todos_error
+from django_app.renderers import COLUMNAR_CONTENT_TYPE, MSGPACK_CONTENT_TYPE, accepted_media_types, camel_case_rows, dumps, msgpack, render_camel_case_list, render_columnar_list, render_msgpack_list
+from django_app.pagination import InvalidCursor, StaleCursor, keyset_page, parse_limit
 from django_app import serializers
+from django_app import cache as todos_cache
+from django_app.db_pool import pool_stats
+from django_app.metrics import render_prometheus, serializer_timer
+from django_app.batch import BatchError, apply_batch, validate_operations
+from django_app.index_shell import index_shell
+from django_app.static_assets import serve_static_asset
+from django_app.transfer import CONTENT_TYPES, ImportRowError, file_type_for, import_lines, stream_export
 
 # ----------
 
@@ -33,19 +43,31 @@ from django_app import serializers
 
 # ----------
 
-initiate_django_server()  # invoke Django server function (sets up configuration based on dev/production environment variable)
+# Note: the dev / production banner (initiate_django_server) is printed by 'manage.py runserver', not at import time -- importing views has no side effects (see 'manage.py startup_profile')
 
 # Create your views here.
-def root_path(request: Request) -> Response:
-    """GET method for ROOT path to render index.html"""
-    return render(request, 'index.html')
+def root_path(request: Request) -> HttpResponse:
+    """GET method for ROOT path (& every unmatched URL via the catch-all route) -- index.html rendered once, served from memory w/ an ETag & re-rendered when a new build rewrites it (see index_shell.py)"""
+    body, etag = index_shell.get()
+    if etag_matches(request, etag):
+        response: HttpResponse = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='text/html; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'  # always revalidate (a cheap 304), so a new build's asset names are picked up right away
+    return response
 
-def serve_production_file(request: Request, filename: str) -> FileResponse:
-    """GET method for serving production files (e.g. index.js, index.css, 2 .jpgs)"""
-    return serve(request, filename, settings.STATIC_ROOT)
+def serve_production_file(request: Request, filename: str) -> HttpResponse:
+    """GET method for serving production files (e.g. index.js, index.css, 2 .jpgs) -- precompressed variant per Accept-Encoding, immutable caching for hashed names, sendfile-backed FileResponse (see static_assets.py)"""
+    return serve_static_asset(request, settings.STATIC_ROOT, filename)
 
 # --------- HELPER FUNCTIONS ---------
 
+# If-None-Match uses the WEAK comparison (RFC 9110) -- CompressionMiddleware sends a compressed body's ETag as W/"...", which the client then sends back
+def etag_matches(request: Request | HttpRequest, etag: str) -> bool:
+    """docstring for helper function - also used by the async views"""
+    return any(tag.removeprefix('W/') == etag for tag in parse_etags(request.headers.get('If-None-Match', '')))
+
 # Map frontend field names / keys onto PostgreSQL field names / keys so response object is compatible w/ backend expectations
 # Alternatively, could add 'djangorestframework_camel_case.parser.CamelCaseJSONParser' to 'DEFAULT_PARSER_CLASSES' to convert keys from camelCase to snake_case (& vice-versa)
 # https://github.com/vbabiy/djangorestframework-camel-case
@@ -59,14 +81,186 @@ def map_todo_keys_for_backend(todo: ToDoType) -> ToDoType:
         }
     return backend_todo
 
-# Helper function to fetch all tasks from DB, sort by rank, serialize & return results (used by various HTTP methods below)
-def fetch_sort_then_serialize_response() -> Response:
+# Clients pick the list they work on via 'X-Todo-List: 42' header OR '?list=42' query param (list 1, the original single list, when neither is sent)
+def list_id_for(request: Request | HttpRequest) -> int:
+    """docstring for helper function - also used by the async views; raises DRF's ParseError (400) for anything but a positive integer"""
+    raw_list_id: str = request.headers.get('X-Todo-List', '') or request.GET.get('list', '')
+    if not raw_list_id:
+        return DEFAULT_LIST_ID
+    if not raw_list_id.isdigit() or int(raw_list_id) < 1:
+        raise ParseError('list must be a positive integer')
+    return int(raw_list_id)
+
+# moveTodo body: {"beforeId": 3 | null, "afterId": 7 | null} -- the new neighbours' ids (null / absent at either end of the list)
+def move_neighbour_ids(data: Any) -> tuple[int | None, int | None]:
+    """docstring for helper function - also used by the async views; raises DRF's ValidationError (400) unless both are an integer or null"""
+    if not isinstance(data, dict):
+        raise ValidationError({'beforeId': ['Expected an object w/ beforeId / afterId.']})
+    neighbour_ids: list[int | None] = []
+    for key in ('beforeId', 'afterId'):
+        value: Any = data.get(key)
+        if value is not None and not is_integer(value):
+            raise ValidationError({key: ['Must be an integer or null.']})
+        neighbour_ids.append(value)
+    return neighbour_ids[0], neighbour_ids[1]
+
+# Helper function to fetch all tasks of a list from DB, sort by rank & serialize to JSON bytes (only runs on a cache miss, see below)
+def render_sorted_list(list_id: int = DEFAULT_LIST_ID) -> bytes:
     """docstring for helper function"""
-    results: QuerySet = Todos.objects.all().order_by('sorted_rank')  # Fetch all tasks from DB & sort by rank
+    results: QuerySet = Todos.in_list(list_id).order_by('sorted_rank', 'id')  # Fetch the list's tasks from DB & sort by rank (id breaks ties) -- one range scan on 'todos_list_rank_idx'
 
     # Serialize the data for the frontend & return (Note: need to convert keys from snake_case to camelCase on frontend)
-    serializer: serializers.TodosSerializer = TodosSerializer(results, many=True)  # 'many' denotes list of objects
-    return Response(serializer.data)
+    with serializer_timer():  # Server-Timing 'ser' / metrics (the lazy query inside counts as DB time, see metrics.py)
+        serializer: serializers.TodosSerializer = TodosSerializer(results, many=True)  # 'many' denotes list of objects
+        return JSONRenderer().render(serializer.data)
+
+# Fast path for the above -- values_list() tuples straight to JSON bytes in the frontend's camelCase shape (no DRF serializer, no client-side key mapping)
+def render_sorted_list_camel_case(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    with serializer_timer():
+        return render_camel_case_list(Todos.in_list(list_id).order_by('sorted_rank', 'id'))
+
+# Column by column (one array per key, see renderers.py) -- JSON or MessagePack
+def render_sorted_list_columnar(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    with serializer_timer():
+        return render_columnar_list(Todos.in_list(list_id).order_by('sorted_rank', 'id'))
+
+def render_sorted_list_msgpack(list_id: int = DEFAULT_LIST_ID) -> bytes:
+    """docstring for helper function"""
+    with serializer_timer():
+        return render_msgpack_list(Todos.in_list(list_id).order_by('sorted_rank', 'id'))
+
+# Clients opt into the fast camelCase renderer via 'X-Response-Shape: camel' header OR '?shape=camel' query param (snake_case DRF output remains the default)
+def wants_camel_case(request: Request | HttpRequest) -> bool:
+    """docstring for helper function - also used by the async views (plain Django HttpRequest, hence request.GET rather than DRF's query_params alias)"""
+    header_shape: str = request.headers.get('X-Response-Shape', '')
+    query_shape: str = request.GET.get('shape', '')
+    return 'camel' in (header_shape.lower(), query_shape.lower())
+
+# Representations of the full list: name (also its cache variant & ETag suffix) --> (renderer, Content-Type)
+# 'full' (DRF snake_case rows, the default) & 'camel' (see wants_camel_case) are JSON arrays of rows; 'columnar' & 'msgpack' are picked via 'Accept' (see list_representation)
+LIST_REPRESENTATIONS: dict[str, tuple[Callable[[int], bytes], str]] = {
+    'full': (render_sorted_list, 'application/json'),
+    'camel': (render_sorted_list_camel_case, 'application/json'),
+    'columnar': (render_sorted_list_columnar, COLUMNAR_CONTENT_TYPE),
+    'msgpack': (render_sorted_list_msgpack, MSGPACK_CONTENT_TYPE),
+}
+ACCEPTED_LIST_REPRESENTATIONS: dict[str, str] = {COLUMNAR_CONTENT_TYPE: 'columnar', MSGPACK_CONTENT_TYPE: 'msgpack', 'application/x-msgpack': 'msgpack', 'application/vnd.msgpack': 'msgpack'}
+
+def json_representation(request: Request | HttpRequest) -> str:
+    """docstring for helper function - 'camel' or 'full' (e.g. for a list spliced into another JSON body)"""
+    return 'camel' if wants_camel_case(request) else 'full'
+
+def list_representation(request: Request | HttpRequest) -> str:
+    """docstring for helper function - also used by the async views; the client's most preferred type we can send, JSON (camel / full) for anything else -- never a 406"""
+    for media_type in accepted_media_types(request.headers.get('Accept', '')):
+        representation: str | None = ACCEPTED_LIST_REPRESENTATIONS.get(media_type)
+        if representation == 'msgpack' and msgpack is None:
+            continue  # optional dependency not installed
+        if representation is not None:
+            return representation
+        if media_type in ('application/json', 'application/*', '*/*', 'text/html'):
+            break  # JSON (or the browsable API) preferred over the compact types
+    return json_representation(request)
+
+def list_etag(version: int, representation: str) -> str:
+    """docstring for helper function - each representation of the same URL needs its own strong ETag (a bare version for the default)"""
+    return quote_etag(str(version) if representation == 'full' else f'{version}-{representation}')
+
+# Helper function to return the full sorted list (used by various HTTP methods below) -- served from the read-through cache keyed by list version, so the query + serializer only run once per version
+def render_list_body(version: int | None, representation: str, list_id: int) -> bytes:
+    """docstring for helper function - the list rendered as 'representation' for 'version' (current version if None), from the cache or rendered & stored on a miss"""
+    if version is None:
+        version = TodosListVersion.current(list_id)
+    render, _ = LIST_REPRESENTATIONS[representation]
+    return todos_cache.get_or_render(list_id, version, representation, lambda: render(list_id))
+
+def fetch_sort_then_serialize_response(version: int | None = None, representation: str = 'full', list_id: int = DEFAULT_LIST_ID) -> HttpResponse:
+    """docstring for helper function"""
+    return HttpResponse(render_list_body(version, representation, list_id), content_type=LIST_REPRESENTATIONS[representation][1])
+
+# Server-side status filters for /api/allTodos?status=... (each backed by a partial index on (list_id, sorted_rank, id), see models.py)
+STATUS_FILTERS: dict[str, bool] = {'active': False, 'completed': True}
+
+# Helper function for the opt-in query params on /api/allTodos -- filters by status in SQL (?status=active|completed) and/or returns ONE page of tasks (keyset pagination on sorted_rank / id, ?limit=100[&cursor=...])
+# Responds w/ an envelope: 'results', plus 'next' (cursor for the next page, null on the last page) when paginated & 'counts' (active / completed totals of the whole list) when filtered
+def fetch_page_then_serialize_response(request: Request, list_id: int = DEFAULT_LIST_ID, queryset: QuerySet | None = None, always_paginate: bool = False) -> HttpResponse:
+    """docstring for helper function - 'queryset' narrows the list (e.g. search matches, which then get no 'counts'); 'always_paginate' pages even w/o limit / cursor params"""
+    with_counts: bool = queryset is None
+    if queryset is None:
+        queryset = Todos.in_list(list_id)
+    status_filter: str | None = request.query_params.get('status')
+    if status_filter is not None:
+        if status_filter not in STATUS_FILTERS:
+            return Response({"error": f"status must be one of {sorted(STATUS_FILTERS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(status_complete=STATUS_FILTERS[status_filter])
+
+    body: dict = {}
+    if always_paginate or 'limit' in request.query_params or 'cursor' in request.query_params:
+        try:
+            limit: int = parse_limit(request.query_params.get('limit', ''))
+            rows, body['next'] = keyset_page(queryset, limit, request.query_params.get('cursor'), list_id)
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except StaleCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+    else:
+        rows = queryset.order_by('sorted_rank', 'id')
+
+    if status_filter is not None and with_counts:
+        body['counts'] = Todos.status_counts(list_id)
+    with serializer_timer():
+        if wants_camel_case(request):
+            body['results'] = camel_case_rows(rows)
+            return HttpResponse(dumps(body), content_type='application/json')
+        serializer: serializers.TodosSerializer = TodosSerializer(rows, many=True)
+        body['results'] = serializer.data
+    return Response(body)
+
+# Clients opt into 'delta' responses for write endpoints via 'X-Response-Mode: delta' header OR '?response=delta' query param (full list remains the default for older clients)
+def wants_delta_response(request: Request | HttpRequest) -> bool:
+    """docstring for helper function - also used by the async views"""
+    header_mode: str = request.headers.get('X-Response-Mode', '')
+    query_mode: str = request.GET.get('response', '')
+    return 'delta' in (header_mode.lower(), query_mode.lower())
+
+# Helper function to respond to a write w/ EITHER only the rows it created / changed / deleted + the new list version (delta mode) OR the full sorted list (default)
+def delta_or_full_list_response(request: Request, delta: TodosDelta, extra: dict[str, Any] | None = None) -> HttpResponse:
+    """docstring for helper function - 'extra' keys are added to the delta body (e.g. 'deletedCount')"""
+    if not wants_delta_response(request):
+        return fetch_sort_then_serialize_response(delta.version, list_representation(request), delta.list_id)  # renders the list for the new version once & writes it through to the cache for the next reader
+    with serializer_timer():
+        if wants_camel_case(request):
+            return HttpResponse(dumps({
+                'version': delta.version,
+                'created': camel_case_rows(delta.created),
+                'updated': camel_case_rows(delta.updated),
+                'deleted': delta.deleted,
+                **(extra or {}),
+            }), content_type='application/json')
+        return Response({
+            'version': delta.version,
+            'created': TodosSerializer(delta.created, many=True).data,
+            'updated': TodosSerializer(delta.updated, many=True).data,
+            'deleted': delta.deleted,
+            **(extra or {}),
+        })
+
+# Opt-in chunked mode for 'Clear Completed' -- /api/deleteAllCompletedTodos?chunkSize=5000 deletes in short transactions of at most that many rows (see Todos.delete_all_completed)
+MAX_DELETE_CHUNK_SIZE = 50_000
+
+def parse_chunk_size(raw_chunk_size: str | None) -> int | None:
+    """docstring for helper function - None (one statement) if not given; raises ValueError if not a positive integer"""
+    if not raw_chunk_size:
+        return None
+    try:
+        chunk_size = int(raw_chunk_size)
+    except ValueError as e:
+        raise ValueError('chunkSize must be an integer') from e
+    if chunk_size < 1:
+        raise ValueError('chunkSize must be at least 1')
+    return min(chunk_size, MAX_DELETE_CHUNK_SIZE)
 
 # --------- HTTP METHODS & ASSOCIATED DJANGO ORM QUERIES ---------
 
@@ -84,88 +278,225 @@ class SetCsrfTokenAsCookie(APIView):  # class inherits the APIView class
 # GET
 # /api/allTodos
 class GetAllTodos(APIView):
+    """GET method using Django REST Framework APIView class"""
+    def get(self, request: Request) -> HttpResponse:
+        """GET method"""
+        # Conditional GET -- the list version is bumped by every write (in the same transaction), so it doubles as a strong ETag
+        # Read BEFORE the rows: if a write commits in between, the body is newer than the tag & the next poll just gets a 200 (never a stale 304)
+        list_id: int = list_id_for(request)
+        version: int = TodosListVersion.current(list_id)
+        paged: bool = bool({'limit', 'cursor', 'status'} & set(request.query_params))  # opt-in status filter / keyset pagination -- /api/allTodos?status=active&limit=100[&cursor=...]
+        representation: str = json_representation(request) if paged else list_representation(request)  # the ETag names what is actually sent -- the page envelope is always JSON
+        etag: str = list_etag(version, representation)
+        if etag_matches(request, etag):
+            response: HttpResponse = Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag, 'Cache-Control': 'no-cache'})  # unchanged -- no todos rows read, no serializer run
+        elif paged:
+            response = fetch_page_then_serialize_response(request, list_id)
+        else:
+            response = fetch_sort_then_serialize_response(version, representation, list_id)  # Invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results (or serve them from cache)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'no-cache'  # browsers may keep the body, but must revalidate w/ If-None-Match on every poll
+        patch_vary_headers(response, ['Accept', 'X-Response-Shape', 'X-Todo-List'])  # the ETag is a per-list version, so the list header must key browser caches too
+        return response
+
+
+# GET
+# /api/searchTodos?q=milk[&status=active|completed][&limit=100][&cursor=...] -- case-insensitive substring search over task text (indexed, see Todos.search), matches in list order
+# ALWAYS paginated (keyset, same cursors as /api/allTodos) -- a short query can match most of the list
+class SearchTodos(APIView):
+    """GET method using Django REST Framework APIView class"""
+    def get(self, request: Request) -> HttpResponse:
+        """GET method"""
+        query: str = request.query_params.get('q', '').strip()
+        max_length: int = Todos._meta.get_field('task').max_length  # pylint: disable=protected-access
+        if not query or len(query) > max_length:
+            return Response({"error": f"'q' must be 1 to {max_length} characters"}, status=status.HTTP_400_BAD_REQUEST)
+        list_id: int = list_id_for(request)
+        return fetch_page_then_serialize_response(request, list_id, Todos.search(query, list_id), always_paginate=True)
+
+
+# GET
+# /api/cacheStats -- hit / miss counters for the todos list cache (this worker process only)
+class GetCacheStats(APIView):
     """GET method using Django REST Framework APIView class"""
     # pylint: disable=unused-argument
     def get(self, request: Request) -> Response:
         """GET method"""
-        return fetch_sort_then_serialize_response()  # Invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results
+        return Response(todos_cache.stats())
+
+
+# GET
+# /metrics -- request histograms in Prometheus text format (this worker process only; scrape each worker, or aggregate upstream)
+# pylint: disable=unused-argument
+def metrics_endpoint(request: HttpRequest) -> HttpResponse:
+    """GET method - plain Django view (no DRF content negotiation / renderers involved)"""
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# GET
+# /api/poolStats -- database connection pool stats (this worker process only), plus one entry per read replica if configured
+class GetPoolStats(APIView):
+    """GET method using Django REST Framework APIView class"""
+    # pylint: disable=unused-argument
+    def get(self, request: Request) -> Response:
+        """GET method"""
+        stats: dict[str, Any] = pool_stats()
+        if settings.DATABASE_REPLICAS:
+            stats['replicas'] = {alias: pool_stats(alias) for alias in settings.DATABASE_REPLICAS}
+        return Response(stats)
+
+
+# GET
+# /api/exportTodos?type=ndjson|csv -- every task of the list in list order, streamed (constant memory however many rows, see transfer.py)
+# Note: '?type=' rather than DRF's reserved '?format=' / an 'Accept: text/csv' header, which DRF would answer w/ a 404 / its default JSON renderer (see renderers.LenientContentNegotiation)
+class ExportTodos(APIView):
+    """GET method using Django REST Framework APIView class"""
+    def get(self, request: Request) -> HttpResponse:
+        """GET method"""
+        file_type: str = request.query_params.get('type', 'ndjson')
+        if file_type not in CONTENT_TYPES:
+            return Response({"error": "'type' must be 'ndjson' or 'csv'"}, status=status.HTTP_400_BAD_REQUEST)
+        list_id: int = list_id_for(request)
+        response = StreamingHttpResponse(stream_export(file_type, list_id=list_id), content_type=CONTENT_TYPES[file_type])
+        response['Content-Disposition'] = f'attachment; filename="todos-{list_id}.{file_type}"'
+        return response
 
 
 # POST
 # /api/addNewTask
 class AddNewTask(APIView):
     """POST method using Django REST Framework APIView class"""
-    def post(self, request: Request) -> Response:
+    def post(self, request: Request) -> HttpResponse:
         """POST method"""
         backend_todo: ToDoType = map_todo_keys_for_backend(request.data.get('newTaskToAdd'))  # map frontend todo keys to backend format so compatible (camelCase --> snake_case)
+        client_temp_id: int | None = backend_todo['id'] if isinstance(backend_todo['id'], int) and backend_todo['id'] < 0 else None  # negative id = client's temp id for this task (lets a later DnD payload refer to it before the client has the server id)
 
         serializer = TodosSerializer(data=backend_todo)
         if serializer.is_valid():
-            max_sorted_rank = Todos.objects.aggregate(Max('sorted_rank'))['sorted_rank__max'] or 0  # fetch max sorted_rank value from DB (increment by +1 for new task below)
             validated_data = serializer.validated_data.copy()  # create copy of validated_data
             validated_data.pop('sorted_rank', None)  # remove 'sorted_rank' from the copy to avoid duplicate key error when attempting to .create()
             try:
-                Todos.objects.create(sorted_rank=max_sorted_rank + 1, **validated_data)  # modify sorted_rank & unpack amended validated_data (sans sorted_rank) into create method
-            except psycopg2.IntegrityError as e:
+                delta: TodosDelta = Todos.add_new_task(validated_data, client_temp_id, list_id_for(request))  # assigns next sorted_rank & creates task w/ amended validated_data (sans sorted_rank)
+            except IntegrityError as e:  # Django re-raises driver errors as django.db.IntegrityError (psycopg2.IntegrityError would never be caught here)
                 return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            return fetch_sort_then_serialize_response()  # invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results
+            return delta_or_full_list_response(request, delta)  # invoke above helper function to return only the new row (delta mode) OR the full sorted list
         return ValidationError(serializer.errors)  # return error if serializer is not valid
 
 
+# POST
+# /api/batch -- body {"operations": [{"op": "add", "task": ..., "tempId": -1}, {"op": "toggle", "id": -1}, {"op": "delete", "id": 3}, ...]}, applied in order & all-or-nothing
+class BatchTodos(APIView):
+    """POST method using Django REST Framework APIView class"""
+    def post(self, request: Request) -> HttpResponse:
+        """POST method"""
+        try:
+            operations = validate_operations(request.data.get('operations'))
+            results, delta = apply_batch(operations, list_id_for(request))  # one transaction & one list version bump for the whole batch
+        except BatchError as e:
+            return Response({"error": str(e), "index": e.index}, status=e.status_code)  # nothing was applied -- 'index' is the failing operation (-1 = the batch itself)
+
+        if wants_delta_response(request):  # per-op results + the net delta of the batch
+            rows = camel_case_rows if wants_camel_case(request) else lambda todos: TodosSerializer(todos, many=True).data
+            return HttpResponse(dumps({
+                'results': results,
+                'version': delta.version,
+                'created': rows(delta.created),
+                'updated': rows(delta.updated),
+                'deleted': delta.deleted,
+            }), content_type='application/json')
+        list_body: bytes = render_list_body(delta.version, json_representation(request), delta.list_id)
+        return HttpResponse(dumps({'results': results, 'version': delta.version})[:-1] + b',"todos":' + list_body + b'}', content_type='application/json')  # splice the (cached) rendered list in, rather than decoding & re-encoding it
+
+
+# POST
+# /api/importTodos[?type=ndjson|csv] -- raw NDJSON / CSV request body (type from '?type=' or the Content-Type), appended to the end of the list in file order & all-or-nothing
+# The body is read line by line from the request stream & inserted in batches -- never loaded into memory as a whole (request.data is deliberately not touched)
+class ImportTodos(APIView):
+    """POST method using Django REST Framework APIView class"""
+    def post(self, request: Request) -> Response:
+        """POST method"""
+        file_type: str = request.query_params.get('type') or file_type_for(None, request.content_type or '')
+        if file_type not in CONTENT_TYPES:
+            return Response({"error": "'type' must be 'ndjson' or 'csv'"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.stream is None:  # no body (or no Content-Length)
+            return Response({"error": "No rows to import"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            imported, version = import_lines(request.stream, file_type, list_id=list_id_for(request))
+        except ImportRowError as e:
+            return Response({"error": str(e), "line": e.line}, status=status.HTTP_400_BAD_REQUEST)  # nothing was imported
+        return Response({"imported": imported, "version": version})
+
+
 # PATCH
 # /api/updateSortingOrderPostDnD
 class UpdateSortingOrderPostDnD(APIView):
     """PATCH method using Django REST Framework APIView class"""
-    # pylint: disable=unused-argument
-    def patch(self, request: Request) -> Response:
+    def patch(self, request: Request) -> HttpResponse:
         """PATCH method"""
-        reordered_data: list[ToDoType] = request.data['toDosArrayFull']  # grab body sent from frontend request
-        Todos.update_sorted_rank(reordered_data)  # update values in DB, if data is valid
+        reordered_data: Any = request.data.get('toDosArrayFull') if isinstance(request.data, dict) else None  # grab body sent from frontend request
+        if error := sorted_todos_error(reordered_data):
+            raise ValidationError({'toDosArrayFull': [error]})  # 400 -- same check as the batch 'reorder' operation
+        delta: TodosDelta = Todos.update_sorted_rank(reordered_data, list_id_for(request))  # update values in DB, if data is valid
 
-        return fetch_sort_then_serialize_response()  # Invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results
+        return delta_or_full_list_response(request, delta)  # Invoke above helper function to return only the re-ranked rows (delta mode) OR the full sorted list
 
-class UpdateTodoStatus(APIView):
+# PATCH
+# /api/moveTodo/4  -- body: { beforeId: 2 | null, afterId: 7 | null }  (new neighbours directly above / below the moved task, null at either end of the list)
+class MoveTodo(APIView):
     """PATCH method using Django REST Framework APIView class"""
-    # pylint: disable=unused-argument
-    def patch(self, request: Request, id_to_update: int) -> Response:
+    def patch(self, request: Request, id_to_move: int) -> HttpResponse:
         """PATCH method"""
-        task_to_update: Todos = get_object_or_404(Todos, id=id_to_update)  # Get task from the DB
+        before_id, after_id = move_neighbour_ids(request.data)  # 400 for anything but integers / null -- never reaches the ORM
+        try:
+            delta: TodosDelta = Todos.move_todo(id_to_move, before_id, after_id, list_id_for(request))  # writes only the moved row (unless ranks need renormalising)
+        except Todos.DoesNotExist as e:
+            raise Http404('No Todos matches the given query.') from e
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return delta_or_full_list_response(request, delta)  # Invoke above helper function to return only the moved row(s) (delta mode) OR the full sorted list
 
-        # Update task in DB (use update() method for multiple fields)
-        task_to_update.status_complete = not task_to_update.status_complete  # toggle status_complete key field
-        # Make the existing datetime timezone-aware (avoids following CLI error: 'RuntimeWarning: DateTimeField Todos.created_at received a naive datetime (2024-05-29 06:04:16.935156) while time zone support is active.')
-        aware_datetime = timezone.make_aware(task_to_update.created_at, timezone=timezone.get_default_timezone())
-        task_to_update.created_at = aware_datetime  # Set created_at to the timezone-aware datetime
-        task_to_update.save()
+class UpdateTodoStatus(APIView):
+    """PATCH method using Django REST Framework APIView class"""
+    def patch(self, request: Request, id_to_update: int) -> HttpResponse:
+        """PATCH method"""
+        try:
+            delta: TodosDelta = Todos.toggle_status_complete(id_to_update, list_id_for(request))  # toggle status_complete key field w/in DB
+        except Todos.DoesNotExist as e:
+            raise Http404('No Todos matches the given query.') from e
 
-        return fetch_sort_then_serialize_response()  # Invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results
+        return delta_or_full_list_response(request, delta)  # Invoke above helper function to return only the changed row (delta mode) OR the full sorted list
 
 
 # DELETE
 # /api/api/deleteTodo/3
 class DeleteSingleTodo(APIView):
     """DELETE method using Django REST Framework APIView class"""
-    # pylint: disable=unused-argument
-    def delete(self, request: Request, id_to_delete: int) -> Response:
+    def delete(self, request: Request, id_to_delete: int) -> HttpResponse:
         """DELETE method"""
-        task_to_delete = get_object_or_404(Todos, id=id_to_delete)  # Get task from the DB
-        task_to_delete.delete()  # Delete task from DB
+        try:
+            delta: TodosDelta = Todos.delete_single_todo(id_to_delete, list_id_for(request))  # Delete task from DB
+        except Todos.DoesNotExist as e:
+            raise Http404('No Todos matches the given query.') from e
 
-        return fetch_sort_then_serialize_response()  # Invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results
+        return delta_or_full_list_response(request, delta)  # Invoke above helper function to return only the deleted id (delta mode) OR the full sorted list
 
 # /api/api/deleteAllCompletedTodos
 class DeleteAllCompletedTodos(APIView):
     """DELETE method using Django REST Framework APIView class"""
-    # pylint: disable=unused-argument
-    def delete(self, request: Request) -> Response:
+    def delete(self, request: Request) -> HttpResponse:
         """DELETE method"""
-        # Get QuerySet of all completed tasks & delete all objects in the QuerySet
-        queryset: QuerySet = Todos.objects.filter(status_complete=True)
+        try:
+            chunk_size: int | None = parse_chunk_size(request.query_params.get('chunkSize'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Delete all completed tasks w/ one 'DELETE ... RETURNING id' (returns None if there were none)
+        delta: TodosDelta | None = Todos.delete_all_completed(chunk_size, list_id_for(request))
 
         # Error handle in case of no tasks to delete
-        if not queryset.exists():
+        if delta is None:
             return Response({"error": "No tasks to delete"}, status=status.HTTP_400_BAD_REQUEST)
 
-        queryset.delete()
-
-        return fetch_sort_then_serialize_response()  # Invoke above helper function to fetch all tasks from DB, sort by rank, serialize & return results
+        return delta_or_full_list_response(request, delta, {'deletedCount': len(delta.deleted)})  # Invoke above helper function to return only the deleted ids & their count (delta mode) OR the full sorted list
@@ -13,7 +13,7 @@ import os
 # npm run SERVER ---------> "server": "python3 server/manage.py runserver $npm_package_config_proxy_server_port",
 # npm run DEV ------------> "dev": "PYTHON_ENV=development npm-run-all -p -r server client",  .....  INITIAL COMMAND WAS AS FOLLOWS, but needed to revise / add in 'npm-run-all' since Vite client app loaded faster than Python server, omitting data onload --> "PYTHON_ENV=development vite & PYTHON_ENV=development npm run server", (see separate client script w/ delay in seconds & server script)
 # npm run BUILD ----------> "tsc && vite build && npm run collectstatic && npm run updatehtmltemplate",  ..... RUN Typescript compiler, then Vite client app build, then collectstatic command (described below), and finally updatehtmltemplate command (described below)
-# npm run COLLECTSTATIC --> "collectstatic": "find server/staticfiles -maxdepth 1 -type f \\( -name '*.js' -o -name '*.css' \\) -delete && python3 server/manage.py collectstatic --noinput",  ..... First delete all .js and .css files in server/staticfiles folder, then run Django's 'collectstatic' command to generate (or refresh) contents in the server/staticfiles folder, sourced from the Vite client app's new bundled build sent to dist/assets folder
+# npm run COLLECTSTATIC --> "collectstatic": "find server/staticfiles -maxdepth 1 -type f \\( -name '*.js' -o -name '*.css' -o -name '*.gz' -o -name '*.br' \\) -delete && python3 server/manage.py collectstatic --noinput",  ..... First delete all .js and .css files in server/staticfiles folder, then run Django's 'collectstatic' command to generate (or refresh) contents in the server/staticfiles folder, sourced from the Vite client app's new bundled build sent to dist/assets folder
 # npm run PREVIEW --------> "preview": "PYTHON_ENV=production npm run server",
 # npm run UPDATEHTMLTEMPLATE --> "updatehtmltemplate": "python3 server/updatehtmltemplate.py",  ..... custom script to auto-update the server/templates/index.html file with the latest, post-build .js and .css dynamically generated file names (injecting these into the static templating to avoid errors in the browser)
 # npm run ESLINT ---------> "eslint": "eslint . --ext ts,tsx --report-unused-disable-directives --max-warnings 0",  ..... static code analysis tool / linter for Typescript (client side in this case)
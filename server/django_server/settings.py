@@ -13,13 +13,21 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+from importlib.util import find_spec
+from typing import Any
+import copy
 import sys
 import os  # used for .env variables
-from dotenv import load_dotenv  # used to import in .env variables -- python3 -m pip install python-dotenv
 
 # ----------
 
-load_dotenv()  # grab environment variables from .env file
+# grab environment variables from .env file (nearest one from this folder upwards, as python-dotenv's own search would find) -- python3 -m pip install python-dotenv
+# Only imported when a .env file exists: deployments that pass real environment variables skip both the import & the search at worker startup
+for dotenv_path in (parent / '.env' for parent in Path(__file__).resolve().parents):
+    if dotenv_path.is_file():
+        from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+        load_dotenv(dotenv_path)
+        break
 
 # grab environment variables from package.json to configure DEBUG / static files
 env = os.getenv('PYTHON_ENV')
@@ -68,7 +76,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_app.middleware.MetricsMiddleware',  # outermost, so wall time covers the whole middleware stack (see 'django_app/metrics.py')
+    'django_app.middleware.CompressionMiddleware',  # gzip / brotli per Accept-Encoding -- inside MetricsMiddleware, so response sizes are the compressed (on the wire) sizes
     'django.middleware.security.SecurityMiddleware',
+    'django_app.middleware.PoolExhaustedMiddleware',  # connection pool timeouts --> 503 w/ Retry-After (see 'django_app/middleware.py')
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -78,7 +89,7 @@ MIDDLEWARE = [
 ]
 
 # Django Debug Toolbar can't be used with tests, so need to add below to exclude it ONLY when running in Python test mode
-if DEBUG and not 'test' in sys.argv:
+if DEBUG and not 'test' in sys.argv and find_spec('debug_toolbar') is not None:  # dev mode only (& only if installed) -- never imported in production
     INSTALLED_APPS += ['debug_toolbar']  # need to add this line once django-debug-toolbar is installed
     MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']  # need to add this line once django-debug-toolbar is installed (after CommonMiddleware)
 
@@ -110,9 +121,9 @@ WSGI_APPLICATION = 'django_server.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
+DATABASES: dict[str, dict[str, Any]] = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'django.db.backends.postgresql',  # works w/ psycopg2 OR psycopg 3 (the old 'postgresql_psycopg2' alias no longer exists in Django 5)
         'NAME': db_name,
         'USER': db_user,
         'PASSWORD': db_password,
@@ -121,6 +132,69 @@ DATABASES = {
     }
 }
 
+# Connection reuse (stats at /api/poolStats, see 'django_app/db_pool.py')
+# DB_POOL=true --> psycopg 3 connection pool (Django >= 5.1 & python3 -m pip install "psycopg[binary,pool]"): bounded min / max size, max connection lifetime, health check on every checkout & a SHORT checkout timeout, so an exhausted pool fails fast (503) instead of queueing requests
+# Otherwise --> a fresh connection per request (Django's default), or w/ DB_CONN_MAX_AGE=60 persistent connections (one per worker thread, re-used for up to that many seconds & health-checked before re-use)
+# DB_CONN_MAX_AGE is for WSGI workers only -- under ASGI (uvicorn, see async_views.py) every request runs in its own thread context, so persistent connections pile up instead of being re-used: leave it at 0 & use DB_POOL there
+if os.getenv('DB_POOL', '').lower() in ('1', 'true', 'yes'):
+    from psycopg_pool import ConnectionPool  # pylint: disable=import-outside-toplevel  # optional dependency, only needed in pool mode
+
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),  # seconds -- connections are recycled after this long
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),  # seconds -- idle connections above min_size are closed after this long
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '2')),  # seconds a request may wait for a free connection before failing (psycopg's default is 30)
+            'max_waiting': int(os.getenv('DB_POOL_MAX_WAITING', '20')),  # requests queued for a connection beyond this fail immediately
+            'check': ConnectionPool.check_connection,  # health check on checkout (broken connections are replaced, not handed out)
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '0'))  # seconds (0 = new connection per request)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replicas (see 'django_app/db_router.py') -- DB_REPLICA_HOSTS=host1,host2:5433 adds one alias per replica ('replica_1', 'replica_2', ...) w/ the primary's name, user, password & connection settings
+# Safe reads go to a replica, writes & in-transaction reads to 'default'; after a write, that client's reads stay on the primary for READ_YOUR_WRITES_SECONDS (cookie)
+# Local testing: DB_REPLICA_HOSTS=localhost --> a second alias standing in for the replica, on the same server as the primary
+DATABASE_REPLICAS: list[str] = []
+for replica_number, replica_host in enumerate((host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()), start=1):
+    replica_hostname, _, replica_port = replica_host.partition(':')
+    DATABASES[f'replica_{replica_number}'] = {
+        **copy.deepcopy(DATABASES['default']),  # own copy of the pool options -- each alias gets its own pool
+        'HOST': replica_hostname,
+        'PORT': replica_port or db_port,
+        'TEST': {'MIRROR': 'default'},  # tests read the test database through the replica alias instead of creating another one
+    }
+    DATABASE_REPLICAS.append(f'replica_{replica_number}')
+if 'test' in sys.argv and not DATABASE_REPLICAS:  # tests: 2 aliases (not routed to unless a test enables them) standing in for replicas of the test database
+    for test_replica in ('replica', 'replica_2'):
+        DATABASES[test_replica] = {**copy.deepcopy(DATABASES['default']), 'TEST': {'MIRROR': 'default'}}
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))  # should comfortably exceed the replicas' usual lag
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['django_app.db_router.PrimaryReplicaRouter']
+    MIDDLEWARE.insert(1, 'django_app.db_router.ReadYourWritesMiddleware')  # right after MetricsMiddleware, so it wraps every later middleware's queries too
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# 'todos' alias holds the rendered todos list keyed by list version (see 'django_app/cache.py') -- locmem (per process) by default, point TODOS_CACHE_BACKEND / TODOS_CACHE_LOCATION at a shared backend (e.g. 'django.core.cache.backends.redis.RedisCache' / 'redis://127.0.0.1:6379') to share entries across workers
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'todos': {
+        'BACKEND': os.getenv('TODOS_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('TODOS_CACHE_LOCATION', 'todos-list'),
+        'TIMEOUT': int(os.getenv('TODOS_CACHE_TIMEOUT', '300')),  # seconds -- old versions are never read again, so this only bounds how long they occupy memory
+    },
+}
+
+# Test DB rolls back between tests (re-using list version numbers w/ different rows), so don't cache across tests -- cache tests opt back in w/ override_settings
+if 'test' in sys.argv:
+    CACHES['todos'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -159,6 +233,20 @@ USE_TZ = True
 STATIC_URL = 'static/'  # URL path to serve static files (e.g., images, CSS, JS) -- http://localhost:3000/static/...
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # run 'python server/manage.py collectstatic' via CLI script for production mode ONLY to copy all static files from the static file directories (defined in STATICFILES_DIRS) to then use for deployment
 STATICFILES_DIRS = [os.path.join(BASE_DIR, '../dist/assets')]  # folder bundle from which to source static files (e.g., images, CSS, JS), created by Vite
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django_app.static_assets.CompressedStaticFilesStorage'},  # collectstatic also writes .gz (& .br, if 'brotli' is installed) variants of .js / .css / .svg etc., picked per Accept-Encoding by 'serve_production_file' (see django_app/static_assets.py)
+}
+
+
+# Django REST Framework
+# An 'Accept' header no renderer matches gets the default renderer, not a 406 -- e.g. 'Accept: application/msgpack', which /api/allTodos answers itself (see 'list_representation' in views.py) & every other endpoint w/ JSON
+REST_FRAMEWORK: dict[str, Any] = {
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'django_app.renderers.LenientContentNegotiation',
+}
+# Production: JSON responses only -- the Browsable API renderer (HTML templates, forms) is a dev tool & would otherwise be loaded by the first request of every worker
+if not DEBUG:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['rest_framework.renderers.JSONRenderer']
 
 
 # Cookies configuration (see 'views.py' for setting of cookie)
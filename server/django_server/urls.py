@@ -25,23 +25,25 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('django_app.urls')),  # root path -- include the Django app's URLs
     path('api/', include('django_app.urls')), # this covers all of the /api/ routes
-    path('__debug__/', include('debug_toolbar.urls')), # need to add this line once django-debug-toolbar is installed
 ]
 
+# Dev mode ONLY: django-debug-toolbar (only in INSTALLED_APPS when DEBUG, see settings.py) -- in production the toolbar isn't imported at all
+if 'debug_toolbar' in settings.INSTALLED_APPS:
+    urlpatterns += [path('__debug__/', include('debug_toolbar.urls'))]  # need to add this line once django-debug-toolbar is installed
+
 # ---------
 
 # Production ONLY: Added the following to serve static files in production using 'serve_production_file' view
 # By default Django does NOT handle static files in production (i.e. when DEBUG = False), adding this to override & serve static files in production
 # This pulls in dynamic file names as new builds are generated & file names are dynamically modified w/in the dist/assets folder.  This occurs after running the 'python3 server/manage.py collectstatic' script to generate or refresh the server/staticfiles folder
 # Note:  Ignoring types below to avoid following mypy error --> 'django_server/urls.py:37: error: List item 0 has incompatible type "URLPattern"; expected "URLResolver" [list-item]'
+# Files are served precompressed (gzip / brotli per Accept-Encoding), w/ 'Cache-Control: immutable' for Vite's content-hashed names & sendfile-backed FileResponse bodies (see django_app/static_assets.py)
 if not settings.DEBUG:
     urlpatterns += [
-        # index_js
-        re_path(r'static/(?P<filename>.*\.js)$', serve_production_file), # type: ignore
-        # index_css
-        re_path(r'static/(?P<filename>.*\.css)$', serve_production_file), # type: ignore
-        # 2 .jpg images
-        re_path(r'^assets/(?P<filename>.*\.jpg)$', serve_production_file), # type: ignore
+        # index_js, index_css (+ any other collected file, e.g. .svg icons)
+        re_path(r'^static/(?P<filename>.+)$', serve_production_file), # type: ignore
+        # 2 .jpg images (referenced from index_css as /assets/...)
+        re_path(r'^assets/(?P<filename>.+\.jpg)$', serve_production_file), # type: ignore
     ]
 
 # Add the catch-all route, AFTER the static file routes (dev/production), re-directed to root path
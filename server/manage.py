@@ -16,6 +16,12 @@ def main():
             "available on your PYTHONPATH environment variable? Did you "
             "forget to activate a virtual environment?"
         ) from exc
+    # print the dev / production banner once per 'runserver'
+    # (not in the autoreloader's child process, nor for other commands,
+    # tests or WSGI / ASGI workers)
+    if sys.argv[1:2] == ['runserver'] and os.environ.get('RUN_MAIN') != 'true':
+        from django_basic_server import initiate_django_server  # pylint: disable=import-outside-toplevel
+        initiate_django_server()
     execute_from_command_line(sys.argv)
 
 
@@ -18,15 +18,15 @@ css_files = glob.glob('dist/assets/*.css')
 JS_FILE_NAME = os.path.basename(js_files[0]) if js_files else ''
 CSS_FILE_NAME = os.path.basename(css_files[0]) if css_files else ''
 
-# Open the server/templates/index.html file, read its content & update the .js and .css file names
-with open('server/templates/index.html', 'r+', encoding='utf-8') as file:
+# Read the server/templates/index.html file & update the .js and .css file names
+with open('server/templates/index.html', 'r', encoding='utf-8') as file:
     content = file.read()
 
-    # Replace the old .js and .css file names with the new ones pulled from the freshly updated, post-Vite client app build files placed in the dist/assets directory
-    content = re.sub(r"{% static 'index-.*\.js' %}", "{% static '" + JS_FILE_NAME + "' %}", content)
-    content = re.sub(r"{% static 'index-.*\.css' %}", "{% static '" + CSS_FILE_NAME + "' %}", content)
+# Replace the old .js and .css file names with the new ones pulled from the freshly updated, post-Vite client app build files placed in the dist/assets directory
+content = re.sub(r"{% static 'index-.*\.js' %}", "{% static '" + JS_FILE_NAME + "' %}", content)
+content = re.sub(r"{% static 'index-.*\.css' %}", "{% static '" + CSS_FILE_NAME + "' %}", content)
 
-    # Write the updated content back to the file
-    file.seek(0)
+# Write the updated content to a temp file & swap it in w/ one atomic rename -- a running server re-renders its cached page when the template changes (see server/django_app/index_shell.py) & must never read a half-written file
+with open('server/templates/index.html.tmp', 'w', encoding='utf-8') as file:
     file.write(content)
-    file.truncate()
+os.replace('server/templates/index.html.tmp', 'server/templates/index.html')
@@ -81,7 +81,7 @@ function ToDoListContainer({
       totalTaskCount ? totalTaskCount + 1 : 1
     ); // NOTE: resetting state here does NOT take effect immediately, as there is a lag in incrementing state (hence + 1 below)
     setNewTaskToAdd({
-      id: -1, // temporarily assign -1 as flag as signal on backend to PostgreSQL to re-assign via auto-increment
+      id: -Date.now(), // temporary, unique negative id (signals backend to auto-assign a real id & lets a DnD payload sent before the response refer to this task)
       task: taskInput,
       statusComplete: false,
     });
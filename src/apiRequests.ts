@@ -1,20 +1,29 @@
-import { Dispatch, SetStateAction, useEffect, RefObject } from "react";
+import {
+  Dispatch,
+  SetStateAction,
+  useEffect,
+  useState,
+  RefObject,
+} from "react";
 import axios from "axios";
-import { ToDoType, ToDoTypeBackend, FilteredState } from "../types";
+import {
+  ToDoType,
+  ToDoDeltaBackend,
+  FilteredState,
+} from "../types";
 import { applyFilterToApiResponse } from "./filterLogic";
+import { applyDeltaToToDos } from "./deltaLogic";
 
 // --------
 
-// Map backend Python keys to frontend Typescript key format (snake_case --> camelCase for consistency)
-// Alternatively, could use a library like 'camelcase-keys', 'humps' or 'lodash' to automate this process
-function mapKeysFromBackendToFrontend(toDo: ToDoTypeBackend): ToDoType {
-  return {
-    id: toDo.id,
-    task: toDo.task,
-    statusComplete: toDo.status_complete,
-    newSortedRank: toDo.sorted_rank,
-  };
-}
+// Ask the server for rows already in frontend (camelCase) shape -- fast renderer on the backend & no key-mapping pass needed here
+const CAMEL_CASE_RESPONSE_HEADERS = { "X-Response-Shape": "camel" };
+
+// Write endpoints reply w/ only the rows that changed (+ new list version) when this header is sent, rather than the full list
+const DELTA_RESPONSE_HEADERS = {
+  "X-Response-Mode": "delta",
+  ...CAMEL_CASE_RESPONSE_HEADERS,
+};
 
 // Grab CSRF token from cookie (required for most Django API calls)
 // Match the name argument w/ cookie names in document.cookie, returning the value of the matched cookie.  If no cookie is matched, return null
@@ -49,15 +58,18 @@ export const deleteAllCompletedTodos = async ({
   setItemCount: Dispatch<SetStateAction<number | null>>;
   displayFilter: FilteredState;
 }): Promise<void> => {
-  const apiResponse: ToDoTypeBackend[] = (
-    await axios.delete<ToDoTypeBackend[]>(`/api/deleteAllCompletedTodos`, {
-      data: { toDosArrayFull },
-      headers: { "X-CSRFToken": getCookie("csrftoken") }, // CSRF token header required for non-GET Django API calls
+  const delta: ToDoDeltaBackend = (
+    await axios.delete<ToDoDeltaBackend>(`/api/deleteAllCompletedTodos`, {
+      headers: {
+        "X-CSRFToken": getCookie("csrftoken"), // CSRF token header required for non-GET Django API calls
+        ...DELTA_RESPONSE_HEADERS,
+      },
     })
   )?.data;
-  const mappedApiResponse: ToDoType[] = apiResponse.map(
-    mapKeysFromBackendToFrontend
-  );
+  const mappedApiResponse: ToDoType[] = applyDeltaToToDos({
+    toDosArrayFull,
+    delta,
+  });
   setToDosArrayFull(mappedApiResponse);
   const filteredTasksArray: ToDoType[] = applyFilterToApiResponse({
     displayFilter,
@@ -90,6 +102,7 @@ export const updateSortingOrderPostDnD = async ({
 function ApiRequests({
   setTotalTaskCount,
   setToDosArrayFull,
+  toDosArrayFull,
   setToDosForDisplay,
   setItemCount,
   setNewTaskToAdd,
@@ -127,12 +140,11 @@ function ApiRequests({
         );
       }
 
-      const apiResponse: ToDoTypeBackend[] = (
-        await axios.get<ToDoTypeBackend[]>("/api/allTodos")
+      const mappedApiResponse: ToDoType[] = (
+        await axios.get<ToDoType[]>("/api/allTodos", {
+          headers: CAMEL_CASE_RESPONSE_HEADERS,
+        })
       )?.data;
-      const mappedApiResponse: ToDoType[] = apiResponse.map(
-        mapKeysFromBackendToFrontend
-      );
       setToDosArrayFull(mappedApiResponse);
       setToDosForDisplay(mappedApiResponse);
 
@@ -155,25 +167,77 @@ function ApiRequests({
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []); // on initial page load only
 
+  // CHANGE FEED - changes made in other tabs / by other users arrive as Server-Sent Events (one small delta per write), so the full list is never re-fetched unless the server sends 'reset'
+  const [feedDeltas, setFeedDeltas] = useState<
+    (ToDoDeltaBackend | ToDoType[])[]
+  >([]);
+  useEffect(() => {
+    const eventSource = new EventSource("/api/events"); // reconnects automatically, resuming from the last event id
+    const queueDelta = (event: MessageEvent<string>) => {
+      const delta = JSON.parse(event.data) as ToDoDeltaBackend;
+      setFeedDeltas((queued) => [...queued, delta]); // queued, as several events can arrive before the next render
+    };
+    ["created", "updated", "deleted", "reordered", "changed"].forEach(
+      (eventType) => eventSource.addEventListener(eventType, queueDelta)
+    );
+    eventSource.addEventListener("reset", () => {
+      const refetchAll = async () => {
+        const apiResponse: ToDoType[] = (
+          await axios.get<ToDoType[]>("/api/allTodos", {
+            headers: CAMEL_CASE_RESPONSE_HEADERS,
+          })
+        )?.data;
+        setFeedDeltas((queued) => [...queued, apiResponse]); // a full list replaces the local one
+      };
+      void refetchAll();
+    });
+    return () => eventSource.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  useEffect(() => {
+    if (feedDeltas.length === 0) return; // early exit if no queued events
+    const mappedApiResponse: ToDoType[] = feedDeltas.reduce(
+      (toDos, delta) =>
+        Array.isArray(delta)
+          ? delta
+          : applyDeltaToToDos({ toDosArrayFull: toDos, delta }),
+      toDosArrayFull
+    );
+    setFeedDeltas([]);
+    setToDosArrayFull(mappedApiResponse);
+    const filteredTasksArray: ToDoType[] = applyFilterToApiResponse({
+      displayFilter,
+      apiResponse: mappedApiResponse,
+      setItemCount,
+    });
+    setToDosForDisplay(filteredTasksArray);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [feedDeltas]);
+
   // CREATE
   useEffect(() => {
     if (newTaskToAdd === null) return; // early exit if no new task object is provided
 
     const addNewTask = async () => {
-      const apiResponse: ToDoTypeBackend[] = (
-        await axios.post<ToDoTypeBackend[]>(
+      const delta: ToDoDeltaBackend = (
+        await axios.post<ToDoDeltaBackend>(
           `/api/addNewTask`,
           {
             newTaskToAdd,
           },
           {
-            headers: { "X-CSRFToken": getCookie("csrftoken") },
+            headers: {
+              "X-CSRFToken": getCookie("csrftoken"),
+              ...DELTA_RESPONSE_HEADERS,
+            },
           }
         )
       )?.data;
-      const mappedApiResponse: ToDoType[] = apiResponse.map(
-        mapKeysFromBackendToFrontend
-      );
+      const mappedApiResponse: ToDoType[] = applyDeltaToToDos({
+        toDosArrayFull,
+        delta,
+      });
       setToDosArrayFull(mappedApiResponse);
       setToDosForDisplay(mappedApiResponse);
       const incrementedActiveTaskCount: number = mappedApiResponse.filter(
@@ -193,18 +257,22 @@ function ApiRequests({
     if (idToUpdateStatus === null) return; // early exit if no ID provided to update its status
 
     const updateTaskStatus = async () => {
-      const apiResponse: ToDoTypeBackend[] = (
-        await axios.patch<ToDoTypeBackend[]>(
+      const delta: ToDoDeltaBackend = (
+        await axios.patch<ToDoDeltaBackend>(
           `/api/updateTodoStatus/${idToUpdateStatus}`,
           {}, // data to send with the request (none needed for this PATCH request, but {} required for axios)
           {
-            headers: { "X-CSRFToken": getCookie("csrftoken") },
+            headers: {
+              "X-CSRFToken": getCookie("csrftoken"),
+              ...DELTA_RESPONSE_HEADERS,
+            },
           }
         )
       )?.data;
-      const mappedApiResponse: ToDoType[] = apiResponse.map(
-        mapKeysFromBackendToFrontend
-      );
+      const mappedApiResponse: ToDoType[] = applyDeltaToToDos({
+        toDosArrayFull,
+        delta,
+      });
       setToDosArrayFull(mappedApiResponse);
       const filteredTasksArray: ToDoType[] = applyFilterToApiResponse({
         displayFilter,
@@ -223,14 +291,18 @@ function ApiRequests({
     if (idToDelete === null) return; // early exit if no ID to delete
 
     const deleteTask = async () => {
-      const apiResponse: ToDoTypeBackend[] = (
-        await axios.delete<ToDoTypeBackend[]>(`/api/deleteTodo/${idToDelete}`, {
-          headers: { "X-CSRFToken": getCookie("csrftoken") },
+      const delta: ToDoDeltaBackend = (
+        await axios.delete<ToDoDeltaBackend>(`/api/deleteTodo/${idToDelete}`, {
+          headers: {
+            "X-CSRFToken": getCookie("csrftoken"),
+            ...DELTA_RESPONSE_HEADERS,
+          },
         })
       )?.data;
-      const mappedApiResponse: ToDoType[] = apiResponse.map(
-        mapKeysFromBackendToFrontend
-      );
+      const mappedApiResponse: ToDoType[] = applyDeltaToToDos({
+        toDosArrayFull,
+        delta,
+      });
       setToDosArrayFull(mappedApiResponse);
       const filteredTasksArray: ToDoType[] = applyFilterToApiResponse({
         displayFilter,
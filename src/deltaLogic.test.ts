@@ -0,0 +1,65 @@
+import { ToDoType, ToDoDeltaBackend } from "../types";
+import { applyDeltaToToDos } from "./deltaLogic";
+
+// ---------
+
+const sampleToDosArrayInput: ToDoType[] = [
+  { id: 1, task: "Sample Task 1", statusComplete: false, newSortedRank: 1 },
+  { id: 2, task: "Sample Task 2", statusComplete: false, newSortedRank: 2 },
+  { id: 3, task: "Sample Task 3", statusComplete: true, newSortedRank: 3 },
+];
+
+const sampleDelta: ToDoDeltaBackend = {
+  version: 7,
+  created: [
+    { id: 4, task: "Sample Task 4", statusComplete: false, newSortedRank: 4 },
+  ],
+  updated: [
+    { id: 2, task: "Sample Task 2", statusComplete: true, newSortedRank: 2 },
+  ],
+  deleted: [3],
+};
+
+// ---------
+
+describe("applyDeltaToToDos", () => {
+  it("should patch updated rows, drop deleted rows & append created rows", () => {
+    expect(
+      applyDeltaToToDos({
+        toDosArrayFull: sampleToDosArrayInput,
+        delta: sampleDelta,
+      })
+    ).toEqual([
+      { id: 1, task: "Sample Task 1", statusComplete: false, newSortedRank: 1 },
+      { id: 2, task: "Sample Task 2", statusComplete: true, newSortedRank: 2 },
+      { id: 4, task: "Sample Task 4", statusComplete: false, newSortedRank: 4 },
+    ]);
+  });
+
+  it("should be idempotent when the same delta is applied twice", () => {
+    const onceApplied: ToDoType[] = applyDeltaToToDos({
+      toDosArrayFull: sampleToDosArrayInput,
+      delta: sampleDelta,
+    });
+    expect(
+      applyDeltaToToDos({ toDosArrayFull: onceApplied, delta: sampleDelta })
+    ).toEqual(onceApplied);
+  });
+
+  it("should re-sort rows whose rank changed", () => {
+    const reorderDelta: ToDoDeltaBackend = {
+      version: 8,
+      created: [],
+      updated: [
+        { id: 1, task: "Sample Task 1", statusComplete: false, newSortedRank: 5 },
+      ],
+      deleted: [],
+    };
+    expect(
+      applyDeltaToToDos({
+        toDosArrayFull: sampleToDosArrayInput,
+        delta: reorderDelta,
+      }).map((toDo) => toDo.id)
+    ).toEqual([2, 3, 1]);
+  });
+});
@@ -0,0 +1,30 @@
+import { ToDoType, ToDoDeltaBackend } from "../types";
+
+// Patch the local task list w/ a 'delta' response (created / updated / deleted rows only) instead of replacing it w/ a full list from the server
+// exported for use in apiRequests.ts
+export const applyDeltaToToDos = ({
+  toDosArrayFull,
+  delta,
+}: {
+  toDosArrayFull: ToDoType[];
+  delta: ToDoDeltaBackend;
+}): ToDoType[] => {
+  // created rows are upserted (a change feed event can repeat a delta this tab already applied from its own write)
+  const createdIds = new Set<number>(delta.created.map((toDo) => toDo.id));
+  const deletedIds = new Set<number>(delta.deleted);
+  const updatedById = new Map<number, ToDoType>(
+    delta.updated.map((toDo) => [toDo.id, toDo])
+  );
+
+  const patchedToDos: ToDoType[] = toDosArrayFull
+    .filter((toDo) => !deletedIds.has(toDo.id) && !createdIds.has(toDo.id))
+    .map((toDo) => updatedById.get(toDo.id) ?? toDo)
+    .concat(delta.created);
+
+  // re-sort by rank in case the delta moved rows (stable sort keeps current order for rows w/o a rank)
+  return patchedToDos.sort(
+    (a, b) =>
+      (a.newSortedRank ?? Number.MAX_SAFE_INTEGER) -
+      (b.newSortedRank ?? Number.MAX_SAFE_INTEGER)
+  );
+};
@@ -13,6 +13,16 @@ export interface ToDoTypeBackend {
   status_complete: boolean;
 }
 
+// Response body from write endpoints when called in 'delta' mode (header 'X-Response-Mode: delta') -- only the rows that changed + the new list version
+// Rows arrive already in frontend (camelCase) shape when 'X-Response-Shape: camel' is also sent
+export interface ToDoDeltaBackend {
+  version: number;
+  created: ToDoType[];
+  updated: ToDoType[];
+  deleted: number[];
+  deletedCount?: number; // only sent by /api/deleteAllCompletedTodos
+}
+
 export interface RequestBody {
   toDosArrayFull: ToDoType[];
   newTaskToAdd?: ToDoType; // only used in POST request (not in PATCH or DELETE) in server/apiLayer.ts
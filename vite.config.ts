@@ -4,6 +4,9 @@ import react from "@vitejs/plugin-react-swc";
 // https://vitejs.dev/config/
 export default defineConfig({
   plugins: [react()],
+  build: {
+    manifest: "assets/manifest.json", // list of content-hashed output files -- collected into server/staticfiles w/ them, so only those are served w/ 'Cache-Control: immutable' (see server/django_app/static_assets.py)
+  },
   server: {
     port: Number(process.env.npm_package_config_vite_app_server_port), // set to PORT 8080 in package.json config
     open: true, // open the browser automatically